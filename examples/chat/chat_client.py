@@ -0,0 +1,50 @@
+#!/usr/bin/python
+
+"""
+Interactive chat peer: reads lines from stdin and prints messages from others.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "..", "sdk", "python"))
+
+from bluetooth_service.client_config import ClientSettings  # noqa: E402
+from bluetooth_service.client_socket import ClientSocketManager  # noqa: E402
+from bluetooth_service.exceptions import BluetoothServerError  # noqa: E402
+from bluetooth_service.framing import FrameDecoder, encode_frame  # noqa: E402
+
+
+def print_incoming(socket_manager: ClientSocketManager) -> None:
+    decoder = FrameDecoder()
+    try:
+        while True:
+            data = socket_manager.receive(1024)
+            if not data:
+                return
+            for payload in decoder.feed(data):
+                message = json.loads(payload)
+                print(f"[{message['author']}] {message['message']}")
+    except BluetoothServerError:
+        return
+
+
+def main() -> None:
+    author = sys.argv[1] if len(sys.argv) > 1 else os.getenv("USER", "anonymous")
+    socket_manager = ClientSocketManager(ClientSettings())
+    socket_manager.discover()
+    socket_manager.connect()
+    threading.Thread(target=print_incoming, args=(socket_manager,), daemon=True).start()
+    try:
+        for line in sys.stdin:
+            message = {"author": author, "message": line.rstrip("\n"), "timestamp": time.time()}
+            socket_manager.send(encode_frame(json.dumps(message).encode("utf-8")))
+    finally:
+        socket_manager.close()
+
+
+if __name__ == "__main__":
+    main()
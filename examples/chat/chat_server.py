@@ -0,0 +1,53 @@
+#!/usr/bin/python
+
+"""
+Group chat hub: every message a peer sends is printed and relayed to all others.
+"""
+
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "..", "sdk", "python"))
+
+from bluetooth_service.broadcast import BroadcastHub  # noqa: E402
+from bluetooth_service.config import ServerSettings  # noqa: E402
+from bluetooth_service.logging_utils import configure_logging  # noqa: E402
+from bluetooth_service.serializers import PassthroughDeserializer, PassthroughSerializer  # noqa: E402
+
+
+def show(payload, subscriber):
+    message = json.loads(payload)
+    print(f"[{message.get('author', subscriber.peer_id)}] {message.get('message', '')}")
+
+
+def main() -> None:
+    configure_logging("configLogger.json")
+    settings = ServerSettings(
+        service_name="BluetoothChat",
+        backlog=7,
+        accept_timeout=1.0,
+        slow_consumer_policy=os.getenv("CHAT_SLOW_CONSUMER_POLICY", "drop_oldest"),
+    )
+    # Payloads are already JSON bytes; relay them without re-encoding.
+    hub = BroadcastHub(
+        settings,
+        serializer=PassthroughSerializer(),
+        deserializer=PassthroughDeserializer(),
+        on_message=show,
+    )
+    hub.start()
+    try:
+        while True:
+            time.sleep(30)
+            for peer_id, stats in hub.subscriber_stats().items():
+                print(f"{peer_id}: {stats}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        hub.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+#!/bin/bash
+# Generate Python gRPC stubs from the shared proto contracts.
+set -euo pipefail
+
+HERE="$(cd "$(dirname "$0")" && pwd)"
+PROTO_DIR="$HERE/../../common/message-schema/proto"
+OUT_DIR="$HERE/grpc_bridge/generated"
+
+python3 -m grpc_tools.protoc \
+    -I "$PROTO_DIR" \
+    --python_out="$OUT_DIR" \
+    --grpc_python_out="$OUT_DIR" \
+    "$PROTO_DIR/bluetooth_bridge.proto"
+
+# grpc_tools emits absolute imports; make them package-relative.
+sed -i 's/^import bluetooth_bridge_pb2 as/from . import bluetooth_bridge_pb2 as/' \
+    "$OUT_DIR/bluetooth_bridge_pb2_grpc.py"
@@ -0,0 +1,14 @@
+"""
+grpc_bridge
+===========
+
+gRPC bidirectional streaming bridge onto long-lived Python SDK sessions.
+
+`sessions` holds the transport-agnostic flow-control logic; `service` adapts it
+to the generated gRPC stubs (see `generate_protos.sh`) and is imported
+explicitly so the sessions stay usable without grpcio installed.
+"""
+
+from .sessions import ClientBridgeSession, ServerBridgeSession
+
+__all__ = ["ClientBridgeSession", "ServerBridgeSession"]
@@ -0,0 +1 @@
+"""Python modules generated from common/message-schema/proto (see generate_protos.sh)."""
@@ -0,0 +1,123 @@
+"""grpc.aio servicer adapting the bridge sessions to the generated stubs."""
+
+from __future__ import annotations
+
+import dataclasses
+import logging
+from typing import Any, AsyncIterator, Callable, Optional
+
+import grpc
+
+from bluetooth_service.client import BluetoothClient
+from bluetooth_service.client_config import ClientSettings
+from bluetooth_service.config import ServerSettings
+from bluetooth_service.serializers import PassthroughDeserializer, PassthroughSerializer
+from bluetooth_service.server import BluetoothServer
+from bluetooth_service.storage import NullSink
+
+from .generated import bluetooth_bridge_pb2 as pb2
+from .generated import bluetooth_bridge_pb2_grpc as pb2_grpc
+from .sessions import ClientBridgeSession, ServerBridgeSession
+
+logger = logging.getLogger(__name__)
+
+ClientFactory = Callable[[Any], BluetoothClient]
+ServerFactory = Callable[[Any], BluetoothServer]
+
+DEFAULT_WINDOW = 8
+
+
+def default_client_factory(session: Any) -> BluetoothClient:
+    settings = ClientSettings(target_address=session.device_address or None, payload_mode="raw")
+    if session.service_uuid:
+        settings = dataclasses.replace(settings, service_uuid=session.service_uuid)
+    return BluetoothClient(settings, serializer=PassthroughSerializer())
+
+
+def default_server_factory(session: Any) -> BluetoothServer:
+    settings = ServerSettings(port=session.channel or None, payload_mode="raw")
+    if session.service_name:
+        settings = dataclasses.replace(settings, service_name=session.service_name)
+    return BluetoothServer(settings, deserializer=PassthroughDeserializer(), sink=NullSink())
+
+
+class BluetoothBridgeServicer(pb2_grpc.BluetoothBridgeServicer):
+    """Implements `ubt.bridge.v1.BluetoothBridge` on top of the SDK."""
+
+    def __init__(
+        self,
+        client_factory: ClientFactory = default_client_factory,
+        server_factory: ServerFactory = default_server_factory,
+    ) -> None:
+        self._client_factory = client_factory
+        self._server_factory = server_factory
+
+    async def Send(
+        self,
+        request_iterator: AsyncIterator[Any],
+        context: grpc.aio.ServicerContext,
+    ) -> AsyncIterator[Any]:
+        opening = await self._first(request_iterator, context)
+        session = ClientBridgeSession(
+            self._client_factory(opening.open),
+            window=opening.open.window or DEFAULT_WINDOW,
+        )
+
+        async def messages() -> AsyncIterator[tuple[int, bytes]]:
+            async for request in request_iterator:
+                if request.WhichOneof("kind") != "message":
+                    await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Session already open")
+                yield request.message.sequence, request.message.payload
+
+        try:
+            async for sequence, error in session.run(messages()):
+                yield pb2.SendAck(sequence=sequence, ok=error is None, error=error or "")
+        except grpc.aio.AbortError:
+            raise  # already aborted with its own status (e.g. INVALID_ARGUMENT)
+        except Exception as exc:
+            logger.warning("Send session failed: %s", exc)
+            await context.abort(grpc.StatusCode.UNAVAILABLE, str(exc))
+
+    async def Receive(
+        self,
+        request_iterator: AsyncIterator[Any],
+        context: grpc.aio.ServicerContext,
+    ) -> AsyncIterator[Any]:
+        opening = await self._first(request_iterator, context)
+        session = ServerBridgeSession(
+            self._server_factory(opening.open),
+            initial_credits=opening.open.initial_credits,
+        )
+
+        async def credit_grants() -> AsyncIterator[int]:
+            async for request in request_iterator:
+                if request.WhichOneof("kind") != "credits":
+                    await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Session already open")
+                yield request.credits
+
+        try:
+            async for sequence, payload, received_at in session.run(credit_grants()):
+                yield pb2.ReceivedMessage(sequence=sequence, payload=payload, received_at=received_at)
+        except grpc.aio.AbortError:
+            raise  # already aborted with its own status (e.g. INVALID_ARGUMENT)
+        except Exception as exc:
+            logger.warning("Receive session failed: %s", exc)
+            await context.abort(grpc.StatusCode.UNAVAILABLE, str(exc))
+
+    async def _first(self, request_iterator: AsyncIterator[Any], context: grpc.aio.ServicerContext) -> Any:
+        try:
+            request = await request_iterator.__anext__()
+        except StopAsyncIteration:
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "Empty stream")
+        if request.WhichOneof("kind") != "open":
+            await context.abort(grpc.StatusCode.INVALID_ARGUMENT, "First request must open the session")
+        return request
+
+
+async def serve(address: str = "[::]:50051", servicer: Optional[BluetoothBridgeServicer] = None) -> None:
+    server = grpc.aio.server()
+    pb2_grpc.add_BluetoothBridgeServicer_to_server(servicer or BluetoothBridgeServicer(), server)
+    server.add_insecure_port(address)
+    await server.start()
+    logger.info("gRPC bridge listening on %s", address)
+    await server.wait_for_termination()
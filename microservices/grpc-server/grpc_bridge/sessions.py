@@ -0,0 +1,157 @@
+"""Transport-agnostic streaming sessions with credit-based flow control."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Awaitable, Optional, TypeVar
+
+from bluetooth_service.client import BluetoothClient
+from bluetooth_service.exceptions import BluetoothServerError
+from bluetooth_service.server import BluetoothServer
+
+logger = logging.getLogger(__name__)
+
+_END = object()
+
+T = TypeVar("T")
+
+
+class ClientBridgeSession:
+    """
+    Pump `(sequence, payload)` pairs from an async stream onto one client link.
+
+    At most `window` messages are pulled from the incoming stream before their
+    acknowledgement has been yielded, so a slow Bluetooth link stops us reading
+    the stream (and gRPC's HTTP/2 flow control pushes back on the caller);
+    a slow ack consumer likewise stops the next Bluetooth send.
+    """
+
+    def __init__(self, client: BluetoothClient, window: int = 8) -> None:
+        self._client = client
+        self._window = max(1, window)
+        # SDK socket calls block; keep them on one dedicated thread.
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bridge-client")
+
+    async def run(self, messages: AsyncIterator[tuple[int, bytes]]) -> AsyncIterator[tuple[int, Optional[str]]]:
+        """Yield `(sequence, error)` per message; `error` is None on success."""
+        loop = asyncio.get_running_loop()
+        credits = asyncio.Semaphore(self._window)
+        queue: asyncio.Queue[Any] = asyncio.Queue()
+
+        async def pump() -> None:
+            try:
+                iterator = messages.__aiter__()
+                while True:
+                    await credits.acquire()
+                    try:
+                        item = await iterator.__anext__()
+                    except StopAsyncIteration:
+                        break
+                    queue.put_nowait(item)
+            except Exception as exc:
+                queue.put_nowait(exc)
+            finally:
+                queue.put_nowait(_END)
+
+        await loop.run_in_executor(self._executor, self._client.start)
+        pump_task = asyncio.create_task(pump())
+        try:
+            while True:
+                item = await queue.get()
+                if item is _END:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                sequence, payload = item
+                error = await self._send(loop, payload)
+                yield sequence, error
+                credits.release()
+        finally:
+            pump_task.cancel()
+            await loop.run_in_executor(self._executor, self._client.stop)
+            self._executor.shutdown(wait=False)
+
+    async def _send(self, loop: asyncio.AbstractEventLoop, payload: bytes) -> Optional[str]:
+        try:
+            await loop.run_in_executor(self._executor, self._client.send_object, payload)
+            return None
+        except BluetoothServerError as exc:
+            logger.warning("Bridge send failed, reconnecting: %s", exc)
+            # A reconnect failure propagates and ends the session.
+            await loop.run_in_executor(self._executor, self._reconnect)
+            return str(exc)
+
+    def _reconnect(self) -> None:
+        self._client.stop()
+        self._client.start()
+
+
+class ServerBridgeSession:
+    """
+    Stream payloads received by one `BluetoothServer` to a credit-granting consumer.
+
+    A payload is only read (and therefore ACKed on Bluetooth) when the consumer
+    has granted a credit, so the device's sender is paced by the consumer.
+    When a device disconnects the session accepts the next one.
+    """
+
+    def __init__(self, server: BluetoothServer, initial_credits: int = 1) -> None:
+        self._server = server
+        self._initial_credits = initial_credits
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bridge-server")
+
+    async def run(self, credit_grants: AsyncIterator[int]) -> AsyncIterator[tuple[int, Any, float]]:
+        """Yield `(sequence, payload, received_at)` for every received payload."""
+        loop = asyncio.get_running_loop()
+        credits = asyncio.Semaphore(0)
+        for _ in range(self._initial_credits):
+            credits.release()
+
+        async def pump() -> None:
+            async for grant in credit_grants:
+                for _ in range(grant):
+                    credits.release()
+
+        pump_task = asyncio.create_task(pump())
+        sequence = 0
+        try:
+            await _unless_failed(pump_task, loop.run_in_executor(self._executor, self._server.start))
+            while True:
+                await _unless_failed(pump_task, credits.acquire())
+                try:
+                    payload = await _unless_failed(
+                        pump_task, loop.run_in_executor(self._executor, self._server.receive_once)
+                    )
+                except BluetoothServerError as exc:
+                    logger.info("Device link ended (%s); waiting for the next connection", exc)
+                    credits.release()
+                    await loop.run_in_executor(self._executor, self._restart)
+                    continue
+                sequence += 1
+                yield sequence, payload, time.time()
+        finally:
+            pump_task.cancel()
+            # The executor thread may be blocked in recv(); stop() shuts the
+            # sockets down before closing them, which unblocks it.
+            await asyncio.to_thread(self._server.stop)
+            self._executor.shutdown(wait=False)
+
+    def _restart(self) -> None:
+        self._server.stop()
+        self._server.start()
+
+
+async def _unless_failed(pump_task: asyncio.Task, awaitable: Awaitable[T]) -> T:
+    """Await `awaitable`, unless the credit pump fails first: then raise its error."""
+    future = asyncio.ensure_future(awaitable)
+    await asyncio.wait({future, pump_task}, return_when=asyncio.FIRST_COMPLETED)
+    if not future.done():
+        # Only the pump can have finished; a pump that simply ran out of grants is fine.
+        error = pump_task.exception()
+        if error is not None:
+            future.cancel()
+            raise error
+    return await future
@@ -0,0 +1,26 @@
+#!/usr/bin/python
+
+"""
+Entry point for the gRPC streaming bridge (run ./generate_protos.sh first).
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "..", "sdk", "python"))
+
+from bluetooth_service.logging_utils import configure_logging  # noqa: E402
+from grpc_bridge.service import serve  # noqa: E402
+
+
+def main() -> None:
+    configure_logging("configLogger.json")
+    try:
+        asyncio.run(serve(os.getenv("BRIDGE_ADDRESS", "[::]:50051")))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Tests for the grpc.aio servicer (skipped without grpcio and generated stubs)."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+
+grpc = pytest.importorskip("grpc")
+pytest.importorskip("grpc_bridge.generated.bluetooth_bridge_pb2_grpc")
+
+from bluetooth_service.client import BluetoothClient  # noqa: E402
+from bluetooth_service.client_config import ClientSettings  # noqa: E402
+from bluetooth_service.config import ServerSettings  # noqa: E402
+from bluetooth_service.loopback import (  # noqa: E402
+    LoopbackClientSocketManager,
+    LoopbackListener,
+    LoopbackServerSocketManager,
+)
+from bluetooth_service.serializers import PassthroughDeserializer, PassthroughSerializer  # noqa: E402
+from bluetooth_service.server import BluetoothServer  # noqa: E402
+from bluetooth_service.storage import NullSink  # noqa: E402
+from grpc_bridge.generated import bluetooth_bridge_pb2 as pb2  # noqa: E402
+from grpc_bridge.generated import bluetooth_bridge_pb2_grpc as pb2_grpc  # noqa: E402
+from grpc_bridge.service import BluetoothBridgeServicer  # noqa: E402
+
+
+def _servicer(listener: LoopbackListener) -> BluetoothBridgeServicer:
+    return BluetoothBridgeServicer(
+        client_factory=lambda session: BluetoothClient(
+            ClientSettings(),
+            serializer=PassthroughSerializer(),
+            socket_manager=LoopbackClientSocketManager(listener),
+        ),
+        server_factory=lambda session: BluetoothServer(
+            ServerSettings(),
+            deserializer=PassthroughDeserializer(),
+            sink=NullSink(),
+            socket_manager=LoopbackServerSocketManager(listener),
+        ),
+    )
+
+
+async def _call_with_second_open(servicer: BluetoothBridgeServicer, rpc: str, requests: list[Any]) -> Any:
+    server = grpc.aio.server()
+    pb2_grpc.add_BluetoothBridgeServicer_to_server(servicer, server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+    try:
+        async with grpc.aio.insecure_channel(f"127.0.0.1:{port}") as channel:
+            call = getattr(pb2_grpc.BluetoothBridgeStub(channel), rpc)(iter(requests))
+            with pytest.raises(grpc.aio.AioRpcError) as raised:
+                async for _ in call:
+                    pass
+            return raised.value.code()
+    finally:
+        await server.stop(None)
+
+
+def test_send_rejects_a_second_open_as_invalid_argument() -> None:
+    requests = [pb2.SendRequest(open=pb2.SendSession()), pb2.SendRequest(open=pb2.SendSession())]
+
+    code = asyncio.run(_call_with_second_open(_servicer(LoopbackListener()), "Send", requests))
+
+    assert code == grpc.StatusCode.INVALID_ARGUMENT
+
+
+def test_receive_rejects_a_second_open_as_invalid_argument() -> None:
+    listener = LoopbackListener()
+    # A connected device that never sends: the session waits in recv().
+    device = listener.connect()
+    requests = [
+        pb2.ReceiveRequest(open=pb2.ReceiveSession(initial_credits=1)),
+        pb2.ReceiveRequest(open=pb2.ReceiveSession()),
+    ]
+
+    code = asyncio.run(_call_with_second_open(_servicer(listener), "Receive", requests))
+    device.close()
+
+    assert code == grpc.StatusCode.INVALID_ARGUMENT
@@ -0,0 +1,151 @@
+"""Tests for the bridge sessions against the SDK loopback transport."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, AsyncIterator, List
+
+from bluetooth_service.client import BluetoothClient
+from bluetooth_service.client_config import ClientSettings
+from bluetooth_service.config import ServerSettings
+from bluetooth_service.loopback import (
+    LoopbackClientSocketManager,
+    LoopbackListener,
+    LoopbackServerSocketManager,
+)
+from bluetooth_service.serializers import PassthroughDeserializer, PassthroughSerializer
+from bluetooth_service.server import BluetoothServer
+from bluetooth_service.storage import NullSink
+from grpc_bridge import ClientBridgeSession, ServerBridgeSession
+
+
+class ListSink:
+    def __init__(self) -> None:
+        self.persisted: List[Any] = []
+
+    def persist(self, obj: Any) -> None:
+        self.persisted.append(obj)
+
+
+def _client(listener: LoopbackListener) -> BluetoothClient:
+    return BluetoothClient(
+        ClientSettings(),
+        serializer=PassthroughSerializer(),
+        socket_manager=LoopbackClientSocketManager(listener),
+    )
+
+
+def _server(listener: LoopbackListener, sink: Any) -> BluetoothServer:
+    return BluetoothServer(
+        ServerSettings(),
+        deserializer=PassthroughDeserializer(),
+        sink=sink,
+        socket_manager=LoopbackServerSocketManager(listener),
+    )
+
+
+def test_client_session_respects_window() -> None:
+    listener = LoopbackListener()
+    sink = ListSink()
+    server = _server(listener, sink)
+
+    def serve() -> None:
+        server.start()
+        for _ in range(6):
+            server.receive_once()
+        server.stop()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    pulled: List[int] = []
+
+    async def messages() -> AsyncIterator[tuple[int, bytes]]:
+        for sequence in range(6):
+            pulled.append(sequence)
+            yield sequence, f"msg-{sequence}".encode()
+
+    async def scenario() -> List[int]:
+        acks = []
+        async for sequence, error in ClientBridgeSession(_client(listener), window=2).run(messages()):
+            assert error is None
+            # Never more than `window` messages pulled ahead of the acks.
+            assert len(pulled) - len(acks) <= 2
+            acks.append(sequence)
+        return acks
+
+    assert asyncio.run(scenario()) == list(range(6))
+    thread.join(timeout=5)
+    assert sink.persisted == [f"msg-{sequence}".encode() for sequence in range(6)]
+
+
+def test_server_session_reads_only_with_credits() -> None:
+    listener = LoopbackListener()
+    client = _client(listener)
+    sent: List[int] = []
+
+    def send() -> None:
+        client.start()
+        for sequence in range(3):
+            client.send_object(f"msg-{sequence}".encode())
+            sent.append(sequence)
+        client.stop()
+
+    async def scenario() -> List[bytes]:
+        grants: asyncio.Queue[int] = asyncio.Queue()
+
+        async def credit_grants() -> AsyncIterator[int]:
+            while True:
+                yield await grants.get()
+
+        thread = threading.Thread(target=send, daemon=True)
+        thread.start()
+        received = []
+        stream = ServerBridgeSession(_server(listener, NullSink()), initial_credits=1).run(credit_grants())
+        async for _, payload, _ in stream:
+            received.append(payload)
+            await asyncio.sleep(0.1)
+            # Without a fresh credit the next send is still waiting for its ACK.
+            assert len(sent) == len(received)
+            if len(received) == 3:
+                break
+            grants.put_nowait(1)
+        await stream.aclose()
+        thread.join(timeout=5)
+        return received
+
+    assert asyncio.run(scenario()) == [b"msg-0", b"msg-1", b"msg-2"]
+
+
+def test_server_session_stop_unblocks_pending_receive() -> None:
+    listener = LoopbackListener()
+    server = _server(listener, NullSink())
+    # A connected device that never sends anything.
+    device = listener.connect()
+    finished = threading.Event()
+    receive_once = server.receive_once
+
+    def watched_receive_once() -> Any:
+        try:
+            return receive_once()
+        finally:
+            finished.set()
+
+    server.receive_once = watched_receive_once  # type: ignore[method-assign]
+
+    async def scenario() -> None:
+        async def credit_grants() -> AsyncIterator[int]:
+            await asyncio.Event().wait()
+            yield 0
+
+        stream = ServerBridgeSession(server, initial_credits=1).run(credit_grants())
+        pending = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0.1)
+        pending.cancel()
+        await asyncio.gather(pending, return_exceptions=True)
+
+    asyncio.run(scenario())
+
+    # The device is still connected, so only stop() can have woken recv().
+    assert finished.wait(timeout=2)
+    device.close()
@@ -0,0 +1,19 @@
+"""
+rest_gateway
+============
+
+Asyncio HTTP gateway that multiplexes REST requests onto warm, pooled RFCOMM
+links built with the Python SDK (`sdk/python/bluetooth_service`).
+"""
+
+from .config import GatewaySettings
+from .server import RestGateway
+from .pool import DeviceBusyError, DeviceLinkPool, GatewayOverloadedError
+
+__all__ = [
+    "DeviceBusyError",
+    "DeviceLinkPool",
+    "GatewayOverloadedError",
+    "GatewaySettings",
+    "RestGateway",
+]
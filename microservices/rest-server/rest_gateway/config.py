@@ -0,0 +1,38 @@
+"""Configuration objects for the REST gateway."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class GatewaySettings:
+    """Value object describing how the gateway listens and pools links."""
+
+    host: str = "0.0.0.0"
+    port: int = 8080
+    max_body_bytes: int = 64 * 1024
+
+    # "raw" forwards request bodies unchanged (server in raw payload mode);
+    # "pickle" parses the JSON body and pickles it like the default client.
+    payload_mode: str = "raw"
+
+    # Per-device limits: queued requests (beyond which we answer 429) and how
+    # many queued requests are drained onto the link in one batch.
+    max_pending_per_device: int = 64
+    max_batch: int = 16
+
+    # Gateway-wide limits (beyond which we answer 503).
+    max_links: int = 7
+    max_total_pending: int = 1024
+
+    # Receiving: payloads buffered per listening RFCOMM channel (beyond which
+    # the gateway stops reading, so the device waits for its ACK) and how long
+    # a long-poll GET waits for the first payload at most.
+    max_buffered_per_channel: int = 256
+    receive_poll_timeout: float = 25.0
+
+    request_timeout: float = 30.0
+    idle_link_seconds: float = 300.0
+    link_receive_timeout: Optional[float] = 10.0
@@ -0,0 +1,377 @@
+"""Pool of warm, per-device RFCOMM links shared by concurrent HTTP requests."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from bluetooth_service.client import BluetoothClient
+from bluetooth_service.client_config import ClientSettings
+from bluetooth_service.config import ServerSettings
+from bluetooth_service.exceptions import BluetoothServerError
+from bluetooth_service.serializers import (
+    PassthroughDeserializer,
+    PassthroughSerializer,
+    PickleDeserializer,
+    PickleSerializer,
+)
+from bluetooth_service.server import BluetoothServer
+from bluetooth_service.storage import NullSink
+
+from .config import GatewaySettings
+
+logger = logging.getLogger(__name__)
+
+ClientFactory = Callable[[str], BluetoothClient]
+ServerFactory = Callable[[int], BluetoothServer]
+
+# (sequence, payload, received_at) for one payload received on a channel.
+ReceivedPayload = tuple[int, Any, float]
+
+
+class DeviceBusyError(BluetoothServerError):
+    """The device's request queue is full (HTTP 429)."""
+
+
+class GatewayOverloadedError(BluetoothServerError):
+    """The gateway as a whole cannot take more work right now (HTTP 503)."""
+
+
+def default_client_factory(settings: GatewaySettings) -> ClientFactory:
+    """Build SDK clients that discover the service on the requested device."""
+
+    def factory(address: str) -> BluetoothClient:
+        client_settings = ClientSettings(
+            target_address=address,
+            payload_mode=settings.payload_mode,
+            receive_timeout=settings.link_receive_timeout,
+        )
+        serializer = PassthroughSerializer() if settings.payload_mode == "raw" else PickleSerializer()
+        return BluetoothClient(client_settings, serializer=serializer)
+
+    return factory
+
+
+def default_server_factory(settings: GatewaySettings) -> ServerFactory:
+    """Build SDK servers that listen on the requested RFCOMM channel."""
+
+    def factory(channel: int) -> BluetoothServer:
+        server_settings = ServerSettings(port=channel, payload_mode=settings.payload_mode)
+        deserializer = PassthroughDeserializer() if settings.payload_mode == "raw" else PickleDeserializer()
+        return BluetoothServer(server_settings, deserializer=deserializer, sink=NullSink())
+
+    return factory
+
+
+class DeviceLink:
+    """
+    One persistent SDK connection plus the bounded queue of requests for it.
+
+    A single worker task drains up to `max_batch` queued requests at a time and
+    sends them back-to-back on the warm link in one executor hop. Each link owns
+    a one-thread executor because the SDK socket calls block.
+    """
+
+    def __init__(self, address: str, client_factory: ClientFactory, settings: GatewaySettings) -> None:
+        self.address = address
+        self._client_factory = client_factory
+        self._settings = settings
+        self._client: Optional[BluetoothClient] = None
+        self._queue: asyncio.Queue[tuple[Any, asyncio.Future]] = asyncio.Queue(
+            maxsize=settings.max_pending_per_device
+        )
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"link-{address}")
+        self._worker: Optional[asyncio.Task] = None
+        self.in_flight = 0
+        self.last_used = asyncio.get_running_loop().time()
+        self.stats = {"delivered": 0, "failed": 0, "batches": 0, "connects": 0}
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize() + self.in_flight
+
+    def submit(self, obj: Any) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((obj, future))
+        except asyncio.QueueFull:
+            raise DeviceBusyError(f"Too many pending requests for {self.address}")
+        if self._worker is None:
+            self._worker = asyncio.create_task(self._drain(), name=f"link-{self.address}")
+        self.last_used = asyncio.get_running_loop().time()
+        return future
+
+    async def close(self) -> None:
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(GatewayOverloadedError(f"Link to {self.address} closed"))
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._disconnect)
+        self._executor.shutdown(wait=False)
+
+    async def _drain(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self._settings.max_batch and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            batch = [(obj, future) for obj, future in batch if not future.cancelled()]
+            if not batch:
+                continue
+            self.in_flight = len(batch)
+            try:
+                results = await loop.run_in_executor(
+                    self._executor, self._send_batch, [obj for obj, _ in batch]
+                )
+            finally:
+                self.in_flight = 0
+            self.stats["batches"] += 1
+            for (_, future), error in zip(batch, results):
+                if future.done():
+                    continue
+                if error is None:
+                    future.set_result(None)
+                else:
+                    future.set_exception(error)
+            self.last_used = loop.time()
+
+    def _send_batch(self, objects: list[Any]) -> list[Optional[BaseException]]:
+        """Runs on the link thread: send every object, reconnecting once after a failed send."""
+        results: list[Optional[BaseException]] = []
+        for index, obj in enumerate(objects):
+            try:
+                client = self._ensure_connected()
+            except BluetoothServerError as exc:
+                # Fail the rest of the batch rather than retry the connect per object.
+                logger.warning("Connecting to %s failed: %s", self.address, exc)
+                failed = len(objects) - index
+                self.stats["failed"] += failed
+                results.extend([exc] * failed)
+                break
+            try:
+                client.send_object(obj)
+            except BluetoothServerError as exc:
+                logger.warning("Send to %s failed: %s", self.address, exc)
+                self.stats["failed"] += 1
+                self._disconnect()
+                results.append(exc)
+                continue
+            self.stats["delivered"] += 1
+            results.append(None)
+        return results
+
+    def _ensure_connected(self) -> BluetoothClient:
+        if self._client is None:
+            client = self._client_factory(self.address)
+            client.start()
+            self.stats["connects"] += 1
+            self._client = client
+        return self._client
+
+    def _disconnect(self) -> None:
+        if self._client is not None:
+            try:
+                self._client.stop()
+            finally:
+                self._client = None
+
+
+class ChannelReceiver:
+    """
+    One listening SDK server on an RFCOMM channel plus the payloads it received.
+
+    A worker task keeps receiving on the channel's own thread into a buffer of
+    at most `max_buffered_per_channel` payloads that long-poll requests take
+    from. While the buffer is full the worker stops reading, so the device's
+    sender waits for its ACK instead of the gateway dropping payloads. When a
+    device disconnects the channel accepts the next one.
+    """
+
+    def __init__(self, channel: int, server_factory: ServerFactory, settings: GatewaySettings) -> None:
+        self.channel = channel
+        self._server = server_factory(channel)
+        self._buffer: asyncio.Queue[ReceivedPayload] = asyncio.Queue(maxsize=settings.max_buffered_per_channel)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"channel-{channel}")
+        self._sequence = 0
+        self.waiting = 0
+        self.last_used = asyncio.get_running_loop().time()
+        self.stats = {"received": 0, "delivered": 0, "connects": 0}
+        self._worker = asyncio.create_task(self._receive(), name=f"channel-{channel}")
+
+    @property
+    def buffered(self) -> int:
+        return self._buffer.qsize()
+
+    @property
+    def pending(self) -> int:
+        return self.buffered + self.waiting
+
+    async def poll(self, max_messages: int, timeout: float) -> list[ReceivedPayload]:
+        """Wait up to `timeout` for a payload, then take up to `max_messages` buffered ones."""
+        getter = asyncio.ensure_future(self._buffer.get())
+        self.waiting += 1
+        try:
+            await asyncio.wait({getter, self._worker}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            self.waiting -= 1
+            self.last_used = asyncio.get_running_loop().time()
+            if not getter.done():
+                getter.cancel()
+        if not getter.done() or getter.cancelled():
+            if self._worker.done():
+                error = self._worker.exception()
+                raise BluetoothServerError(f"Receiving on channel {self.channel} failed: {error}", cause=error)
+            return []
+        messages = [getter.result()]
+        while len(messages) < max_messages and not self._buffer.empty():
+            messages.append(self._buffer.get_nowait())
+        self.stats["delivered"] += len(messages)
+        return messages
+
+    async def close(self) -> None:
+        self._worker.cancel()
+        try:
+            await self._worker
+        except (asyncio.CancelledError, BluetoothServerError):
+            pass
+        # The channel thread may be blocked in accept()/recv(); stop() shuts the
+        # sockets down before closing them, which unblocks it.
+        await asyncio.to_thread(self._server.stop)
+        self._executor.shutdown(wait=False)
+
+    async def _receive(self) -> None:
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._start)
+        while True:
+            try:
+                payload = await loop.run_in_executor(self._executor, self._server.receive_once)
+            except BluetoothServerError as exc:
+                logger.info("Device on channel %s disconnected (%s); waiting for the next one", self.channel, exc)
+                await loop.run_in_executor(self._executor, self._restart)
+                continue
+            self._sequence += 1
+            self.stats["received"] += 1
+            await self._buffer.put((self._sequence, payload, time.time()))
+
+    def _start(self) -> None:
+        self._server.start()
+        self.stats["connects"] += 1
+
+    def _restart(self) -> None:
+        self._server.stop()
+        self._start()
+
+
+class DeviceLinkPool:
+    """
+    Route requests to per-device links and per-channel receivers.
+
+    Links and receivers share the gateway-wide `max_links` slots, since each
+    ties up one RFCOMM connection.
+    """
+
+    def __init__(
+        self,
+        settings: Optional[GatewaySettings] = None,
+        client_factory: Optional[ClientFactory] = None,
+        server_factory: Optional[ServerFactory] = None,
+    ) -> None:
+        self.settings = settings or GatewaySettings()
+        self._client_factory = client_factory or default_client_factory(self.settings)
+        self._server_factory = server_factory or default_server_factory(self.settings)
+        self._links: dict[str, DeviceLink] = {}
+        self._receivers: dict[int, ChannelReceiver] = {}
+
+    async def send(self, address: str, obj: Any) -> None:
+        """Queue `obj` for `address` and wait until the device acknowledged it."""
+        if self.pending >= self.settings.max_total_pending:
+            raise GatewayOverloadedError("Gateway has too many pending requests")
+        link = self._links.get(address)
+        if link is None:
+            await self._claim_link_slot()
+            link = self._links[address] = DeviceLink(address, self._client_factory, self.settings)
+        future = link.submit(obj)
+        try:
+            await asyncio.wait_for(future, self.settings.request_timeout)
+        except asyncio.TimeoutError as exc:
+            raise GatewayOverloadedError(f"Timed out waiting for {address}", cause=exc)
+
+    async def receive(
+        self,
+        channel: int,
+        max_messages: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> list[ReceivedPayload]:
+        """Long-poll `channel`: wait up to `timeout` for payloads (empty list if none arrived)."""
+        receiver = self._receivers.get(channel)
+        if receiver is None:
+            await self._claim_link_slot()
+            receiver = self._receivers[channel] = ChannelReceiver(channel, self._server_factory, self.settings)
+        try:
+            return await receiver.poll(
+                max_messages or self.settings.max_batch,
+                self.settings.receive_poll_timeout if timeout is None else timeout,
+            )
+        except BluetoothServerError:
+            # Drop the failed receiver so the next poll listens afresh.
+            if self._receivers.get(channel) is receiver:
+                del self._receivers[channel]
+                await receiver.close()
+            raise
+
+    @property
+    def pending(self) -> int:
+        return sum(link.pending for link in self._links.values())
+
+    async def close_idle(self, idle_seconds: Optional[float] = None) -> None:
+        """Close links with nothing pending that have been idle long enough."""
+        idle_seconds = self.settings.idle_link_seconds if idle_seconds is None else idle_seconds
+        now = asyncio.get_running_loop().time()
+        for address, link in list(self._links.items()):
+            if link.pending == 0 and now - link.last_used >= idle_seconds:
+                logger.info("Closing idle link to %s", address)
+                del self._links[address]
+                await link.close()
+        for channel, receiver in list(self._receivers.items()):
+            if receiver.pending == 0 and now - receiver.last_used >= idle_seconds:
+                logger.info("Closing idle receiver on channel %s", channel)
+                del self._receivers[channel]
+                await receiver.close()
+
+    async def close(self) -> None:
+        links, self._links = self._links, {}
+        receivers, self._receivers = self._receivers, {}
+        for link in links.values():
+            await link.close()
+        for receiver in receivers.values():
+            await receiver.close()
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "links": {
+                address: {"pending": link.pending, **link.stats}
+                for address, link in self._links.items()
+            },
+            "channels": {
+                channel: {"buffered": receiver.buffered, "waiting": receiver.waiting, **receiver.stats}
+                for channel, receiver in self._receivers.items()
+            },
+            "pending": self.pending,
+        }
+
+    # Internals -----------------------------------------------------------------
+
+    async def _claim_link_slot(self) -> None:
+        if len(self._links) + len(self._receivers) >= self.settings.max_links:
+            await self.close_idle(0.0)
+        if len(self._links) + len(self._receivers) >= self.settings.max_links:
+            raise GatewayOverloadedError("No free Bluetooth link slots")
@@ -0,0 +1,221 @@
+"""Minimal asyncio HTTP/1.1 front end for the device link pool."""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import json
+import logging
+from http import HTTPStatus
+from typing import Any, Optional
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from bluetooth_service.exceptions import BluetoothServerError
+
+from .config import GatewaySettings
+from .pool import DeviceBusyError, DeviceLinkPool, GatewayOverloadedError
+
+logger = logging.getLogger(__name__)
+
+_MAX_HEADER_LINES = 100
+
+
+class _HttpError(Exception):
+    def __init__(self, status: HTTPStatus, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+
+
+class RestGateway:
+    """
+    Serve the REST API on top of a `DeviceLinkPool`.
+
+    Routes:
+      POST /devices/{address}/messages  send the JSON body, 200 once ACKed
+      GET  /channels/{channel}/messages long-poll payloads received on an
+                                        RFCOMM channel (?wait=seconds&limit=n)
+      GET  /devices                     per-link queue depth and counters
+      GET  /healthz                     liveness probe
+    Overload maps to 429 (device queue full) and 503 (gateway saturated).
+    """
+
+    def __init__(self, settings: Optional[GatewaySettings] = None, pool: Optional[DeviceLinkPool] = None) -> None:
+        self.settings = settings or GatewaySettings()
+        self.pool = pool or DeviceLinkPool(self.settings)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._reaper: Optional[asyncio.Task] = None
+
+    async def start(self) -> asyncio.AbstractServer:
+        self._server = await asyncio.start_server(self._handle_connection, self.settings.host, self.settings.port)
+        self._reaper = asyncio.create_task(self._reap_idle_links())
+        logger.info("REST gateway listening on %s", self.bound_address)
+        return self._server
+
+    @property
+    def bound_address(self) -> tuple[str, int]:
+        if self._server is None:
+            raise BluetoothServerError("Gateway not started")
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self) -> None:
+        server = self._server or await self.start()
+        async with server:
+            await server.serve_forever()
+
+    async def close(self) -> None:
+        if self._reaper is not None:
+            self._reaper.cancel()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        await self.pool.close()
+
+    # Internals -----------------------------------------------------------------
+
+    async def _reap_idle_links(self) -> None:
+        interval = max(1.0, self.settings.idle_link_seconds / 4)
+        while True:
+            await asyncio.sleep(interval)
+            await self.pool.close_idle()
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            keep_alive = True
+            while keep_alive:
+                try:
+                    request = await self._read_request(reader)
+                except _HttpError as exc:
+                    await self._respond(writer, exc.status, {"error": str(exc)}, keep_alive=False)
+                    return
+                if request is None:
+                    return
+                method, target, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                status, payload = await self._dispatch(method, target, body)
+                await self._respond(writer, status, payload, keep_alive=keep_alive)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(
+        self, reader: asyncio.StreamReader
+    ) -> Optional[tuple[str, str, dict[str, str], bytes]]:
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+        try:
+            method, target, _version = request_line.decode("latin-1").split()
+        except ValueError:
+            raise _HttpError(HTTPStatus.BAD_REQUEST, "Malformed request line")
+        headers: dict[str, str] = {}
+        for _ in range(_MAX_HEADER_LINES):
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        else:
+            raise _HttpError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, "Too many headers")
+        try:
+            length = int(headers.get("content-length", "0") or 0)
+        except ValueError:
+            raise _HttpError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+        if length < 0:
+            raise _HttpError(HTTPStatus.BAD_REQUEST, "Invalid Content-Length")
+        if length > self.settings.max_body_bytes:
+            raise _HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, "Body too large")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target, headers, body
+
+    async def _dispatch(self, method: str, target: str, body: bytes) -> tuple[HTTPStatus, Any]:
+        url = urlsplit(target)
+        path, query = url.path, parse_qs(url.query)
+        parts = [unquote(part) for part in path.strip("/").split("/")]
+        if method == "GET" and parts == ["healthz"]:
+            return HTTPStatus.OK, {"status": "ok"}
+        if method == "GET" and parts == ["devices"]:
+            return HTTPStatus.OK, self.pool.snapshot()
+        if len(parts) == 3 and parts[0] == "devices" and parts[2] == "messages":
+            if method != "POST":
+                return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Use POST"}
+            return await self._send(parts[1], body)
+        if len(parts) == 3 and parts[0] == "channels" and parts[2] == "messages":
+            if method != "GET":
+                return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Use GET"}
+            return await self._receive(parts[1], query)
+        return HTTPStatus.NOT_FOUND, {"error": f"No route for {method} {path}"}
+
+    async def _send(self, address: str, body: bytes) -> tuple[HTTPStatus, Any]:
+        if self.settings.payload_mode == "raw":
+            obj: Any = body
+        else:
+            try:
+                obj = json.loads(body)
+            except ValueError:
+                return HTTPStatus.BAD_REQUEST, {"error": "Body must be JSON"}
+        try:
+            await self.pool.send(address, obj)
+        except DeviceBusyError as exc:
+            return HTTPStatus.TOO_MANY_REQUESTS, {"error": str(exc)}
+        except GatewayOverloadedError as exc:
+            return HTTPStatus.SERVICE_UNAVAILABLE, {"error": str(exc)}
+        except BluetoothServerError as exc:
+            return HTTPStatus.BAD_GATEWAY, {"error": str(exc)}
+        return HTTPStatus.OK, {"status": "delivered", "device": address}
+
+    async def _receive(self, channel: str, query: dict[str, list[str]]) -> tuple[HTTPStatus, Any]:
+        try:
+            number = int(channel)
+            wait = float(query.get("wait", [self.settings.receive_poll_timeout])[-1])
+            limit = int(query.get("limit", [self.settings.max_batch])[-1])
+        except ValueError:
+            return HTTPStatus.BAD_REQUEST, {"error": "channel, wait and limit must be numbers"}
+        if not 1 <= number <= 30:
+            return HTTPStatus.BAD_REQUEST, {"error": "RFCOMM channels are 1-30"}
+        if not (wait >= 0 and limit >= 1):
+            return HTTPStatus.BAD_REQUEST, {"error": "wait must be >= 0 and limit >= 1"}
+        try:
+            messages = await self.pool.receive(
+                number,
+                min(limit, self.settings.max_batch),
+                min(wait, self.settings.receive_poll_timeout),
+            )
+        except GatewayOverloadedError as exc:
+            return HTTPStatus.SERVICE_UNAVAILABLE, {"error": str(exc)}
+        except BluetoothServerError as exc:
+            return HTTPStatus.BAD_GATEWAY, {"error": str(exc)}
+        return HTTPStatus.OK, {"channel": number, "messages": [_message_document(*message) for message in messages]}
+
+    async def _respond(
+        self,
+        writer: asyncio.StreamWriter,
+        status: HTTPStatus,
+        payload: Any,
+        *,
+        keep_alive: bool,
+    ) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        headers = [
+            f"HTTP/1.1 {status.value} {status.phrase}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        if status in (HTTPStatus.TOO_MANY_REQUESTS, HTTPStatus.SERVICE_UNAVAILABLE):
+            headers.append("Retry-After: 1")
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+
+def _message_document(sequence: int, payload: Any, received_at: float) -> dict[str, Any]:
+    """JSON view of a received payload; raw bytes that are not JSON are sent base64-encoded."""
+    document: dict[str, Any] = {"sequence": sequence, "received_at": received_at}
+    if isinstance(payload, (bytes, bytearray)):
+        try:
+            document["body"] = json.loads(payload)
+        except ValueError:
+            document["body_base64"] = base64.b64encode(payload).decode("ascii")
+    else:
+        document["body"] = payload
+    return document
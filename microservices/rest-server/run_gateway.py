@@ -0,0 +1,30 @@
+#!/usr/bin/python
+
+"""
+Entry point for the REST gateway in front of the Python Bluetooth SDK.
+"""
+
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "..", "sdk", "python"))
+
+from bluetooth_service.logging_utils import configure_logging  # noqa: E402
+from rest_gateway import GatewaySettings, RestGateway  # noqa: E402
+
+
+def main() -> None:
+    configure_logging("configLogger.json")
+    settings = GatewaySettings(
+        port=int(os.getenv("GATEWAY_PORT", "8080")),
+        payload_mode=os.getenv("GATEWAY_PAYLOAD_MODE", "raw"),
+    )
+    try:
+        asyncio.run(RestGateway(settings).serve_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+"""Make the gateway package and the Python SDK importable from the tests."""
+
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+SERVICE_ROOT = Path(__file__).resolve().parents[1]
+sys.path[:0] = [str(SERVICE_ROOT), str(SERVICE_ROOT.parents[1] / "sdk" / "python")]
@@ -0,0 +1,237 @@
+"""Tests for the REST gateway against the SDK loopback transport."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from typing import Any, List
+
+import pytest
+
+from bluetooth_service.client import BluetoothClient
+from bluetooth_service.client_config import ClientSettings
+from bluetooth_service.config import ServerSettings
+from bluetooth_service.exceptions import BluetoothServerError
+from bluetooth_service.loopback import (
+    LoopbackClientSocketManager,
+    LoopbackListener,
+    LoopbackServerSocketManager,
+)
+from bluetooth_service.serializers import PassthroughDeserializer, PassthroughSerializer
+from bluetooth_service.server import BluetoothServer
+from bluetooth_service.storage import NullSink
+from rest_gateway import DeviceBusyError, DeviceLinkPool, GatewaySettings, RestGateway
+
+
+class ListSink:
+    def __init__(self) -> None:
+        self.persisted: List[Any] = []
+
+    def persist(self, obj: Any) -> None:
+        self.persisted.append(obj)
+
+
+def _serve(listener: LoopbackListener, sink: ListSink, messages: int) -> threading.Thread:
+    server = BluetoothServer(
+        ServerSettings(),
+        deserializer=PassthroughDeserializer(),
+        sink=sink,
+        socket_manager=LoopbackServerSocketManager(listener),
+    )
+
+    def run() -> None:
+        server.start()
+        try:
+            for _ in range(messages):
+                server.receive_once()
+        finally:
+            server.stop()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
+
+
+async def _request(port: int, method: str, path: str, body: bytes = b"") -> tuple[int, Any]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(body)}\r\n"
+        f"Connection: close\r\n\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(payload)
+
+
+def test_requests_share_one_warm_link() -> None:
+    listener = LoopbackListener()
+    sink = ListSink()
+    server_thread = _serve(listener, sink, messages=5)
+
+    def factory(address: str) -> BluetoothClient:
+        return BluetoothClient(
+            ClientSettings(target_address=address),
+            serializer=PassthroughSerializer(),
+            socket_manager=LoopbackClientSocketManager(listener),
+        )
+
+    async def scenario() -> None:
+        settings = GatewaySettings(host="127.0.0.1", port=0)
+        gateway = RestGateway(settings, DeviceLinkPool(settings, factory))
+        await gateway.start()
+        port = gateway.bound_address[1]
+        try:
+            results = await asyncio.gather(
+                *(
+                    _request(port, "POST", "/devices/AA:BB/messages", json.dumps({"n": n}).encode())
+                    for n in range(5)
+                )
+            )
+            assert [status for status, _ in results] == [200] * 5
+            status, devices = await _request(port, "GET", "/devices")
+            assert status == 200
+            assert devices["links"]["AA:BB"]["connects"] == 1
+            assert devices["links"]["AA:BB"]["delivered"] == 5
+        finally:
+            await gateway.close()
+
+    asyncio.run(scenario())
+    server_thread.join(timeout=5)
+    assert sorted(json.loads(payload)["n"] for payload in sink.persisted) == list(range(5))
+
+
+def test_channel_messages_are_long_polled_from_a_pooled_server() -> None:
+    listener = LoopbackListener(channel=3)
+    device = BluetoothClient(
+        ClientSettings(payload_mode="raw"),
+        serializer=PassthroughSerializer(),
+        socket_manager=LoopbackClientSocketManager(listener),
+    )
+    payloads = [json.dumps({"n": n}).encode() for n in range(3)] + [b"\xff not json"]
+
+    def transmit() -> None:
+        device.start()
+        for payload in payloads:
+            device.send_object(payload)
+
+    def factory(channel: int) -> BluetoothServer:
+        assert channel == listener.channel
+        return BluetoothServer(
+            ServerSettings(port=channel, payload_mode="raw"),
+            deserializer=PassthroughDeserializer(),
+            sink=NullSink(),
+            socket_manager=LoopbackServerSocketManager(listener),
+        )
+
+    async def scenario() -> List[Any]:
+        settings = GatewaySettings(host="127.0.0.1", port=0)
+        gateway = RestGateway(settings, DeviceLinkPool(settings, server_factory=factory))
+        await gateway.start()
+        port = gateway.bound_address[1]
+        try:
+            assert (await _request(port, "GET", "/channels/31/messages"))[0] == 400
+            sender = asyncio.create_task(asyncio.to_thread(transmit))
+            received: List[Any] = []
+            while len(received) < len(payloads):
+                status, body = await _request(port, "GET", "/channels/3/messages?wait=5")
+                assert status == 200 and body["channel"] == 3
+                received += body["messages"]
+            await sender
+            status, body = await _request(port, "GET", "/channels/3/messages?wait=0")
+            assert (status, body["messages"]) == (200, [])
+            status, devices = await _request(port, "GET", "/devices")
+            assert devices["channels"]["3"]["received"] == devices["channels"]["3"]["delivered"] == 4
+            return received
+        finally:
+            await gateway.close()
+            device.stop()
+
+    received = asyncio.run(scenario())
+
+    assert [message["sequence"] for message in received] == [1, 2, 3, 4]
+    assert [message.get("body") for message in received[:3]] == [{"n": n} for n in range(3)]
+    assert received[3]["body_base64"] == "/yBub3QganNvbg=="
+
+
+class BlockingClient:
+    def __init__(self, release: threading.Event) -> None:
+        self.release = release
+
+    def start(self) -> None:
+        pass
+
+    def send_object(self, obj: Any) -> None:
+        self.release.wait(5)
+
+    def stop(self) -> None:
+        pass
+
+
+def test_full_device_queue_is_rejected() -> None:
+    release = threading.Event()
+    settings = GatewaySettings(max_pending_per_device=1, max_batch=1)
+    pool = DeviceLinkPool(settings, lambda address: BlockingClient(release))
+
+    async def scenario() -> None:
+        in_flight = asyncio.create_task(pool.send("dev", b"1"))
+        await asyncio.sleep(0.05)  # first request is now on the link thread
+        queued = asyncio.create_task(pool.send("dev", b"2"))
+        await asyncio.sleep(0.05)
+        with pytest.raises(DeviceBusyError):
+            await pool.send("dev", b"3")
+        release.set()
+        await asyncio.gather(in_flight, queued)
+        await pool.close()
+
+    asyncio.run(scenario())
+
+
+class UnreachableClient:
+    def __init__(self, attempts: List[str]) -> None:
+        self.attempts = attempts
+
+    def start(self) -> None:
+        self.attempts.append("start")
+        raise BluetoothServerError("Unable to connect")
+
+    def send_object(self, obj: Any) -> None:
+        raise AssertionError("never connected")
+
+    def stop(self) -> None:
+        pass
+
+
+def test_connect_failure_fails_the_rest_of_the_batch() -> None:
+    attempts: List[str] = []
+    settings = GatewaySettings(max_batch=3)
+    pool = DeviceLinkPool(settings, lambda address: UnreachableClient(attempts))
+
+    async def scenario() -> List[Any]:
+        results = await asyncio.gather(*(pool.send("dev", n) for n in range(3)), return_exceptions=True)
+        await pool.close()
+        return results
+
+    results = asyncio.run(scenario())
+
+    assert all(isinstance(result, BluetoothServerError) for result in results)
+    assert attempts == ["start"]
+
+
+def test_invalid_content_length_is_rejected() -> None:
+    async def scenario() -> bytes:
+        gateway = RestGateway(GatewaySettings(host="127.0.0.1", port=0))
+        await gateway.start()
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", gateway.bound_address[1])
+            writer.write(b"POST /devices/AA:BB/messages HTTP/1.1\r\nContent-Length: ten\r\n\r\n")
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            return response
+        finally:
+            await gateway.close()
+
+    assert asyncio.run(scenario()).startswith(b"HTTP/1.1 400 ")
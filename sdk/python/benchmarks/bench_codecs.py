@@ -0,0 +1,97 @@
+#!/usr/bin/python
+
+"""
+Compare payload size and encode/decode speed of the SDK's codecs.
+
+Each codec encodes and decodes a varying sensor trace; decode is timed on
+payloads encoded beforehand. Sizes are mean bytes per reading.
+
+Run from `sdk/python`: `python3 benchmarks/bench_codecs.py [iterations]`.
+"""
+
+from __future__ import annotations
+
+import json
+import pickle
+import random
+import sys
+import timeit
+from pathlib import Path
+from typing import Any, Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from bluetooth_service.delta_codec import DeltaStreamDeserializer, DeltaStreamSerializer  # noqa: E402
+from bluetooth_service.schema import StructDeserializer, StructSerializer, load_schema_directory  # noqa: E402
+
+SERIES_LENGTH = 1_000
+
+
+def sensor_series(length: int = SERIES_LENGTH, seed: int = 0) -> list[dict[str, Any]]:
+    """A sampled sensor trace: values drift a little between readings, like real telemetry."""
+    rng = random.Random(seed)
+    timestamp, temperature, humidity = 1700000000.0, 21.5, 40.25
+    series = []
+    for _ in range(length):
+        timestamp = round(timestamp + 1.0 + rng.uniform(-0.01, 0.01), 3)
+        temperature = round(temperature + rng.gauss(0.0, 0.05), 2)
+        humidity = round(min(100.0, max(0.0, humidity + rng.gauss(0.0, 0.2))), 2)
+        series.append(
+            {
+                "timestamp": timestamp,
+                "sensor_id": 7,
+                "temperature": temperature,
+                "humidity": humidity,
+                "battery_ok": rng.random() > 0.001,
+            }
+        )
+    return series
+
+
+def main(iterations: int = 100_000) -> None:
+    registry = load_schema_directory()
+    struct_serializer = StructSerializer(registry.get("SensorReading"))
+    struct_deserializer = StructDeserializer(registry)
+    delta_serializer = DeltaStreamSerializer(float_precision={"timestamp": 3, "temperature": 2, "humidity": 2})
+    delta_deserializer = DeltaStreamDeserializer()
+    series = sensor_series()
+    passes = max(1, iterations // len(series))
+
+    # name -> (encode, decode, reset); stateful codecs restart from a schema
+    # frame on every pass, as they would on a new connection.
+    codecs: dict[str, tuple[Callable[[Any], bytes], Callable[[bytes], Any], Callable[[], None]]] = {
+        "pickle": (pickle.dumps, pickle.loads, lambda: None),
+        "json": (lambda obj: json.dumps(obj).encode("utf-8"), json.loads, lambda: None),
+        "struct": (struct_serializer.serialize, struct_deserializer.deserialize, lambda: None),
+        "delta": (
+            delta_serializer.serialize,
+            delta_deserializer.deserialize,
+            lambda: (delta_serializer.reset(), delta_deserializer.reset()),
+        ),
+    }
+    print(f"{'codec':<8} {'bytes':>6} {'encode/s':>12} {'decode/s':>12}")
+    for name, (encode, decode, reset) in codecs.items():
+        reset()
+        payloads = [encode(reading) for reading in series]
+
+        def encode_pass() -> None:
+            reset()
+            for reading in series:
+                encode(reading)
+
+        def decode_pass() -> None:
+            reset()
+            for payload in payloads:
+                decode(payload)
+
+        encode_seconds = timeit.timeit(encode_pass, number=passes)
+        decode_seconds = timeit.timeit(decode_pass, number=passes)
+        readings = passes * len(series)
+        print(
+            f"{name:<8} {sum(map(len, payloads)) / len(payloads):>6.1f} "
+            f"{readings / encode_seconds:>12,.0f} {readings / decode_seconds:>12,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
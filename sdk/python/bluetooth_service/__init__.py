@@ -3,21 +3,46 @@ bluetooth_service
 =================
 
 SDK-style helpers and abstractions for building RFCOMM Bluetooth clients/servers.
+
+Public names are resolved lazily (PEP 562) so that importing the package, or a
+single submodule, does not pull in both stacks and PyBluez.
 """
 
-from .client import BluetoothClient
-from .client_config import ClientSettings
-from .client_sdk import BluetoothClientSDK
-from .config import ServerSettings
-from .server import BluetoothServer
-from .sdk import BluetoothServerSDK
-
-__all__ = [
-    "BluetoothClient",
-    "BluetoothClientSDK",
-    "ClientSettings",
-    "BluetoothServer",
-    "BluetoothServerSDK",
-    "ServerSettings",
-]
+from __future__ import annotations
+
+import importlib
+
+_EXPORTS = {
+    "BluetoothClient": ".client",
+    "BluetoothClientSDK": ".client_sdk",
+    "ClientSettings": ".client_config",
+    "BluetoothServer": ".server",
+    "BluetoothServerSDK": ".sdk",
+    "ServerSettings": ".config",
+}
+
+__all__ = list(_EXPORTS)
+
+# `typing` alone costs several milliseconds of import time, so the type-checking
+# guard is spelled out instead of importing typing.TYPE_CHECKING.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from .client import BluetoothClient
+    from .client_config import ClientSettings
+    from .client_sdk import BluetoothClientSDK
+    from .config import ServerSettings
+    from .sdk import BluetoothServerSDK
+    from .server import BluetoothServer
+
+
+def __getattr__(name: str) -> object:
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
 
+def __dir__() -> list[str]:
+    return sorted([*globals(), *__all__])
@@ -0,0 +1,136 @@
+"""Loopback throughput/latency benchmark used by `ubtctl bench`."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from typing import Any, Iterator, Optional
+
+from .client import BluetoothClient
+from .client_config import ClientSettings
+from .config import ServerSettings
+from .delta_codec import DeltaStreamDeserializer, DeltaStreamSerializer
+from .exceptions import BluetoothServerError
+from .interfaces import DataSource, Deserializer, Serializer
+from .loopback import LoopbackClientSocketManager, LoopbackListener, LoopbackServerSocketManager
+from .metrics import percentile
+from .serializers import (
+    PassthroughDeserializer,
+    PassthroughSerializer,
+    PickleDeserializer,
+    PickleSerializer,
+)
+from .server import BluetoothServer
+from .storage import NullSink
+
+
+class IteratorSource(DataSource):
+    """Data source handing out pre-built objects one per `load()`."""
+
+    def __init__(self, items: Iterator[Any]) -> None:
+        self._items = items
+
+    def load(self) -> Any:
+        return next(self._items)
+
+
+def sample_readings(count: int, payload_size: int) -> list[dict[str, Any]]:
+    """Synthetic 10 Hz sensor readings padded with `payload_size` filler bytes."""
+    filler = "x" * payload_size
+    return [
+        {
+            "timestamp": 1700000000.0 + index / 10,
+            "sensor_id": index % 8,
+            "value": 20.0 + (index % 50) / 10,
+            "note": filler,
+        }
+        for index in range(count)
+    ]
+
+
+def bench_codec(codec: str) -> tuple[Serializer, Deserializer]:
+    if codec == "pickle":
+        return PickleSerializer(), PickleDeserializer()
+    if codec == "raw":
+        return PassthroughSerializer(), PassthroughDeserializer()
+    if codec == "delta":
+        return DeltaStreamSerializer(float_precision={"timestamp": 1, "value": 1}), DeltaStreamDeserializer()
+    raise BluetoothServerError(f"Unknown bench codec {codec!r}")
+
+
+def run_loopback_bench(
+    messages: int = 10_000,
+    payload_size: int = 64,
+    codec: str = "pickle",
+    auto_tune: bool = False,
+) -> dict[str, Any]:
+    """
+    Send `messages` payloads through a real client/server pair over loopback.
+
+    Returns throughput and per-message round-trip (send until ACK) latency.
+    """
+    serializer, deserializer = bench_codec(codec)
+    readings = sample_readings(messages, payload_size)
+    objects: list[Any] = readings
+    if codec == "raw":
+        objects = [json.dumps(reading).encode("utf-8") for reading in readings]
+    buffer_size = payload_size + 1024
+
+    listener = LoopbackListener()
+    server = BluetoothServer(
+        ServerSettings(buffer_size=buffer_size, auto_tune=auto_tune, max_buffer_size=buffer_size),
+        deserializer=deserializer,
+        sink=NullSink(),
+        socket_manager=LoopbackServerSocketManager(listener),
+    )
+    client = BluetoothClient(
+        ClientSettings(buffer_size=buffer_size, auto_tune=auto_tune),
+        serializer=serializer,
+        source=IteratorSource(iter(objects)),
+        socket_manager=LoopbackClientSocketManager(listener),
+    )
+
+    failure: list[BaseException] = []
+
+    def serve() -> None:
+        try:
+            server.start()
+            for _ in range(messages):
+                server.receive_once()
+        except BaseException as exc:  # surfaced to the caller below
+            failure.append(exc)
+        finally:
+            server.stop()
+
+    server_thread = threading.Thread(target=serve, name="bench-server", daemon=True)
+    server_thread.start()
+    latencies: list[float] = []
+    client.start()
+    started = time.perf_counter()
+    try:
+        for _ in range(messages):
+            sent_at = time.perf_counter()
+            client.send_once()
+            latencies.append(time.perf_counter() - sent_at)
+    finally:
+        elapsed = time.perf_counter() - started
+        client.stop()
+        server_thread.join(timeout=5)
+    if failure:
+        raise BluetoothServerError("Benchmark server failed", cause=failure[0])
+
+    received: Optional[float] = server.metrics.snapshot().get("bytes_received")
+    report = {
+        "codec": codec,
+        "messages": messages,
+        "seconds": elapsed,
+        "messages/s": messages / elapsed,
+        "payload MB/s": (received or 0) / elapsed / 1e6,
+        "bytes/message": (received or 0) / messages,
+        "p50 ms": percentile(latencies, 0.50) * 1e3,
+        "p99 ms": percentile(latencies, 0.99) * 1e3,
+    }
+    if client.tuner is not None:
+        report.update({f"tuned {name}": value for name, value in client.tuner.snapshot().items()})
+    return report
@@ -0,0 +1,271 @@
+"""Fan-out hub broadcasting messages to many connected peers."""
+
+from __future__ import annotations
+
+import collections
+import itertools
+import logging
+import socket
+import threading
+import time
+from typing import Any, Callable, Optional
+
+from .config import ServerSettings
+from .exceptions import BluetoothServerError
+from .framing import FrameDecoder, encode_frame
+from .interfaces import Deserializer, Serializer
+from .metrics import percentile
+
+logger = logging.getLogger(__name__)
+
+SLOW_CONSUMER_POLICIES = ("drop_oldest", "disconnect", "block")
+LATENCY_SAMPLES = 1024
+
+MessageHandler = Callable[[Any, "Subscriber"], None]
+
+
+class Subscriber:
+    """
+    One connected peer with a bounded outbound queue and its own writer thread.
+
+    Frames are shared, immutable `bytes` objects: a broadcast is serialized
+    once and the same buffer is queued for every subscriber.
+    """
+
+    def __init__(
+        self,
+        peer_id: str,
+        sock: Any,
+        settings: ServerSettings,
+        on_closed: Callable[["Subscriber"], None],
+    ) -> None:
+        self.peer_id = peer_id
+        self._socket = sock
+        self._settings = settings
+        self._on_closed = on_closed
+        self._queue: collections.deque[tuple[bytes, float]] = collections.deque()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._latencies: collections.deque[float] = collections.deque(maxlen=LATENCY_SAMPLES)
+        self.sent = 0
+        self.dropped = 0
+        self._writer = threading.Thread(target=self._write_loop, name=f"hub-writer-{peer_id}", daemon=True)
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def start(self) -> None:
+        self._writer.start()
+
+    def offer(self, frame: bytes, enqueued_at: float) -> bool:
+        """Queue a frame, applying the slow-consumer policy when full."""
+        policy = self._settings.slow_consumer_policy
+        limit = self._settings.subscriber_queue_size
+        with self._condition:
+            if self._closed:
+                return False
+            if len(self._queue) >= limit:
+                if policy == "drop_oldest":
+                    self._queue.popleft()
+                    self.dropped += 1
+                elif policy == "block":
+                    self._condition.wait_for(
+                        lambda: self._closed or len(self._queue) < limit,
+                        timeout=self._settings.slow_consumer_block_seconds,
+                    )
+                if self._closed:
+                    return False
+                if len(self._queue) >= limit:
+                    # "disconnect", or "block" that timed out.
+                    logger.warning("Disconnecting slow subscriber %s", self.peer_id)
+                    self.dropped += 1
+                    self._close_locked()
+                    return False
+            self._queue.append((frame, enqueued_at))
+            self._condition.notify_all()
+            return True
+
+    def close(self) -> None:
+        with self._condition:
+            self._close_locked()
+
+    def stats(self) -> dict[str, float]:
+        latencies = list(self._latencies)
+        return {
+            "queued": len(self._queue),
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "latency_p50_ms": percentile(latencies, 0.50) * 1e3,
+            "latency_p99_ms": percentile(latencies, 0.99) * 1e3,
+            "latency_max_ms": max(latencies, default=0.0) * 1e3,
+        }
+
+    def _close_locked(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.clear()
+        self._condition.notify_all()
+        try:
+            # close() alone wakes neither our reader blocked in recv() nor a
+            # writer stuck in sendall() to a peer that stopped reading.
+            self._socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass  # peer already gone
+        try:
+            self._socket.close()
+        except OSError as exc:
+            logger.debug("Failed to close subscriber %s socket: %s", self.peer_id, exc)
+        threading.Thread(target=self._on_closed, args=(self,), daemon=True).start()
+
+    def _write_loop(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._closed or self._queue)
+                if self._closed:
+                    return
+                frame, enqueued_at = self._queue.popleft()
+                self._condition.notify_all()
+            try:
+                self._socket.sendall(frame)
+            except OSError as exc:
+                logger.info("Subscriber %s went away: %s", self.peer_id, exc)
+                self.close()
+                return
+            self.sent += 1
+            self._latencies.append(time.monotonic() - enqueued_at)
+
+
+class BroadcastHub:
+    """
+    Accept many peers on one RFCOMM channel and fan messages out to all of them.
+
+    Hub connections carry one-way length-prefixed frames in both directions
+    (no per-message ACKs): every frame a peer sends is deserialized, handed to
+    `on_message`, and rebroadcast to every other peer.
+    """
+
+    def __init__(
+        self,
+        settings: Optional[ServerSettings] = None,
+        *,
+        serializer: Serializer,
+        deserializer: Deserializer,
+        socket_manager: Optional[Any] = None,
+        on_message: Optional[MessageHandler] = None,
+    ) -> None:
+        self.settings = settings or ServerSettings()
+        if self.settings.slow_consumer_policy not in SLOW_CONSUMER_POLICIES:
+            raise BluetoothServerError(f"Unknown slow consumer policy {self.settings.slow_consumer_policy!r}")
+        self._serializer = serializer
+        self._deserializer = deserializer
+        if socket_manager is None:
+            from .socket_manager import SocketManager
+
+            socket_manager = SocketManager()
+        self._socket_manager = socket_manager
+        self._on_message = on_message
+        self._subscribers: dict[str, Subscriber] = {}
+        self._lock = threading.Lock()
+        self._running = False
+        self._ids = itertools.count(1)
+        self._acceptor: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._socket_manager.open_server()
+        port = self._socket_manager.bind_and_listen(
+            self.settings.socket_host,
+            self.settings.backlog,
+            port=self.settings.port,
+        )
+        self._socket_manager.advertise(
+            self.settings.service_name,
+            self.settings.uuid,
+            advertise_profile=self.settings.advertise,
+        )
+        self._running = True
+        self._acceptor = threading.Thread(target=self._accept_loop, name="hub-acceptor", daemon=True)
+        self._acceptor.start()
+        logger.info("Broadcast hub listening on RFCOMM port %s", port)
+
+    def publish(self, obj: Any, exclude: Optional[Subscriber] = None) -> int:
+        """Serialize `obj` once and queue it for every subscriber; returns recipients."""
+        frame = encode_frame(self._serializer.serialize(obj))
+        enqueued_at = time.monotonic()
+        with self._lock:
+            subscribers = list(self._subscribers.values())
+        delivered = 0
+        for subscriber in subscribers:
+            if subscriber is not exclude and subscriber.offer(frame, enqueued_at):
+                delivered += 1
+        return delivered
+
+    def subscriber_stats(self) -> dict[str, dict[str, float]]:
+        with self._lock:
+            subscribers = list(self._subscribers.values())
+        return {subscriber.peer_id: subscriber.stats() for subscriber in subscribers}
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+    def stop(self) -> None:
+        self._running = False
+        with self._lock:
+            subscribers = list(self._subscribers.values())
+        for subscriber in subscribers:
+            subscriber.close()
+        self._socket_manager.close()
+        if self._acceptor is not None:
+            self._acceptor.join(timeout=(self.settings.accept_timeout or 0.5) + 1)
+        logger.info("Broadcast hub stopped")
+
+    # Internals -----------------------------------------------------------------
+
+    def _accept_loop(self) -> None:
+        # Poll so stop() is honoured even by transports whose accept() cannot
+        # be interrupted by closing the listening socket.
+        timeout = self.settings.accept_timeout or 0.5
+        while self._running:
+            try:
+                sock, client_info = self._socket_manager.accept(timeout=timeout)
+            except BluetoothServerError:
+                continue
+            if not self._running:
+                sock.close()
+                return
+            subscriber = Subscriber(f"peer-{next(self._ids)}", sock, self.settings, self._forget)
+            with self._lock:
+                self._subscribers[subscriber.peer_id] = subscriber
+            subscriber.start()
+            threading.Thread(
+                target=self._read_loop,
+                args=(subscriber, sock),
+                name=f"hub-reader-{subscriber.peer_id}",
+                daemon=True,
+            ).start()
+            logger.info("Subscriber %s connected from %s", subscriber.peer_id, client_info)
+
+    def _read_loop(self, subscriber: Subscriber, sock: Any) -> None:
+        decoder = FrameDecoder()
+        try:
+            while not subscriber.closed:
+                data = sock.recv(self.settings.buffer_size)
+                if not data:
+                    break
+                for payload in decoder.feed(data):
+                    obj = self._deserializer.deserialize(payload)
+                    if self._on_message is not None:
+                        self._on_message(obj, subscriber)
+                    self.publish(obj, exclude=subscriber)
+        except (OSError, BluetoothServerError) as exc:
+            logger.info("Subscriber %s read ended: %s", subscriber.peer_id, exc)
+        finally:
+            subscriber.close()
+
+    def _forget(self, subscriber: Subscriber) -> None:
+        with self._lock:
+            self._subscribers.pop(subscriber.peer_id, None)
+        logger.info("Subscriber %s disconnected", subscriber.peer_id)
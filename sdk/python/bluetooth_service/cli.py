@@ -0,0 +1,231 @@
+"""
+`ubtctl` command-line interface.
+
+Only `argparse` is imported up front (not even `typing`); every subcommand
+imports the parts of the SDK (and PyBluez) it needs when it runs, so `--help`
+and short-lived invocations from cron/udev stay cheap.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+DEFAULT_STATUS_FILE = "ubtctl-server.status.json"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="ubtctl", description="Universal Bluetooth SDK control tool")
+    parser.add_argument("--log-config", default="configLogger.json", help="logging dictConfig JSON file")
+    parser.add_argument("--log-queue", action="store_true", help="write logs from a background thread")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    server = commands.add_parser("server", help="run or inspect the RFCOMM server")
+    server_commands = server.add_subparsers(dest="server_command", required=True)
+    start = server_commands.add_parser("start", help="run pre-forked server workers until interrupted")
+    start.add_argument("--workers", type=int, default=1, help="worker processes (PORT_ANY each)")
+    start.add_argument("--channels", default="", help="comma-separated RFCOMM channels, one worker each")
+    start.add_argument("--json-file", default="text.json", help="where received payloads are written")
+    start.add_argument("--payload-mode", choices=("pickle", "raw"), default="pickle")
+    start.add_argument("--status-file", default=DEFAULT_STATUS_FILE)
+    start.add_argument("--record-dir", default=None, help="record each worker's traffic into this directory")
+    start.add_argument("--peer-timeout", type=float, default=None, help="close links silent for this many seconds")
+    start.add_argument("--idle-timeout", type=float, default=None, help="close links without payloads this long")
+    start.set_defaults(handler=_server_start)
+    status = server_commands.add_parser("status", help="show workers and metrics of a running server")
+    status.add_argument("--status-file", default=DEFAULT_STATUS_FILE)
+    status.set_defaults(handler=_server_status)
+
+    client = commands.add_parser("client", help="send payloads to a server")
+    client_commands = client.add_subparsers(dest="client_command", required=True)
+    send = client_commands.add_parser("send", help="send one file and wait for the acknowledgement")
+    send.add_argument("--file", default="text.json")
+    send.add_argument("--address", default=None, help="target device address (default: any)")
+    send.add_argument("--uuid", default=None, help="service UUID to discover")
+    send.add_argument("--payload-mode", choices=("pickle", "raw"), default="pickle")
+    send.add_argument("--spread", action="store_true", help="pick a random advertised channel")
+    send.add_argument("--record", default=None, help="record the exchanged traffic to this log file")
+    send.set_defaults(handler=_client_send)
+
+    discover = commands.add_parser("discover", help="list nearby devices and advertised services")
+    discover.add_argument("--uuid", default=None, help="only list services with this UUID")
+    discover.add_argument("--address", default=None)
+    discover.add_argument("--duration", type=int, default=8, help="inquiry duration (1.28 s units)")
+    discover.set_defaults(handler=_discover)
+
+    bench = commands.add_parser("bench", help="measure throughput over the loopback transport")
+    bench.add_argument("--messages", type=int, default=10_000)
+    bench.add_argument("--payload-size", type=int, default=64, help="bytes of filler per message")
+    bench.add_argument("--codec", choices=("pickle", "raw", "delta"), default="pickle")
+    bench.add_argument("--auto-tune", action="store_true", help="enable AIMD chunk/buffer tuning")
+    bench.set_defaults(handler=_bench)
+
+    replay = commands.add_parser("replay", help="replay recorded traffic against loopback servers")
+    replay.add_argument("log", help="traffic log written by --record / --record-dir")
+    replay.add_argument("--speed", type=float, default=1.0, help="time scale; 0 replays as fast as possible")
+    replay.add_argument("--multiplier", type=int, default=1, help="concurrent copies of each recorded connection")
+    replay.add_argument("--codec", choices=("pickle", "raw", "delta"), default="pickle")
+    replay.set_defaults(handler=_replay)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args) or 0
+
+
+# Subcommands ---------------------------------------------------------------------
+
+
+def _configure_logging(args: argparse.Namespace) -> None:
+    from .logging_utils import configure_logging
+
+    configure_logging(args.log_config, queued=args.log_queue)
+
+
+def _server_start(args: argparse.Namespace) -> int:
+    from .config import ServerSettings
+    from .supervisor import ServerSupervisor
+
+    _configure_logging(args)
+    channels = tuple(int(channel) for channel in args.channels.split(",") if channel)
+    settings = ServerSettings(
+        json_file=args.json_file,
+        payload_mode=args.payload_mode,
+        workers=args.workers,
+        worker_channels=channels,
+        peer_timeout_seconds=args.peer_timeout,
+        idle_timeout_seconds=args.idle_timeout,
+    )
+    if args.record_dir:
+        import functools
+
+        from .traffic import recording_server_factory
+
+        os.makedirs(args.record_dir, exist_ok=True)
+        factory = functools.partial(recording_server_factory, args.record_dir)
+        ServerSupervisor(settings, server_factory=factory, status_path=args.status_file).run()
+        return 0
+    ServerSupervisor(settings, status_path=args.status_file).run()
+    return 0
+
+
+def _server_status(args: argparse.Namespace) -> int:
+    import json
+
+    try:
+        with open(args.status_file, "r", encoding="utf-8") as status_file:
+            status = json.load(status_file)
+    except FileNotFoundError:
+        print(f"No server status at {args.status_file}", file=sys.stderr)
+        return 1
+
+    running = status["running"] and _pid_alive(status["pid"])
+    print(f"supervisor pid {status['pid']}: {'running' if running else 'stopped'}")
+    for worker in status["workers"]:
+        state = "alive" if running and worker["alive"] else "down"
+        print(
+            f"  worker {worker['index']} channel {worker['channel'] or 'any'} "
+            f"pid {worker['pid']} {state} restarts={worker['restarts']}"
+        )
+        for name, value in sorted(worker.get("gauges", {}).items()):
+            print(f"    {name}: {value:g}")
+    for name, value in sorted(status["metrics"].items()):
+        print(f"  {name}: {value:g}")
+    return 0 if running else 3
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _client_send(args: argparse.Namespace) -> int:
+    import dataclasses
+
+    from .client_config import ClientSettings
+    from .client_sdk import BluetoothClientSDK
+
+    _configure_logging(args)
+    settings = ClientSettings(
+        json_file=args.file,
+        target_address=args.address,
+        payload_mode=args.payload_mode,
+        spread_across_channels=args.spread,
+    )
+    if args.uuid:
+        settings = dataclasses.replace(settings, service_uuid=args.uuid)
+    if not args.record:
+        BluetoothClientSDK.default(settings).run_once()
+        return 0
+
+    from .client import BluetoothClient
+    from .client_sdk import default_codec_and_source
+    from .client_socket import ClientSocketManager
+    from .traffic import RecordingSocketManager, TrafficRecorder
+
+    recorder = TrafficRecorder(args.record)
+    serializer, source = default_codec_and_source(settings)
+    socket_manager = RecordingSocketManager(ClientSocketManager(settings), recorder, role="client")
+    client = BluetoothClient(settings, serializer=serializer, source=source, socket_manager=socket_manager)
+    try:
+        BluetoothClientSDK(client).run_once()
+    finally:
+        recorder.close()
+    return 0
+
+
+def _discover(args: argparse.Namespace) -> int:
+    import bluetooth
+
+    if args.uuid or args.address:
+        services = bluetooth.find_service(uuid=args.uuid, address=args.address)
+    else:
+        devices = bluetooth.discover_devices(duration=args.duration, lookup_names=True)
+        for address, name in devices:
+            print(f"{address}  {name}")
+        services = []
+    for service in services:
+        print(f"{service['host']}  channel {service['port']}  {service['name']}")
+    return 0
+
+
+def _bench(args: argparse.Namespace) -> int:
+    from .bench import run_loopback_bench
+
+    report = run_loopback_bench(
+        messages=args.messages,
+        payload_size=args.payload_size,
+        codec=args.codec,
+        auto_tune=args.auto_tune,
+    )
+    _print_report(report)
+    return 0
+
+
+def _replay(args: argparse.Namespace) -> int:
+    from .traffic import read_traffic, replay_traffic
+
+    report = replay_traffic(
+        read_traffic(args.log),
+        speed=args.speed,
+        multiplier=args.multiplier,
+        codec=args.codec,
+    )
+    _print_report(report)
+    return 0 if not report["errors"] else 1
+
+
+def _print_report(report: dict) -> None:
+    for name, value in report.items():
+        print(f"{name:>16}: {value:,.3f}" if isinstance(value, float) else f"{name:>16}: {value}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,12 +3,21 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Optional
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Optional
 
 from .client_config import ClientSettings
-from .client_socket import ClientSocketManager
 from .exceptions import BluetoothServerError
+from .framing import encode_frame
+from .heartbeat import CONTROL_TERMINATOR, LinkHealth, ping_frame
 from .interfaces import DataSource, Serializer
+from .logging_utils import new_connection_id
+from .metrics import ClientMetrics
+from .tuning import AdaptiveLinkTuner
+
+if TYPE_CHECKING:
+    from .client_socket import ClientSocketManager
 
 logger = logging.getLogger(__name__)
 
@@ -21,53 +30,237 @@ class BluetoothClient:
         settings: Optional[ClientSettings] = None,
         *,
         serializer: Serializer,
-        source: DataSource,
+        source: Optional[DataSource] = None,
         socket_manager: Optional[ClientSocketManager] = None,
+        metrics: Optional[ClientMetrics] = None,
     ) -> None:
         self.settings = settings or ClientSettings()
+        self.metrics = metrics or ClientMetrics()
+        self.tuner: Optional[AdaptiveLinkTuner] = None
+        self.connection_id: Optional[str] = None
+        self.link_health = LinkHealth()
+        self.peer_alive = False
+        self._sequence = 0
+        # Serializes socket use between callers and the heartbeat thread.
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._heartbeat: Optional[threading.Thread] = None
+        self._last_activity = 0.0
+        self._ping_sequence = 0
+        # Replies read but not consumed yet: a pong may share a read with an ACK.
+        self._replies = bytearray()
+        self._pong_prefix = f"{self.settings.pong_message}:".encode("utf-8")
         self._serializer = serializer
         self._source = source
-        self._socket_manager = socket_manager or ClientSocketManager(self.settings)
+        if socket_manager is None:
+            # Imported lazily so alternative transports do not require PyBluez.
+            from .client_socket import ClientSocketManager
+
+            socket_manager = ClientSocketManager(self.settings)
+        self._socket_manager = socket_manager
 
     def start(self) -> None:
         logger.debug("Starting Bluetooth client with settings: %s", self.settings)
         self._socket_manager.discover()
         self._socket_manager.connect()
+        self.connection_id = new_connection_id()
+        self._sequence = 0
+        # Stateful codecs (e.g. delta encoding) start fresh on every connection.
+        reset = getattr(self._serializer, "reset", None)
+        if callable(reset):
+            reset()
+        if self.settings.auto_tune:
+            # Link conditions are per connection: start tuning from scratch.
+            self.tuner = AdaptiveLinkTuner(
+                initial_size=self.settings.min_chunk_size,
+                min_size=self.settings.min_chunk_size,
+                max_size=self.settings.max_chunk_size,
+            )
+        self.link_health = LinkHealth()
+        self._replies = bytearray()
+        self.peer_alive = True
+        self._last_activity = time.monotonic()
+        if self.settings.heartbeat_interval_seconds:
+            self._stopping.clear()
+            self._heartbeat = threading.Thread(target=self._heartbeat_loop, name="client-heartbeat", daemon=True)
+            self._heartbeat.start()
 
     def send_once(self) -> Any:
+        if self._source is None:
+            raise BluetoothServerError("send_once requires a data source")
         logger.debug("Loading payload from data source")
         obj = self._source.load()
-        payload = self._serializer.serialize(obj)
-        framed_payload = self._frame_payload(payload)
-        logger.debug("Sending framed payload of %s bytes", len(framed_payload))
-        self._socket_manager.send(framed_payload)
-        self._await_ack(payload)
+        self.send_object(obj)
         return obj
 
+    def send_object(self, obj: Any) -> None:
+        """Serialize, send, and wait for the acknowledgement of `obj`."""
+        self.send_payload(self._serializer.serialize(obj))
+
+    def send_payload(self, payload: bytes) -> None:
+        """Send already-serialized `payload` and wait for its acknowledgement."""
+        framed_payload = self._frame_payload(payload)
+        with self._lock:
+            if not self.peer_alive:
+                raise BluetoothServerError("Peer is not reachable")
+            self._sequence += 1
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Sending framed payload of %s bytes", len(framed_payload), extra=self._log_context())
+            sent_at = time.monotonic()
+            self._send_framed(framed_payload)
+            self._await_ack(framed_payload)
+            self._last_activity = time.monotonic()
+        self.metrics.increment("payloads_sent")
+        self.metrics.increment("bytes_sent", len(framed_payload))
+        if self.tuner is not None:
+            self.tuner.on_ack(len(framed_payload), time.monotonic() - sent_at)
+            self.tuner.publish(self.metrics, "chunk_size")
+
     def stop(self) -> None:
-        self._socket_manager.close()
+        self._stopping.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+            self._heartbeat = None
+        with self._lock:
+            self.peer_alive = False
+            self._socket_manager.close()
 
     # Internals -----------------------------------------------------------------
+    def _log_context(self) -> dict[str, Any]:
+        return {"connection_id": self.connection_id, "sequence": self._sequence}
+
     def _frame_payload(self, payload: bytes) -> bytes:
-        prefix = f"{len(payload)}:".encode("utf-8")
-        return prefix + payload
+        return encode_frame(payload)
 
-    def _await_ack(self, payload: bytes) -> None:
+    def _send_framed(self, framed_payload: bytes) -> None:
+        if self.tuner is None:
+            self._socket_manager.send(framed_payload)
+            return
+        view = memoryview(framed_payload)
+        chunk_size = self.tuner.size
+        for offset in range(0, len(view), chunk_size):
+            self._socket_manager.send(view[offset : offset + chunk_size])
+
+    def _await_ack(self, framed_payload: bytes) -> None:
+        deadline = self._ack_deadline()
         while True:
-            response = self._socket_manager.receive(
-                self.settings.buffer_size,
-                timeout=self.settings.receive_timeout,
-            )
-            if response.decode("utf-8") in {
+            response = self._next_reply(lambda: self._receive_reply(deadline))
+            reply = response.decode("utf-8")
+            if reply in (
                 self.settings.resend_empty_message,
                 self.settings.resend_corrupt_message,
                 self.settings.delimiter_missing_message,
-            }:
-                logger.warning("Server requested retransmit: %s", response)
-                self._socket_manager.send(self._frame_payload(payload))
+            ):
+                logger.warning("Server requested retransmit: %s", reply, extra=self._log_context())
+                self.metrics.increment("resends_received")
+                if self.tuner is not None:
+                    self.tuner.on_resend()
+                self._send_framed(framed_payload)
+                deadline = self._ack_deadline()
                 continue
-            if response.decode("utf-8") == self.settings.acknowledge_message:
-                logger.info("Server acknowledged payload")
+            if response.startswith(self._pong_prefix):
+                continue  # late answer to a heartbeat that already timed out
+            if reply == self.settings.acknowledge_message:
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Server acknowledged payload", extra=self._log_context())
                 return
             raise BluetoothServerError(f"Unexpected acknowledgement: {response!r}")
 
+    def _ack_deadline(self) -> Optional[float]:
+        # The caller holds the socket lock, so heartbeats cannot notice a dead
+        # peer meanwhile; give the ACK as long as they would have needed.
+        if not self.settings.heartbeat_interval_seconds:
+            return None
+        return time.monotonic() + self.settings.heartbeat_timeout_seconds * self.settings.heartbeat_max_missed
+
+    def _next_reply(self, read: Callable[[], bytes]) -> bytes:
+        """
+        Take one reply off the front of the reply buffer, calling `read` for more.
+
+        Pong frames are `;`-terminated and may share a read with the reply
+        that follows them; other replies run to the end of the read (or to
+        the next pong). Returns b"" when the peer closed the connection.
+        """
+        buffer = self._replies
+        pong = self._pong_prefix
+        while True:
+            if buffer.startswith(pong):
+                end = buffer.find(CONTROL_TERMINATOR)
+                if end >= 0:
+                    reply = bytes(buffer[:end])
+                    del buffer[: end + 1]
+                    return reply
+            elif buffer and not pong.startswith(buffer):
+                end = buffer.find(pong)
+                end = len(buffer) if end < 0 else end
+                reply = bytes(buffer[:end])
+                del buffer[:end]
+                return reply
+            data = read()
+            if not data:
+                return b""
+            buffer += data
+
+    def _receive_reply(self, deadline: Optional[float]) -> bytes:
+        timeout = self.settings.receive_timeout
+        if deadline is None:
+            return self._socket_manager.receive(self.settings.buffer_size, timeout=timeout)
+        remaining = max(deadline - time.monotonic(), 0.0)
+        try:
+            return self._socket_manager.receive(
+                self.settings.buffer_size,
+                timeout=remaining if timeout is None else min(timeout, remaining),
+            )
+        except BluetoothServerError as exc:
+            if time.monotonic() >= deadline:
+                self._declare_dead(f"no acknowledgement ({exc})")
+            raise
+
+    def _heartbeat_loop(self) -> None:
+        interval = self.settings.heartbeat_interval_seconds or 0.0
+        while not self._stopping.wait(interval / 4):
+            with self._lock:
+                if not self.peer_alive:
+                    return
+                if time.monotonic() - self._last_activity >= interval:
+                    self._ping()
+
+    def _ping(self) -> None:
+        """One ping/pong round trip; called with the socket lock held."""
+        self._ping_sequence += 1
+        expected = self._pong_prefix + str(self._ping_sequence).encode("utf-8")
+        sent_at = time.monotonic()
+        deadline = sent_at + self.settings.heartbeat_timeout_seconds
+
+        def read() -> bytes:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise BluetoothServerError("Heartbeat timed out")
+            return self._socket_manager.receive(self.settings.buffer_size, timeout=remaining)
+
+        try:
+            self._socket_manager.send(ping_frame(self.settings.ping_message, self._ping_sequence))
+            while True:
+                reply = self._next_reply(read)
+                if not reply:
+                    self._declare_dead("connection closed by peer")
+                    return
+                if reply == expected:
+                    break
+        except BluetoothServerError as exc:
+            self.link_health.on_loss()
+            self.link_health.publish(self.metrics)
+            logger.warning("Heartbeat %s lost: %s", self._ping_sequence, exc, extra=self._log_context())
+            if self.link_health.missed >= self.settings.heartbeat_max_missed:
+                self._declare_dead(f"{self.link_health.missed} heartbeats missed")
+            self._last_activity = time.monotonic()
+            return
+        self._last_activity = time.monotonic()
+        self.link_health.on_pong(self._last_activity - sent_at)
+        self.link_health.publish(self.metrics)
+
+    def _declare_dead(self, reason: str) -> None:
+        logger.warning("Peer on connection %s is dead: %s", self.connection_id, reason, extra=self._log_context())
+        self.metrics.increment("dead_peers")
+        self.peer_alive = False
+        self._socket_manager.close()
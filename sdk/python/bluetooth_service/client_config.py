@@ -13,15 +13,45 @@ class ClientSettings:
     service_uuid: str = "94f39d29-7d6d-437d-973b-fba39e49d4ee"
     target_address: Optional[str] = None
     json_file: str = "text.json"
+    # "pickle" loads and pickles `json_file`; "raw" sends its bytes unchanged.
+    payload_mode: str = "pickle"
+    use_mmap: bool = False
     buffer_size: int = 1024
     discovery_retries: int = 3
     discovery_backoff_seconds: float = 0.5
+    # Pick a random advertised channel instead of the first one so clients
+    # spread across pre-forked server workers.
+    spread_across_channels: bool = False
+    # Auto-tuning: adapt the send chunk size within bounds (AIMD) from
+    # measured RTT/goodput and resends. Chunked sends need a server with
+    # frame reassembly (ServerSettings.auto_tune).
+    auto_tune: bool = False
+    min_chunk_size: int = 256
+    max_chunk_size: int = 8192
+    # Durable outbox: when set, payloads are written to a write-ahead log in
+    # this directory first and drained in batches whenever a link is up.
+    outbox_dir: Optional[str] = None
+    outbox_batch_size: int = 64
+    outbox_segment_bytes: int = 4 << 20
     resend_empty_message: str = "EmptyBufferResend"
     resend_corrupt_message: str = "CorruptedBufferResend"
     delimiter_missing_message: str = "DelimiterMissingBufferResend"
     acknowledge_message: str = "DataReceived"
     connect_timeout: Optional[float] = None
     receive_timeout: Optional[float] = None
+    # Heartbeat: ping the server after `heartbeat_interval_seconds` without
+    # traffic; `heartbeat_max_missed` consecutive pings unanswered within
+    # `heartbeat_timeout_seconds` mark the peer dead and close the socket.
+    # With heartbeats on, an acknowledgement that takes longer than
+    # `heartbeat_timeout_seconds * heartbeat_max_missed` does the same.
+    heartbeat_interval_seconds: Optional[float] = None
+    heartbeat_timeout_seconds: float = 2.0
+    heartbeat_max_missed: int = 3
+    ping_message: str = "Ping"
+    pong_message: str = "Pong"
     logging_config_path: str = "configLogger.json"
     log_env_key: str = "LOG_CFG"
+    # Run log handlers on a background thread so handler I/O never blocks
+    # the socket thread (see logging_utils.enable_queue_logging).
+    log_queue: bool = False
 
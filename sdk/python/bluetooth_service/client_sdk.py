@@ -7,18 +7,34 @@ from typing import Any, Optional
 
 from .client import BluetoothClient
 from .client_config import ClientSettings
+from .exceptions import BluetoothServerError
+from .interfaces import DataSource, Serializer
 from .logging_utils import configure_logging
-from .serializers import PickleSerializer
-from .storage import JsonFileSource
+from .outbox import Outbox
+from .serializers import PassthroughSerializer, PickleSerializer
+from .storage import JsonFileSource, RawFileSource
 
 logger = logging.getLogger(__name__)
 
 
 class BluetoothClientSDK:
-    """Batteries-included client orchestration."""
+    """
+    Batteries-included client orchestration.
 
-    def __init__(self, client: BluetoothClient) -> None:
+    With an `outbox`, `run_once()` stores the payload before connecting and
+    then drains everything pending, so link failures no longer lose data.
+    """
+
+    def __init__(
+        self,
+        client: BluetoothClient,
+        *,
+        outbox: Optional[Outbox] = None,
+        source: Optional[DataSource] = None,
+    ) -> None:
         self._client = client
+        self._outbox = outbox
+        self._source = source
 
     @classmethod
     def default(
@@ -26,25 +42,57 @@ class BluetoothClientSDK:
         settings: Optional[ClientSettings] = None,
     ) -> "BluetoothClientSDK":
         settings = settings or ClientSettings()
-        client = BluetoothClient(
-            settings,
-            serializer=PickleSerializer(),
-            source=JsonFileSource(settings.json_file),
+        serializer, source = default_codec_and_source(settings)
+        client = BluetoothClient(settings, serializer=serializer, source=source)
+        if settings.outbox_dir is None:
+            return cls(client)
+        outbox = Outbox(
+            settings.outbox_dir,
+            serializer=serializer,
+            batch_size=settings.outbox_batch_size,
+            segment_bytes=settings.outbox_segment_bytes,
+            # Raw payloads are bytes and cannot carry the ID envelope.
+            envelope=settings.payload_mode != "raw",
         )
-        return cls(client)
+        return cls(client, outbox=outbox, source=source)
 
     def run_once(self) -> Any:
         logger.debug("Starting client SDK run loop")
+        if self._outbox is not None and self._source is not None:
+            return self._store_and_forward(self._source.load())
         try:
             self._client.start()
             return self._client.send_once()
         finally:
             self._client.stop()
 
+    def _store_and_forward(self, obj: Any) -> Any:
+        assert self._outbox is not None
+        self._outbox.put(obj)
+        try:
+            self._client.start()
+            delivered = self._outbox.drain(self._client)
+        except BluetoothServerError as exc:
+            logger.warning("Link unavailable, %s messages kept in outbox: %s", self._outbox.pending, exc)
+            return obj
+        finally:
+            self._client.stop()
+        logger.info("Delivered %s outbox messages, %s pending", delivered, self._outbox.pending)
+        return obj
+
+
+def default_codec_and_source(settings: ClientSettings) -> tuple[Serializer, DataSource]:
+    """Pick the serializer/source pair matching `settings.payload_mode`."""
+    if settings.payload_mode == "pickle":
+        return PickleSerializer(), JsonFileSource(settings.json_file)
+    if settings.payload_mode == "raw":
+        return PassthroughSerializer(), RawFileSource(settings.json_file, use_mmap=settings.use_mmap)
+    raise BluetoothServerError(f"Unknown payload mode {settings.payload_mode!r}")
+
 
 def bootstrap_and_send(settings: Optional[ClientSettings] = None) -> Any:
     settings = settings or ClientSettings()
-    configure_logging(settings.logging_config_path, env_key=settings.log_env_key)
+    configure_logging(settings.logging_config_path, env_key=settings.log_env_key, queued=settings.log_queue)
     sdk = BluetoothClientSDK.default(settings)
     return sdk.run_once()
 
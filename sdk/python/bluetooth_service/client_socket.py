@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+import random
 import time
 from typing import Optional
 
@@ -36,8 +37,16 @@ class ClientSocketManager:
                 address=self._settings.target_address,
             )
             if services:
-                self._service_info = services[0]
-                logger.info("Found service: %s", self._service_info.get("name"))
+                if self._settings.spread_across_channels:
+                    self._service_info = random.choice(services)
+                else:
+                    self._service_info = services[0]
+                logger.info(
+                    "Found service: %s (channel %s of %s advertised)",
+                    self._service_info.get("name"),
+                    self._service_info.get("port"),
+                    len(services),
+                )
                 return
             if attempt < retries:
                 time.sleep(self._settings.discovery_backoff_seconds)
@@ -19,6 +19,24 @@ class ServerSettings:
     socket_host: str = ""
     port: Optional[int] = None
 
+    # "pickle" decodes payloads into objects persisted as JSON; "raw" writes
+    # the received JSON bytes straight to `json_file` without parsing.
+    payload_mode: str = "pickle"
+    raw_validation: str = "light"
+
+    # Auto-tuning: adapt the receive buffer within bounds (AIMD) from measured
+    # frame timings and resends. Reassembly reads frames split across several
+    # recv() calls (implied by auto_tune; relies on receive_timeout to give up
+    # on truncated frames).
+    auto_tune: bool = False
+    min_buffer_size: int = 1024
+    max_buffer_size: int = 65536
+    reassemble_frames: bool = False
+
+    # Drop redelivered client outbox messages by ID (bounded LRU of IDs).
+    deduplicate_messages: bool = False
+    dedup_capacity: int = 10_000
+
     # Acknowledgement / retry protocol messages
     resend_empty_message: str = "EmptyBufferResend"
     resend_corrupt_message: str = "CorruptedBufferResend"
@@ -28,9 +46,35 @@ class ServerSettings:
     accept_timeout: Optional[float] = None
     receive_timeout: Optional[float] = None
 
+    # Link health: answer in-band "<ping>:<seq>" frames with "<pong>:<seq>".
+    # A connection is closed when nothing (pings included) arrives for
+    # `peer_timeout_seconds` (dead peer) or no payload arrives for
+    # `idle_timeout_seconds` (idle, freeing the RFCOMM channel).
+    ping_message: str = "Ping"
+    pong_message: str = "Pong"
+    peer_timeout_seconds: Optional[float] = None
+    idle_timeout_seconds: Optional[float] = None
+
+    # Pre-fork supervisor: one worker process per RFCOMM channel. An empty
+    # channel tuple lets every worker bind PORT_ANY.
+    workers: int = 1
+    worker_channels: tuple[int, ...] = ()
+    worker_restart_backoff_seconds: float = 1.0
+    metrics_interval_seconds: float = 5.0
+
+    # Broadcast hub: per-subscriber outbound queue and what to do when a
+    # subscriber's queue is full ("drop_oldest", "disconnect" or "block" for
+    # up to `slow_consumer_block_seconds`, then disconnect).
+    subscriber_queue_size: int = 256
+    slow_consumer_policy: str = "drop_oldest"
+    slow_consumer_block_seconds: float = 1.0
+
     # Logging configuration
     logging_config_path: str = "configLogger.json"
     log_env_key: str = "LOG_CFG"
+    # Run log handlers on a background thread so handler I/O never blocks
+    # the socket thread (see logging_utils.enable_queue_logging).
+    log_queue: bool = False
 
     # For future extension (correlation IDs, tenant IDs, etc.)
     extra_metadata: dict[str, str] = field(default_factory=dict)
@@ -0,0 +1,229 @@
+"""Schema-aware delta/varint stream codec for numeric sensor readings."""
+
+from __future__ import annotations
+
+import math
+import struct
+from typing import Any, Mapping, Optional
+
+from .exceptions import BluetoothServerError
+from .interfaces import Deserializer, Serializer
+
+FRAME_SCHEMA = 0x01
+FRAME_DELTA = 0x02
+
+TYPE_INT = 0
+TYPE_SCALED_FLOAT = 1
+TYPE_FLOAT = 2
+TYPE_STR = 3
+TYPE_BOOL = 4
+TYPE_NONE = 5
+
+_FLOAT = struct.Struct("<d")
+
+# (field name, type tag, decimal places for scaled floats)
+Field = tuple[str, int, int]
+
+
+def zigzag_encode(value: int) -> int:
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def zigzag_decode(value: int) -> int:
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+
+def write_varint(out: bytearray, value: int) -> None:
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def read_varint(payload: bytes, offset: int) -> tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        try:
+            byte = payload[offset]
+        except IndexError as exc:
+            raise BluetoothServerError("Truncated varint in delta frame", cause=exc)
+        offset += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, offset
+        shift += 7
+
+
+class DeltaStreamSerializer(Serializer):
+    """
+    Encode flat readings as deltas from the previous reading on a connection.
+
+    The first reading (and any reading whose keys or value types change) is
+    preceded by a schema section carrying the field names once. Integers and
+    floats listed in `float_precision` (decimal places, i.e. fixed-point) are
+    sent as zigzag varint deltas; other floats (and non-finite values of
+    listed ones) are sent as raw doubles.
+    The codec is stateful: call `reset()` whenever a new connection starts.
+    """
+
+    def __init__(
+        self,
+        float_precision: Optional[Mapping[str, int]] = None,
+        default_float_precision: Optional[int] = None,
+    ) -> None:
+        self._float_precision = dict(float_precision or {})
+        self._default_float_precision = default_float_precision
+        self.reset()
+
+    def reset(self) -> None:
+        self._schema: Optional[tuple[Field, ...]] = None
+        self._previous: list[int] = []
+
+    def serialize(self, obj: Any) -> bytes:
+        if not isinstance(obj, Mapping):
+            raise BluetoothServerError(f"Delta codec expects a mapping, got {type(obj)!r}")
+        schema = tuple(self._field(name, value) for name, value in obj.items())
+        out = bytearray()
+        if schema != self._schema:
+            out.append(FRAME_SCHEMA)
+            _write_schema(out, schema)
+            self._schema = schema
+            self._previous = [0] * len(schema)
+        else:
+            out.append(FRAME_DELTA)
+        _write_values(out, schema, list(obj.values()), self._previous)
+        return bytes(out)
+
+    def _field(self, name: str, value: Any) -> Field:
+        if value is None:
+            return (name, TYPE_NONE, 0)
+        if isinstance(value, bool):
+            return (name, TYPE_BOOL, 0)
+        if isinstance(value, int):
+            return (name, TYPE_INT, 0)
+        if isinstance(value, float):
+            places = self._float_precision.get(name, self._default_float_precision)
+            # NaN/inf have no fixed-point form; send them raw (a schema change).
+            if places is None or not math.isfinite(value):
+                return (name, TYPE_FLOAT, 0)
+            return (name, TYPE_SCALED_FLOAT, places)
+        if isinstance(value, str):
+            return (name, TYPE_STR, 0)
+        raise BluetoothServerError(f"Unsupported value type for field {name!r}: {type(value)!r}")
+
+
+class DeltaStreamDeserializer(Deserializer):
+    """Rebuild full readings from frames produced by `DeltaStreamSerializer`."""
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self._schema: Optional[tuple[Field, ...]] = None
+        self._previous: list[int] = []
+
+    def deserialize(self, payload: bytes) -> Any:
+        if not payload:
+            raise BluetoothServerError("Empty delta frame")
+        kind = payload[0]
+        offset = 1
+        schema, previous = self._schema, list(self._previous)
+        try:
+            if kind == FRAME_SCHEMA:
+                schema, offset = _read_schema(payload, offset)
+                previous = [0] * len(schema)
+            elif kind != FRAME_DELTA:
+                raise BluetoothServerError(f"Unknown delta frame type {kind}")
+            if schema is None:
+                raise BluetoothServerError("Delta frame received before schema")
+            reading = _read_values(payload, offset, schema, previous)
+        except (IndexError, struct.error, UnicodeDecodeError) as exc:
+            raise BluetoothServerError("Truncated or malformed delta frame", cause=exc)
+        # Only a fully decoded frame advances the stream, so a rejected frame
+        # can be resent without applying its deltas twice.
+        self._schema, self._previous = schema, previous
+        return reading
+
+
+def _write_schema(out: bytearray, schema: tuple[Field, ...]) -> None:
+    write_varint(out, len(schema))
+    for name, type_tag, places in schema:
+        encoded = name.encode("utf-8")
+        write_varint(out, len(encoded))
+        out += encoded
+        out.append(type_tag)
+        if type_tag == TYPE_SCALED_FLOAT:
+            write_varint(out, places)
+
+
+def _read_schema(payload: bytes, offset: int) -> tuple[tuple[Field, ...], int]:
+    count, offset = read_varint(payload, offset)
+    fields = []
+    for _ in range(count):
+        length, offset = read_varint(payload, offset)
+        name, offset = _read_text(payload, offset, length)
+        type_tag = payload[offset]
+        offset += 1
+        places = 0
+        if type_tag == TYPE_SCALED_FLOAT:
+            places, offset = read_varint(payload, offset)
+        fields.append((name, type_tag, places))
+    return tuple(fields), offset
+
+
+def _write_values(
+    out: bytearray,
+    schema: tuple[Field, ...],
+    values: list[Any],
+    previous: list[int],
+) -> None:
+    for position, ((_, type_tag, places), value) in enumerate(zip(schema, values)):
+        if type_tag == TYPE_INT or type_tag == TYPE_SCALED_FLOAT:
+            current = value if type_tag == TYPE_INT else round(value * 10**places)
+            write_varint(out, zigzag_encode(current - previous[position]))
+            previous[position] = current
+        elif type_tag == TYPE_FLOAT:
+            out += _FLOAT.pack(value)
+        elif type_tag == TYPE_STR:
+            encoded = value.encode("utf-8")
+            write_varint(out, len(encoded))
+            out += encoded
+        elif type_tag == TYPE_BOOL:
+            out.append(1 if value else 0)
+
+
+def _read_values(
+    payload: bytes,
+    offset: int,
+    schema: tuple[Field, ...],
+    previous: list[int],
+) -> dict[str, Any]:
+    reading: dict[str, Any] = {}
+    for position, (name, type_tag, places) in enumerate(schema):
+        if type_tag == TYPE_INT or type_tag == TYPE_SCALED_FLOAT:
+            delta, offset = read_varint(payload, offset)
+            current = previous[position] + zigzag_decode(delta)
+            previous[position] = current
+            reading[name] = current if type_tag == TYPE_INT else current / 10**places
+        elif type_tag == TYPE_FLOAT:
+            (reading[name],) = _FLOAT.unpack_from(payload, offset)
+            offset += _FLOAT.size
+        elif type_tag == TYPE_STR:
+            length, offset = read_varint(payload, offset)
+            reading[name], offset = _read_text(payload, offset, length)
+        elif type_tag == TYPE_BOOL:
+            reading[name] = bool(payload[offset])
+            offset += 1
+        elif type_tag == TYPE_NONE:
+            reading[name] = None
+        else:
+            raise BluetoothServerError(f"Unknown field type {type_tag} for {name!r}")
+    return reading
+
+
+def _read_text(payload: bytes, offset: int, length: int) -> tuple[str, int]:
+    end = offset + length
+    if end > len(payload):
+        raise BluetoothServerError("Truncated string in delta frame")
+    return payload[offset:end].decode("utf-8"), end
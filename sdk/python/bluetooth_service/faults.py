@@ -0,0 +1,108 @@
+"""Fault-injecting transport wrapper that simulates a poor RFCOMM link."""
+
+from __future__ import annotations
+
+import collections
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from .exceptions import BluetoothServerError
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class LinkProfile:
+    """
+    Conditions of a simulated link; rates are per-read probabilities.
+
+    `loss_rate` drops a whole read (seen as an empty read), `truncate_rate`
+    drops its tail, and `fragment_rate` delivers it over several smaller
+    reads. Fragmentation needs a server with frame reassembly.
+    """
+
+    bandwidth_bytes_per_second: Optional[float] = None
+    latency_seconds: float = 0.0
+    jitter_seconds: float = 0.0
+    loss_rate: float = 0.0
+    truncate_rate: float = 0.0
+    fragment_rate: float = 0.0
+    disconnect_rate: float = 0.0
+    seed: Optional[int] = None
+
+
+class FaultInjectingSocketManager:
+    """
+    Proxy around a socket manager that degrades traffic per a `LinkProfile`.
+
+    Delay (latency, jitter, bandwidth) applies in both directions; loss,
+    truncation, fragmentation and disconnects apply to what this end
+    receives, so wrap the server end to exercise the resend protocol. The
+    random generator is seeded from the profile, so a run is reproducible.
+    Counts of injected faults are kept in `injected`.
+    """
+
+    def __init__(self, inner: Any, profile: LinkProfile) -> None:
+        self._inner = inner
+        self.profile = profile
+        self._random = random.Random(profile.seed)
+        self._pending = b""
+        self.injected: collections.Counter[str] = collections.Counter()
+
+    def send(self, payload: str | bytes) -> None:
+        self._delay(len(payload))
+        self._inner.send(payload)
+
+    def receive(self, buffer_size: int, timeout: Optional[float] = None) -> bytes:
+        if self._pending:
+            return self._take_pending(buffer_size)
+        data = self._inner.receive(buffer_size, timeout=timeout)
+        if not data:
+            return data
+        self._delay(len(data))
+        profile = self.profile
+        if self._chance(profile.disconnect_rate):
+            self.injected["disconnects"] += 1
+            logger.info("Injecting disconnect")
+            self._inner.close()
+            raise BluetoothServerError("Simulated link disconnect")
+        if self._chance(profile.loss_rate):
+            self.injected["losses"] += 1
+            logger.debug("Injecting loss of %s bytes", len(data))
+            return b""
+        if len(data) > 1 and self._chance(profile.truncate_rate):
+            self.injected["truncations"] += 1
+            return data[: self._random.randrange(1, len(data))]
+        if len(data) > 1 and self._chance(profile.fragment_rate):
+            self.injected["fragmentations"] += 1
+            self._pending = data
+            return self._take_pending(self._random.randrange(1, len(data)))
+        return data
+
+    def close(self) -> None:
+        self._pending = b""
+        self._inner.close()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._inner, name)
+
+    # Internals -----------------------------------------------------------------
+    def _chance(self, rate: float) -> bool:
+        return rate > 0 and self._random.random() < rate
+
+    def _take_pending(self, size: int) -> bytes:
+        chunk, self._pending = self._pending[:size], self._pending[size:]
+        return chunk
+
+    def _delay(self, nbytes: int) -> None:
+        profile = self.profile
+        delay = profile.latency_seconds
+        if profile.jitter_seconds:
+            delay += self._random.uniform(0, profile.jitter_seconds)
+        if profile.bandwidth_bytes_per_second:
+            delay += nbytes / profile.bandwidth_bytes_per_second
+        if delay > 0:
+            time.sleep(delay)
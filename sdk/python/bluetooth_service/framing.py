@@ -0,0 +1,49 @@
+"""Length-prefixed framing (`<length>:<payload>`) shared by SDK components."""
+
+from __future__ import annotations
+
+from .exceptions import BluetoothServerError
+
+# Longest decimal length prefix we accept before giving up on a stream.
+MAX_PREFIX_DIGITS = 10
+
+
+def encode_frame(payload: bytes) -> bytes:
+    """Frame `payload` exactly like `BluetoothClient` does on the wire."""
+    return f"{len(payload)}:".encode("utf-8") + payload
+
+
+class FrameDecoder:
+    """
+    Incrementally split a byte stream into complete frame payloads.
+
+    Unlike the request/ACK path in `BluetoothServer`, which expects one frame
+    per `recv`, this tolerates frames split across (or packed into) reads.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes) -> list[bytes]:
+        self._buffer += data
+        frames = []
+        while True:
+            separator = self._buffer.find(b":", 0, MAX_PREFIX_DIGITS + 1)
+            if separator < 0:
+                if len(self._buffer) > MAX_PREFIX_DIGITS:
+                    raise BluetoothServerError("Invalid length prefix")
+                return frames
+            try:
+                length = int(self._buffer[:separator])
+            except ValueError as exc:
+                raise BluetoothServerError("Invalid length prefix", cause=exc)
+            end = separator + 1 + length
+            if len(self._buffer) < end:
+                return frames
+            frames.append(bytes(self._buffer[separator + 1 : end]))
+            del self._buffer[:end]
+
+    @property
+    def pending(self) -> int:
+        """Bytes buffered towards an incomplete frame."""
+        return len(self._buffer)
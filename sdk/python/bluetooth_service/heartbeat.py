@@ -0,0 +1,80 @@
+"""In-band ping/pong heartbeat frames and per-connection link-health statistics."""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from .metrics import ServerMetrics
+
+# Weight of a new RTT sample in the smoothed RTT (as in TCP's SRTT).
+EWMA_ALPHA = 0.125
+# Ends ping and pong frames, which (unlike data frames) carry no length prefix.
+CONTROL_TERMINATOR = b";"
+
+
+def ping_frame(ping_message: str, sequence: int) -> bytes:
+    """
+    Control frame `<ping>:<sequence>;`.
+
+    Data frames always start with a digit, and the terminator keeps a data
+    frame that shares a read with a late ping from running into its sequence.
+    """
+    return f"{ping_message}:{sequence}".encode("utf-8") + CONTROL_TERMINATOR
+
+
+def split_ping(data: bytes, ping_prefix: bytes) -> tuple[bytes, bytes]:
+    """Split a read starting with `ping_prefix` into the ping's sequence and what follows it."""
+    sequence, _, rest = data[len(ping_prefix) :].partition(CONTROL_TERMINATOR)
+    return sequence, rest
+
+
+def pong_reply(sequence: bytes, pong_message: str) -> bytes:
+    """Answer a ping frame with `<pong>:<sequence>;`, echoing its sequence number."""
+    return pong_message.encode("utf-8") + b":" + sequence + CONTROL_TERMINATOR
+
+
+class LinkHealth:
+    """
+    RTT and loss statistics of one connection, fed by heartbeat round trips.
+
+    `missed` counts consecutive unanswered pings; callers declare the peer
+    dead once it reaches their limit.
+    """
+
+    def __init__(self) -> None:
+        self.sent = 0
+        self.lost = 0
+        self.missed = 0
+        self.rtt: Optional[float] = None
+        self.srtt: Optional[float] = None
+        self.min_rtt: Optional[float] = None
+        self.max_rtt: Optional[float] = None
+
+    def on_pong(self, rtt: float) -> None:
+        self.sent += 1
+        self.missed = 0
+        self.rtt = rtt
+        self.srtt = rtt if self.srtt is None else self.srtt + EWMA_ALPHA * (rtt - self.srtt)
+        self.min_rtt = rtt if self.min_rtt is None else min(self.min_rtt, rtt)
+        self.max_rtt = rtt if self.max_rtt is None else max(self.max_rtt, rtt)
+
+    def on_loss(self) -> None:
+        self.sent += 1
+        self.lost += 1
+        self.missed += 1
+
+    def snapshot(self) -> dict[str, float]:
+        return {
+            "rtt_ms": (self.rtt or 0.0) * 1e3,
+            "srtt_ms": (self.srtt or 0.0) * 1e3,
+            "min_rtt_ms": (self.min_rtt or 0.0) * 1e3,
+            "max_rtt_ms": (self.max_rtt or 0.0) * 1e3,
+            "loss_ratio": self.lost / self.sent if self.sent else 0.0,
+            "pings": self.sent,
+            "pings_lost": self.lost,
+        }
+
+    def publish(self, metrics: ServerMetrics) -> None:
+        """Expose the statistics as `heartbeat_*` gauges."""
+        for name, value in self.snapshot().items():
+            metrics.set(f"heartbeat_{name}", value)
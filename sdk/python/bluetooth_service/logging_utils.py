@@ -2,23 +2,45 @@
 
 from __future__ import annotations
 
+import atexit
+import copy
+import itertools
 import json
 import logging
 import logging.config
+import logging.handlers
 import os
+import queue
+import threading
+import time
 from pathlib import Path
+from typing import Optional
+
+# Record attributes that `JsonFormatter` copies into its output when present
+# (pass them with `logger.info(..., extra={...})`).
+STRUCTURED_FIELDS = ("connection_id", "sequence", "peer", "suppressed")
+
+_connection_counter = itertools.count(1)
+
+
+def new_connection_id() -> str:
+    """Process-unique ID tagging every log record of one connection."""
+    return f"{os.getpid()}-{next(_connection_counter)}"
 
 
 def configure_logging(
     default_path: str,
     default_level: int = logging.INFO,
     env_key: str | None = "LOG_CFG",
-) -> None:
+    *,
+    queued: bool = False,
+) -> Optional[logging.handlers.QueueListener]:
     """
     Configure logging from JSON config or fall back to basic configuration.
 
     The design follows KISS/BASE by keeping runtime configuration minimal while
-    still allowing environment overrides.
+    still allowing environment overrides. With `queued`, the configured root
+    handlers run on a background thread (see `enable_queue_logging`).
     """
 
     config_path = Path(os.getenv(env_key, default_path) if env_key else default_path)
@@ -26,7 +48,153 @@ def configure_logging(
         with config_path.open("rt", encoding="utf-8") as config_file:
             config = json.load(config_file)
         logging.config.dictConfig(config)
+    else:
+        logging.basicConfig(level=default_level)
+    return enable_queue_logging() if queued else None
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hand records to a bounded queue without ever blocking the caller.
+
+    Records are enqueued unformatted, so `%`-style arguments are only
+    rendered on the listener thread; do not mutate objects after logging
+    them. When the queue is full the record is dropped and counted.
+    """
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return copy.copy(record)
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _QueueListener(logging.handlers.QueueListener):
+    def stop(self) -> None:
+        # Safe to call twice: explicitly and again from atexit.
+        if self._thread is not None:
+            super().stop()
+
+
+# The active queue listener and the root handler feeding it (see
+# `enable_queue_logging`); exit and fork hooks act on whichever is current.
+_listener: Optional[_QueueListener] = None
+_queue_handler: Optional[NonBlockingQueueHandler] = None
+_hooks_registered = False
+
+
+def enable_queue_logging(queue_size: int = 10_000) -> logging.handlers.QueueListener:
+    """
+    Move the root logger's handlers behind a queue drained by a background thread.
+
+    The listener is stopped (and the queue flushed) at interpreter exit and is
+    restarted in forked children, such as pre-forked supervisor workers.
+    Calling this again replaces the previous listener instead of stacking one.
+    """
+    global _listener, _queue_handler, _hooks_registered
+    root = logging.getLogger()
+    handlers = [handler for handler in root.handlers if not isinstance(handler, NonBlockingQueueHandler)]
+    if _listener is not None:
+        _listener.stop()
+        if _queue_handler in root.handlers:
+            # Still installed: keep feeding the handlers it was feeding.
+            handlers = [*_listener.handlers, *handlers]
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    _queue_handler = NonBlockingQueueHandler(queue.Queue(queue_size))
+    root.addHandler(_queue_handler)
+    _listener = _QueueListener(_queue_handler.queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    if not _hooks_registered:
+        atexit.register(_stop_listener)
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=_restart_listener_in_child)
+        _hooks_registered = True
+    return _listener
+
+
+def _stop_listener() -> None:
+    if _listener is not None:
+        _listener.stop()
+
+
+def _restart_listener_in_child() -> None:
+    # The listener thread does not survive fork(); give the child its own.
+    global _listener
+    if _listener is None or _queue_handler is None:
         return
+    _queue_handler.queue = queue.Queue(_queue_handler.queue.maxsize)
+    _listener = _QueueListener(_queue_handler.queue, *_listener.handlers, respect_handler_level=True)
+    _listener.start()
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Render records as compact one-line JSON documents.
+
+    Usable from dictConfig as `{"()": "bluetooth_service.logging_utils.JsonFormatter"}`.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        document = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for name in STRUCTURED_FIELDS:
+            value = getattr(record, name, None)
+            if value is not None:
+                document[name] = value
+        if record.exc_info:
+            document["exc"] = self.formatException(record.exc_info)
+        return json.dumps(document, separators=(",", ":"), default=str)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Let at most `burst` records per message template through every `interval_seconds`.
+
+    Records are grouped by logger and unformatted message, so a resend storm
+    ("Server requested retransmit: %s") collapses into a few lines. The first
+    record let through after suppression carries the number of dropped
+    records in its `suppressed` attribute. Records below `level` always pass.
+    An instance keeps its own counts, so give each handler its own filter:
+    one instance shared by several handlers counts every record once per
+    handler.
+    """
 
-    logging.basicConfig(level=default_level)
+    def __init__(self, burst: int = 5, interval_seconds: float = 10.0, level: int | str = logging.WARNING) -> None:
+        super().__init__()
+        self._burst = burst
+        self._interval = interval_seconds
+        self._level = level if isinstance(level, int) else logging.getLevelName(level)
+        self._windows: dict[tuple[str, str], list[float]] = {}
+        self._lock = threading.Lock()
 
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < self._level:
+            return True
+        key = (record.name, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            # [window start, records let through, records suppressed]
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self._interval:
+                suppressed = int(window[2]) if window is not None else 0
+                self._windows[key] = [now, 1, 0]
+                if suppressed:
+                    record.suppressed = suppressed
+                return True
+            if window[1] < self._burst:
+                window[1] += 1
+                return True
+            window[2] += 1
+            return False
@@ -0,0 +1,127 @@
+"""In-process loopback transport mirroring the RFCOMM socket managers."""
+
+from __future__ import annotations
+
+import logging
+import queue
+import socket
+from typing import Optional, Tuple
+
+from .exceptions import BluetoothServerError
+
+logger = logging.getLogger(__name__)
+
+
+class LoopbackListener:
+    """
+    Stand-in for an advertised RFCOMM channel.
+
+    Every client `connect()` creates a connected `socket.socketpair()` and
+    queues the server end for the next `accept()`, so several servers (or
+    workers) can share one listener just like they would a real channel.
+    """
+
+    def __init__(self, channel: int = 1) -> None:
+        self.channel = channel
+        self.advertised: Optional[Tuple[str, str]] = None
+        self._pending: "queue.Queue[socket.socket]" = queue.Queue()
+
+    def connect(self) -> socket.socket:
+        server_end, client_end = socket.socketpair()
+        self._pending.put(server_end)
+        return client_end
+
+    def accept(self, timeout: Optional[float] = None) -> socket.socket:
+        try:
+            return self._pending.get(timeout=timeout)
+        except queue.Empty as exc:
+            raise BluetoothServerError("Unable to accept connection", cause=exc)
+
+
+class _LoopbackConnection:
+    """Shared send/receive/close logic for both loopback endpoints."""
+
+    def __init__(self) -> None:
+        self._socket: Optional[socket.socket] = None
+
+    def receive(self, buffer_size: int, timeout: Optional[float] = None) -> bytes:
+        sock = self._require_socket()
+        try:
+            sock.settimeout(timeout)
+            return sock.recv(buffer_size)
+        except OSError as exc:
+            raise BluetoothServerError("Unable to receive data", cause=exc)
+
+    def send(self, payload: str | bytes) -> None:
+        sock = self._require_socket()
+        try:
+            buffer = payload.encode("utf-8") if isinstance(payload, str) else payload
+            sock.sendall(buffer)
+        except OSError as exc:
+            raise BluetoothServerError("Unable to send data", cause=exc)
+
+    def close(self) -> None:
+        if self._socket is None:
+            return
+        try:
+            # close() alone does not wake a recv() blocked on another thread.
+            self._socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass  # peer already gone
+        try:
+            self._socket.close()
+        except OSError as exc:
+            logger.warning("Failed to close loopback socket cleanly: %s", exc)
+        finally:
+            self._socket = None
+
+    def _require_socket(self) -> socket.socket:
+        if self._socket is None:
+            raise BluetoothServerError("Loopback socket not connected")
+        return self._socket
+
+
+class LoopbackServerSocketManager(_LoopbackConnection):
+    """Drop-in replacement for `SocketManager` backed by a `LoopbackListener`."""
+
+    def __init__(self, listener: LoopbackListener) -> None:
+        super().__init__()
+        self._listener = listener
+
+    def open_server(self) -> None:
+        logger.debug("Loopback server opened on channel %s", self._listener.channel)
+
+    def bind_and_listen(self, host: str, backlog: int, port: Optional[int] = None) -> int:
+        return self._listener.channel
+
+    def advertise(
+        self,
+        service_name: str,
+        service_id: str,
+        advertise_profile: bool = True,
+    ) -> None:
+        if advertise_profile:
+            self._listener.advertised = (service_name, service_id)
+
+    def accept(
+        self,
+        timeout: Optional[float] = None,
+    ) -> Tuple[socket.socket, Tuple[str, int]]:
+        self._socket = self._listener.accept(timeout)
+        client_info = ("loopback", self._listener.channel)
+        logger.debug("Accepted loopback connection on channel %s", self._listener.channel)
+        return self._socket, client_info
+
+
+class LoopbackClientSocketManager(_LoopbackConnection):
+    """Drop-in replacement for `ClientSocketManager` backed by a `LoopbackListener`."""
+
+    def __init__(self, listener: LoopbackListener) -> None:
+        super().__init__()
+        self._listener = listener
+
+    def discover(self) -> None:
+        logger.debug("Loopback service found on channel %s", self._listener.channel)
+
+    def connect(self) -> None:
+        self._socket = self._listener.connect()
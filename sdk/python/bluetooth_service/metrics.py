@@ -0,0 +1,92 @@
+"""Lightweight, process-local metrics counters for the SDK."""
+
+from __future__ import annotations
+
+import math
+import threading
+from typing import Iterable, Mapping, Sequence
+
+
+class ServerMetrics:
+    """
+    Thread-safe counters and gauges describing server activity.
+
+    Snapshots are plain dictionaries so they can cross process boundaries
+    (e.g. from pre-forked workers to their supervisor) without pickling locks.
+    Counters accumulate and can be summed across processes; gauges (buffer
+    sizes, heartbeat RTT) describe current state and are kept apart so they
+    are never summed.
+    """
+
+    COUNTERS = (
+        "connections_accepted",
+        "payloads_received",
+        "bytes_received",
+        "resends_requested",
+        "pings_received",
+        "dead_peers",
+        "idle_disconnects",
+        "errors",
+    )
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._values: dict[str, float] = {name: 0 for name in self.COUNTERS}
+        self._gauges: dict[str, float] = {}
+
+    def increment(self, name: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[name] = self._values.get(name, 0) + amount
+
+    def set(self, name: str, value: float) -> None:
+        """Record a gauge-style value, replacing any previous one."""
+        with self._lock:
+            self._gauges[name] = value
+
+    def snapshot(self) -> dict[str, float]:
+        """Counters and gauges together, for reading a single process."""
+        with self._lock:
+            return {**self._values, **self._gauges}
+
+    def counters(self) -> dict[str, float]:
+        with self._lock:
+            return dict(self._values)
+
+    def gauges(self) -> dict[str, float]:
+        with self._lock:
+            return dict(self._gauges)
+
+
+class ClientMetrics(ServerMetrics):
+    """Counters describing client activity (same snapshot format as the server)."""
+
+    COUNTERS = (
+        "payloads_sent",
+        "bytes_sent",
+        "resends_received",
+        "dead_peers",
+        "errors",
+    )
+
+
+def merge_snapshots(snapshots: Iterable[Mapping[str, float]]) -> dict[str, float]:
+    """
+    Sum counters from several snapshots (e.g. one per worker process).
+
+    Pass `ServerMetrics.counters()`, not `snapshot()`: summing gauges such as
+    `buffer_size` across processes is meaningless.
+    """
+    merged: dict[str, float] = {}
+    for snapshot in snapshots:
+        for name, value in snapshot.items():
+            merged[name] = merged.get(name, 0) + value
+    return merged
+
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    """Nearest-rank percentile (`fraction` in [0, 1]) of unsorted `values`."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
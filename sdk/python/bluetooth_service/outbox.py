@@ -0,0 +1,266 @@
+"""Durable store-and-forward outbox backed by a segmented write-ahead log."""
+
+from __future__ import annotations
+
+import logging
+import mmap
+import os
+import struct
+import threading
+import uuid
+import zlib
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, BinaryIO, Optional
+
+from .exceptions import BluetoothServerError
+from .interfaces import Serializer
+
+if TYPE_CHECKING:
+    from .client import BluetoothClient
+
+logger = logging.getLogger(__name__)
+
+# Record layout: payload length, CRC32 of (sequence + payload), sequence.
+RECORD_HEADER = struct.Struct("<IIQ")
+SEGMENT_SUFFIX = ".wal"
+ACK_FILE = "acked"
+
+
+def _checksum(sequence: int, payload: bytes) -> int:
+    return zlib.crc32(payload, zlib.crc32(sequence.to_bytes(8, "little")))
+
+
+def _scan(buffer: Any) -> tuple[list[tuple[int, int, int]], int]:
+    """Return `(sequence, start, end)` for each intact record and the intact length."""
+    records = []
+    offset = 0
+    size = len(buffer)
+    while offset + RECORD_HEADER.size <= size:
+        length, crc, sequence = RECORD_HEADER.unpack_from(buffer, offset)
+        start = offset + RECORD_HEADER.size
+        end = start + length
+        if end > size or _checksum(sequence, buffer[start:end]) != crc:
+            break
+        records.append((sequence, start, end))
+        offset = end
+    return records, offset
+
+
+class WriteAheadLog:
+    """
+    Append-only log of payloads split into fixed-size segment files.
+
+    Every record carries a sequence number and a CRC32. Readers map segments
+    with `mmap` instead of copying them through `read()`. `acknowledge()`
+    durably records the highest delivered sequence and deletes segments that
+    contain nothing newer. A torn or corrupt tail left by a crash is cut off
+    on open.
+    """
+
+    def __init__(self, directory: str, *, segment_bytes: int = 4 << 20, fsync: bool = True) -> None:
+        self._dir = Path(directory)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._segment_bytes = segment_bytes
+        self._fsync = fsync
+        self._lock = threading.Lock()
+        self._active: Optional[BinaryIO] = None
+        self._segments = sorted(int(path.stem) for path in self._dir.glob(f"*{SEGMENT_SUFFIX}"))
+        self.acked = self._read_ack()
+        self.next_sequence = self._recover()
+
+    @property
+    def pending(self) -> int:
+        return self.next_sequence - 1 - self.acked
+
+    def append(self, payload: bytes) -> int:
+        """Durably append `payload` and return its sequence number."""
+        with self._lock:
+            sequence = self.next_sequence
+            if self._active is None or self._active.tell() >= self._segment_bytes:
+                self._roll(sequence)
+            assert self._active is not None
+            self._active.write(RECORD_HEADER.pack(len(payload), _checksum(sequence, payload), sequence))
+            self._active.write(payload)
+            self._sync(self._active)
+            self.next_sequence = sequence + 1
+            return sequence
+
+    def read(self, after: int, limit: int) -> list[tuple[int, memoryview]]:
+        """Return up to `limit` records with a sequence greater than `after`."""
+        with self._lock:
+            if self._active is not None:
+                self._active.flush()
+            segments = list(self._segments)
+        batch: list[tuple[int, memoryview]] = []
+        for index, first in enumerate(segments):
+            if index + 1 < len(segments) and segments[index + 1] <= after + 1:
+                continue  # every record in this segment is at or below `after`
+            view = self._map(first)
+            if view is None:
+                continue
+            records, intact = _scan(view)
+            if intact < len(view) and index + 1 < len(segments):
+                logger.error("Segment %s is corrupt after byte %s; skipping the rest", first, intact)
+            for sequence, start, end in records:
+                if sequence > after:
+                    batch.append((sequence, view[start:end]))
+                    if len(batch) >= limit:
+                        return batch
+        return batch
+
+    def acknowledge(self, sequence: int) -> None:
+        """Record everything up to `sequence` as delivered and drop covered segments."""
+        with self._lock:
+            if sequence <= self.acked:
+                return
+            self.acked = sequence
+            self._write_ack(sequence)
+            drained = sequence >= self.next_sequence - 1
+            keep = []
+            for index, first in enumerate(self._segments):
+                is_last = index + 1 == len(self._segments)
+                covered = drained if is_last else self._segments[index + 1] <= sequence + 1
+                if not covered:
+                    keep.append(first)
+                    continue
+                if is_last and self._active is not None:
+                    self._active.close()
+                    self._active = None
+                self._segment_path(first).unlink(missing_ok=True)
+            self._segments = keep
+
+    def close(self) -> None:
+        with self._lock:
+            if self._active is not None:
+                self._active.close()
+                self._active = None
+
+    # Internals -----------------------------------------------------------------
+    def _segment_path(self, first: int) -> Path:
+        return self._dir / f"{first:020d}{SEGMENT_SUFFIX}"
+
+    def _map(self, first: int) -> Optional[memoryview]:
+        try:
+            with self._segment_path(first).open("rb") as segment:
+                if not os.fstat(segment.fileno()).st_size:
+                    return None  # mmap cannot map empty files
+                # The mapping stays valid after the file object is closed.
+                return memoryview(mmap.mmap(segment.fileno(), 0, access=mmap.ACCESS_READ))
+        except FileNotFoundError:
+            return None  # truncated concurrently by acknowledge()
+
+    def _roll(self, first: int) -> None:
+        if self._active is not None:
+            self._active.close()
+        self._active = self._segment_path(first).open("ab")
+        self._segments.append(first)
+
+    def _sync(self, handle: BinaryIO) -> None:
+        handle.flush()
+        if self._fsync:
+            os.fsync(handle.fileno())
+
+    def _recover(self) -> int:
+        if not self._segments:
+            return self.acked + 1
+        last = self._segments[-1]
+        path = self._segment_path(last)
+        view = self._map(last)
+        records, intact = _scan(view) if view is not None else ([], 0)
+        size = path.stat().st_size
+        if intact < size:
+            logger.warning("Truncating torn write-ahead log tail in %s (%s bytes)", path.name, size - intact)
+            with path.open("r+b") as segment:
+                segment.truncate(intact)
+        self._active = path.open("ab")
+        return max(records[-1][0] + 1 if records else last, self.acked + 1)
+
+    def _read_ack(self) -> int:
+        try:
+            return int((self._dir / ACK_FILE).read_text(encoding="utf-8") or 0)
+        except FileNotFoundError:
+            return 0
+        except ValueError as exc:
+            raise BluetoothServerError("Corrupt outbox acknowledgement file", cause=exc)
+
+    def _write_ack(self, sequence: int) -> None:
+        # Write-then-rename so a crash leaves either the old or the new value.
+        temporary = self._dir / f"{ACK_FILE}.tmp"
+        with temporary.open("w", encoding="utf-8") as ack_file:
+            ack_file.write(str(sequence))
+            ack_file.flush()
+            if self._fsync:
+                os.fsync(ack_file.fileno())
+        os.replace(temporary, self._dir / ACK_FILE)
+
+
+class Outbox:
+    """
+    Store-and-forward queue: `put()` persists, `drain()` delivers in batches.
+
+    Messages are serialized once at `put()` time and wrapped in a
+    `{"message_id", "body"}` envelope so a `DeduplicatingSink` on the server
+    can drop redeliveries after a crash or a lost ACK. Pass `envelope=False`
+    for serializers that only accept bytes (raw passthrough); delivery is then
+    at-least-once without server-side deduplication. Stateful serializers
+    (delta encoding) are not supported because entries may be resent.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        *,
+        serializer: Serializer,
+        batch_size: int = 64,
+        segment_bytes: int = 4 << 20,
+        fsync: bool = True,
+        envelope: bool = True,
+    ) -> None:
+        self._serializer = serializer
+        self._batch_size = batch_size
+        self._envelope = envelope
+        self._wal = WriteAheadLog(directory, segment_bytes=segment_bytes, fsync=fsync)
+
+    @property
+    def pending(self) -> int:
+        return self._wal.pending
+
+    def put(self, obj: Any) -> Optional[str]:
+        """Persist `obj` for delivery; returns its message ID when enveloped."""
+        message_id = None
+        if self._envelope:
+            message_id = uuid.uuid4().hex
+            obj = {"message_id": message_id, "body": obj}
+        self._wal.append(self._serializer.serialize(obj))
+        return message_id
+
+    def drain(self, client: BluetoothClient, max_messages: Optional[int] = None) -> int:
+        """
+        Send pending messages over the started `client` until empty or the link fails.
+
+        Each batch is acknowledged (and truncated) once, after its last ACK,
+        so the log is synced once per batch rather than per message. Returns
+        the number of messages delivered.
+        """
+        delivered = 0
+        while max_messages is None or delivered < max_messages:
+            limit = self._batch_size if max_messages is None else min(self._batch_size, max_messages - delivered)
+            batch = self._wal.read(self._wal.acked, limit)
+            if not batch:
+                break
+            last_sent: Optional[int] = None
+            try:
+                for sequence, payload in batch:
+                    client.send_payload(payload)
+                    last_sent = sequence
+                    delivered += 1
+            except BluetoothServerError as exc:
+                logger.warning("Outbox drain interrupted after %s messages: %s", delivered, exc)
+                break
+            finally:
+                if last_sent is not None:
+                    self._wal.acknowledge(last_sent)
+        return delivered
+
+    def close(self) -> None:
+        self._wal.close()
@@ -0,0 +1,194 @@
+"""Compile JSON Schema message definitions into fixed-layout struct codecs."""
+
+from __future__ import annotations
+
+import json
+import struct
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Mapping, Optional
+
+from .exceptions import BluetoothServerError
+from .interfaces import Deserializer, Serializer
+
+DEFAULT_SCHEMA_DIR = Path(__file__).resolve().parents[3] / "common" / "message-schema" / "json"
+
+# Every message starts with its little-endian uint16 type ID.
+TYPE_ID_FORMAT = "H"
+_TYPE_ID = struct.Struct("<" + TYPE_ID_FORMAT)
+
+_INTEGER_FORMATS = {
+    "int8": "b",
+    "uint8": "B",
+    "int16": "h",
+    "uint16": "H",
+    "int32": "i",
+    "uint32": "I",
+    "int64": "q",
+    "uint64": "Q",
+}
+_NUMBER_FORMATS = {"float": "f", "double": "d"}
+
+
+@dataclass(frozen=True)
+class MessageCodec:
+    """Compiled encoder/decoder pair for one fixed-layout message type."""
+
+    name: str
+    type_id: int
+    fields: tuple[str, ...]
+    layout: struct.Struct
+    encode: Callable[[Mapping[str, Any]], bytes]
+    decode: Callable[[bytes], dict[str, Any]]
+
+
+def compile_schema(schema: Mapping[str, Any]) -> MessageCodec:
+    """
+    Compile one JSON Schema object definition into a `MessageCodec`.
+
+    Supported property types: `integer` (with an int8..uint64 `format`,
+    default int64), `number` (`float` or `double`, default double), `boolean`,
+    and `string` with a `maxLength` (fixed-width, NUL padded; `maxLength`
+    counts UTF-8 bytes and longer values are rejected). The message
+    type ID comes from the `x-type-id` extension keyword; field order follows
+    `properties`.
+    """
+    name = schema.get("title")
+    type_id = schema.get("x-type-id")
+    properties = schema.get("properties")
+    if not name or type_id is None or not properties:
+        raise BluetoothServerError("Schema needs 'title', 'x-type-id' and 'properties'")
+
+    formats = [TYPE_ID_FORMAT]
+    encoders = [repr(type_id)]
+    decoders = []
+    for position, (field_name, spec) in enumerate(properties.items()):
+        code, text = _field_format(field_name, spec)
+        formats.append(code)
+        if text:
+            encoders.append(f"_text(obj[{field_name!r}], {code[:-1]}, {field_name!r})")
+            decoders.append(f"{field_name!r}: v{position}.rstrip(b'\\0').decode('utf-8')")
+        else:
+            encoders.append(f"obj[{field_name!r}]")
+            decoders.append(f"{field_name!r}: v{position}")
+    layout = struct.Struct("<" + "".join(formats))
+
+    # Generate straight-line functions (like collections.namedtuple does) so
+    # encoding is a single struct call with no per-field loop.
+    variables = "".join(f", v{position}" for position in range(len(properties)))
+    source = (
+        f"def encode(obj):\n"
+        f"    return _pack({', '.join(encoders)})\n"
+        f"def decode(payload):\n"
+        f"    _type_id{variables} = _unpack(payload)\n"
+        f"    return {{{', '.join(decoders)}}}\n"
+    )
+    namespace: dict[str, Any] = {"_pack": layout.pack, "_unpack": layout.unpack, "_text": _encode_text}
+    exec(compile(source, f"<schema {name}>", "exec"), namespace)
+    return MessageCodec(
+        name=name,
+        type_id=int(type_id),
+        fields=tuple(properties),
+        layout=layout,
+        encode=namespace["encode"],
+        decode=namespace["decode"],
+    )
+
+
+def _encode_text(value: str, width: int, field_name: str) -> bytes:
+    # struct's `Ns` would silently cut the value, possibly inside a character.
+    encoded = value.encode("utf-8")
+    if len(encoded) > width:
+        raise BluetoothServerError(f"{field_name!r} does not fit in {width} UTF-8 bytes")
+    return encoded
+
+
+def _field_format(field_name: str, spec: Mapping[str, Any]) -> tuple[str, bool]:
+    kind = spec.get("type")
+    if kind == "integer":
+        fmt = spec.get("format", "int64")
+        if fmt not in _INTEGER_FORMATS:
+            raise BluetoothServerError(f"Unsupported integer format {fmt!r} for {field_name!r}")
+        return _INTEGER_FORMATS[fmt], False
+    if kind == "number":
+        fmt = spec.get("format", "double")
+        if fmt not in _NUMBER_FORMATS:
+            raise BluetoothServerError(f"Unsupported number format {fmt!r} for {field_name!r}")
+        return _NUMBER_FORMATS[fmt], False
+    if kind == "boolean":
+        return "?", False
+    if kind == "string":
+        if "maxLength" not in spec:
+            raise BluetoothServerError(f"String field {field_name!r} needs a maxLength")
+        return f"{int(spec['maxLength'])}s", True
+    raise BluetoothServerError(f"Field {field_name!r} has no fixed-layout type: {kind!r}")
+
+
+class SchemaRegistry:
+    """Lookup of compiled message codecs by name and by type ID."""
+
+    def __init__(self) -> None:
+        self._by_name: dict[str, MessageCodec] = {}
+        self._by_type_id: dict[int, MessageCodec] = {}
+
+    def register(self, codec: MessageCodec) -> None:
+        existing = self._by_type_id.get(codec.type_id)
+        if existing is not None and existing.name != codec.name:
+            raise BluetoothServerError(
+                f"Type ID {codec.type_id} used by both {existing.name} and {codec.name}"
+            )
+        self._by_name[codec.name] = codec
+        self._by_type_id[codec.type_id] = codec
+
+    def get(self, name: str) -> MessageCodec:
+        try:
+            return self._by_name[name]
+        except KeyError as exc:
+            raise BluetoothServerError(f"Unknown message type {name!r}", cause=exc)
+
+    def by_type_id(self, type_id: int) -> MessageCodec:
+        try:
+            return self._by_type_id[type_id]
+        except KeyError as exc:
+            raise BluetoothServerError(f"Unknown message type ID {type_id}", cause=exc)
+
+    def names(self) -> list[str]:
+        return sorted(self._by_name)
+
+
+def load_schema_directory(directory: Optional[Path] = None) -> SchemaRegistry:
+    """Compile every `*.json` schema in `directory` (default: common/message-schema/json)."""
+    directory = Path(directory) if directory is not None else DEFAULT_SCHEMA_DIR
+    registry = SchemaRegistry()
+    for path in sorted(directory.glob("*.json")):
+        with path.open("r", encoding="utf-8") as schema_file:
+            registry.register(compile_schema(json.load(schema_file)))
+    return registry
+
+
+class StructSerializer(Serializer):
+    """Serializer for one compiled message type."""
+
+    def __init__(self, codec: MessageCodec) -> None:
+        self._encode = codec.encode
+        self._name = codec.name
+
+    def serialize(self, obj: Any) -> bytes:
+        try:
+            return self._encode(obj)
+        except (KeyError, TypeError, struct.error) as exc:
+            raise BluetoothServerError(f"Object does not match schema {self._name}", cause=exc)
+
+
+class StructDeserializer(Deserializer):
+    """Deserializer dispatching on the type ID prefix of each payload."""
+
+    def __init__(self, registry: SchemaRegistry) -> None:
+        self._registry = registry
+
+    def deserialize(self, payload: bytes) -> Any:
+        try:
+            (type_id,) = _TYPE_ID.unpack_from(payload)
+            return self._registry.by_type_id(type_id).decode(payload)
+        except (struct.error, UnicodeDecodeError) as exc:
+            raise BluetoothServerError("Payload does not match its schema layout", cause=exc)
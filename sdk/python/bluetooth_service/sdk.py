@@ -7,9 +7,12 @@ from typing import Any, Optional
 
 from .config import ServerSettings
 from .logging_utils import configure_logging
-from .serializers import PickleDeserializer
+from .exceptions import BluetoothServerError
+from .interfaces import DataSink, Deserializer
+from .serializers import PassthroughDeserializer, PickleDeserializer
 from .server import BluetoothServer
-from .storage import JsonFileSink
+from .storage import DeduplicatingSink, EnvelopeUnwrappingSink, JsonFileSink, RawFileSink
+from .supervisor import ServerSupervisor
 
 logger = logging.getLogger(__name__)
 
@@ -31,11 +34,8 @@ class BluetoothServerSDK:
         settings: Optional[ServerSettings] = None,
     ) -> "BluetoothServerSDK":
         settings = settings or ServerSettings()
-        server = BluetoothServer(
-            settings,
-            deserializer=PickleDeserializer(),
-            sink=JsonFileSink(settings.json_file),
-        )
+        deserializer, sink = default_codec_and_sink(settings)
+        server = BluetoothServer(settings, deserializer=deserializer, sink=sink)
         return cls(server)
 
     def run_once(self) -> Any:
@@ -52,13 +52,43 @@ class BluetoothServerSDK:
             self._server.stop()
 
 
+def default_codec_and_sink(settings: ServerSettings) -> tuple[Deserializer, DataSink]:
+    """Pick the deserializer/sink pair matching `settings.payload_mode`."""
+    deserializer: Deserializer
+    sink: DataSink
+    if settings.payload_mode == "pickle":
+        deserializer, sink = PickleDeserializer(), JsonFileSink(settings.json_file)
+    elif settings.payload_mode == "raw":
+        deserializer, sink = PassthroughDeserializer(), RawFileSink(settings.json_file, settings.raw_validation)
+    else:
+        raise BluetoothServerError(f"Unknown payload mode {settings.payload_mode!r}")
+    if settings.deduplicate_messages:
+        sink = DeduplicatingSink(sink, settings.dedup_capacity)
+    else:
+        # Outbox clients envelope every message; persist the body either way.
+        sink = EnvelopeUnwrappingSink(sink)
+    return deserializer, sink
+
+
 def bootstrap_and_run(settings: Optional[ServerSettings] = None) -> Any:
     """
     Convenience helper that also configures logging from settings.
     """
 
     settings = settings or ServerSettings()
-    configure_logging(settings.logging_config_path, env_key=settings.log_env_key)
+    configure_logging(settings.logging_config_path, env_key=settings.log_env_key, queued=settings.log_queue)
     sdk = BluetoothServerSDK.default(settings)
     return sdk.run_once()
 
+
+def bootstrap_and_supervise(settings: Optional[ServerSettings] = None) -> None:
+    """
+    Configure logging and run pre-forked workers until interrupted.
+
+    Worker count and channels come from `ServerSettings.workers` /
+    `ServerSettings.worker_channels`.
+    """
+
+    settings = settings or ServerSettings()
+    configure_logging(settings.logging_config_path, env_key=settings.log_env_key, queued=settings.log_queue)
+    ServerSupervisor(settings).run()
@@ -21,3 +21,20 @@ class PickleSerializer(Serializer):
     def serialize(self, obj: Any) -> bytes:
         return pickle.dumps(obj)
 
+
+class PassthroughSerializer(Serializer):
+    """Send already-encoded payloads (e.g. raw JSON file bytes) unchanged."""
+
+    def serialize(self, obj: Any) -> bytes:
+        # Bytes-like objects (including mmap-backed memoryviews) are returned
+        # as-is so the only copy is the one made while framing.
+        if isinstance(obj, (bytes, bytearray, memoryview)):
+            return obj
+        raise TypeError(f"Passthrough serializer expects bytes, got {type(obj)!r}")
+
+
+class PassthroughDeserializer(Deserializer):
+    """Hand received bytes to the sink without decoding them."""
+
+    def deserialize(self, payload: bytes) -> Any:
+        return payload
@@ -3,12 +3,20 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Optional
+import time
+from typing import TYPE_CHECKING, Any, Optional
 
 from .config import ServerSettings
 from .exceptions import BluetoothServerError
+from .framing import FrameDecoder
+from .heartbeat import pong_reply, split_ping
 from .interfaces import DataSink, Deserializer
-from .socket_manager import SocketManager
+from .logging_utils import new_connection_id
+from .metrics import ServerMetrics
+from .tuning import AdaptiveLinkTuner
+
+if TYPE_CHECKING:
+    from .socket_manager import SocketManager
 
 logger = logging.getLogger(__name__)
 
@@ -27,12 +35,24 @@ class BluetoothServer:
         deserializer: Deserializer,
         sink: DataSink,
         socket_manager: Optional[SocketManager] = None,
+        metrics: Optional[ServerMetrics] = None,
     ) -> None:
         self.settings = settings or ServerSettings()
         self._deserializer = deserializer
         self._sink = sink
-        self._socket_manager = socket_manager or SocketManager()
+        if socket_manager is None:
+            # Imported lazily so alternative transports do not require PyBluez.
+            from .socket_manager import SocketManager
+
+            socket_manager = SocketManager()
+        self._socket_manager = socket_manager
+        self.metrics = metrics or ServerMetrics()
+        self.tuner: Optional[AdaptiveLinkTuner] = None
+        self.connection_id: Optional[str] = None
+        self._sequence = 0
         self._connected = False
+        self._ping_prefix = f"{self.settings.ping_message}:".encode("utf-8")
+        self._last_seen = self._last_payload = 0.0
 
     def start(self) -> None:
         """Create, bind, and optionally advertise the RFCOMM server."""
@@ -50,7 +70,23 @@ class BluetoothServer:
             advertise_profile=self.settings.advertise,
         )
         self._socket_manager.accept(timeout=self.settings.accept_timeout)
+        # Stateful codecs (e.g. delta encoding) start fresh on every connection.
+        reset = getattr(self._deserializer, "reset", None)
+        if callable(reset):
+            reset()
+        if self.settings.auto_tune:
+            # Link conditions are per connection: start tuning from scratch.
+            self.tuner = AdaptiveLinkTuner(
+                initial_size=self.settings.buffer_size,
+                min_size=self.settings.min_buffer_size,
+                max_size=self.settings.max_buffer_size,
+            )
+        self.connection_id = new_connection_id()
+        self._sequence = 0
+        self._last_seen = self._last_payload = time.monotonic()
         self._connected = True
+        self.metrics.increment("connections_accepted")
+        logger.info("Connection %s established", self.connection_id, extra={"connection_id": self.connection_id})
 
     def receive_once(self) -> Any:
         """
@@ -61,15 +97,25 @@ class BluetoothServer:
         if not self._connected:
             raise BluetoothServerError("Server must be started before receiving data")
 
+        self._sequence += 1
         raw_payload = self._receive_buffer_with_ack()
+        self._last_payload = time.monotonic()
         obj = self._deserializer.deserialize(raw_payload)
         self._sink.persist(obj)
-        logger.info("Payload persisted successfully")
+        self.metrics.increment("payloads_received")
+        self.metrics.increment("bytes_received", len(raw_payload))
+        # Per-message records are DEBUG and guarded so the receive path pays
+        # nothing for them (not even building `extra`) when they are disabled.
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Payload persisted successfully", extra=self._log_context())
         return obj
 
     def stop(self) -> None:
-        """Release sockets."""
+        """Release sockets and flush buffering sinks."""
         self._socket_manager.close()
+        flush = getattr(self._sink, "flush", None)
+        if callable(flush):
+            flush()
         self._connected = False
         logger.info("Bluetooth server stopped")
 
@@ -77,26 +123,128 @@ class BluetoothServer:
 
     def _receive_buffer_with_ack(self) -> bytes:
         while True:
-            data = self._socket_manager.receive(
-                self.settings.buffer_size,
-                timeout=self.settings.receive_timeout,
-            )
+            data = self._receive_watched()
+            # Time the frame from its first bytes, not from when we started
+            # waiting for the peer's next message.
+            started = time.monotonic()
+            if not data:
+                self._request_resend(self.settings.resend_empty_message)
+                continue
+            while data.startswith(self._ping_prefix):
+                self.metrics.increment("pings_received")
+                sequence, data = split_ping(data, self._ping_prefix)
+                self._socket_manager.send(pong_reply(sequence, self.settings.pong_message))
             if not data:
-                self._socket_manager.send(self.settings.resend_empty_message)
                 continue
 
-            data_size_str, _, remainder = data.partition(b":")
-            try:
-                data_size = int(data_size_str)
-            except ValueError as exc:
-                raise BluetoothServerError("Invalid length prefix", cause=exc)
-
-            if len(remainder) < data_size:
-                logger.warning("Corrupted buffer detected")
-                self._socket_manager.send(self.settings.resend_corrupt_message)
+            payload = self._reassemble(data) if self._reassembles() else self._parse_single_read(data)
+            if payload is None:
+                logger.warning("Corrupted buffer detected", extra=self._log_context())
+                self._request_resend(self.settings.resend_corrupt_message)
                 continue
 
             self._socket_manager.send(self.settings.acknowledge_message)
-            logger.debug("Payload of %s bytes acknowledged", data_size)
-            return remainder[:data_size]
-
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Payload of %s bytes acknowledged", len(payload), extra=self._log_context())
+            if self.tuner is not None:
+                self.tuner.on_ack(len(payload), time.monotonic() - started)
+                self.tuner.publish(self.metrics, "buffer_size")
+            return payload
+
+    def _parse_single_read(self, data: bytes) -> Optional[bytes]:
+        """Parse a frame expected to arrive in one read; None when it is short."""
+        data_size_str, _, remainder = data.partition(b":")
+        try:
+            data_size = int(data_size_str)
+        except ValueError as exc:
+            self.metrics.increment("errors")
+            raise BluetoothServerError("Invalid length prefix", cause=exc)
+        if len(remainder) < data_size:
+            return None
+        return remainder[:data_size]
+
+    def _log_context(self) -> dict[str, Any]:
+        return {"connection_id": self.connection_id, "sequence": self._sequence}
+
+    def _receive_watched(self) -> bytes:
+        """First read of a frame, bounded by the peer and idle deadlines."""
+        deadline = self._connection_deadline()
+        timeout = self.settings.receive_timeout
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._close_stale_connection()
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        try:
+            data = self._socket_manager.receive(self._buffer_size(), timeout=timeout)
+        except BluetoothServerError:
+            # Transports report timeouts differently; the clock is authoritative.
+            if deadline is not None and time.monotonic() >= deadline:
+                self._close_stale_connection()
+            raise
+        if data:
+            self._last_seen = time.monotonic()
+        return data
+
+    def _connection_deadline(self) -> Optional[float]:
+        deadlines = []
+        if self.settings.peer_timeout_seconds is not None:
+            deadlines.append(self._last_seen + self.settings.peer_timeout_seconds)
+        if self.settings.idle_timeout_seconds is not None:
+            deadlines.append(self._last_payload + self.settings.idle_timeout_seconds)
+        return min(deadlines, default=None)
+
+    def _close_stale_connection(self) -> None:
+        now = time.monotonic()
+        peer_timeout = self.settings.peer_timeout_seconds
+        if peer_timeout is not None and now >= self._last_seen + peer_timeout:
+            self.metrics.increment("dead_peers")
+            reason = f"no traffic for {peer_timeout}s"
+        else:
+            self.metrics.increment("idle_disconnects")
+            reason = f"no payload for {self.settings.idle_timeout_seconds}s"
+        logger.warning("Closing connection %s: %s", self.connection_id, reason, extra=self._log_context())
+        self._socket_manager.close()
+        self._connected = False
+        raise BluetoothServerError(f"Connection closed: {reason}")
+
+    def _buffer_size(self) -> int:
+        return self.tuner.size if self.tuner is not None else self.settings.buffer_size
+
+    def _reassembles(self) -> bool:
+        return self.settings.reassemble_frames or self.settings.auto_tune
+
+    def _request_resend(self, message: str) -> None:
+        self.metrics.increment("resends_requested")
+        if self.tuner is not None:
+            self.tuner.on_resend()
+        self._socket_manager.send(message)
+
+    def _reassemble(self, data: bytes) -> Optional[bytes]:
+        """Keep reading until one whole frame (prefix included) has arrived; None on timeout/EOF."""
+        decoder = FrameDecoder()
+        frames = self._feed(decoder, data)
+        timeout = self.settings.receive_timeout
+        while not frames:
+            deadline = None if timeout is None else time.monotonic() + timeout
+            try:
+                chunk = self._socket_manager.receive(self._buffer_size(), timeout=timeout)
+            except BluetoothServerError:
+                # Transports report timeouts differently; the clock is authoritative.
+                if deadline is not None and time.monotonic() >= deadline:
+                    return None
+                raise
+            if not chunk:
+                return None
+            frames = self._feed(decoder, chunk)
+        if len(frames) > 1 or decoder.pending:
+            # The protocol is stop-and-wait: nothing may follow an unacknowledged frame.
+            logger.warning("Discarding data received after frame", extra=self._log_context())
+        return frames[0]
+
+    def _feed(self, decoder: FrameDecoder, data: bytes) -> list[bytes]:
+        try:
+            return decoder.feed(data)
+        except BluetoothServerError:
+            self.metrics.increment("errors")
+            raise
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+import socket
 from typing import Optional, Tuple
 
 from bluetooth import (
@@ -85,7 +86,7 @@ class SocketManager:
             if timeout is not None:
                 self.server_socket.settimeout(timeout)
             self._client_socket, client_info = self.server_socket.accept()
-            logger.info("Accepted connection from %s", client_info)
+            logger.info("Accepted connection from %s", client_info, extra={"peer": str(client_info)})
             return self.client_socket, client_info
         except (BluetoothError, OSError) as exc:
             raise BluetoothServerError("Unable to accept connection", cause=exc)
@@ -122,6 +123,11 @@ class SocketManager:
         for sock in (self._client_socket, self._server_socket):
             if sock is None:
                 continue
+            try:
+                # close() alone does not wake a recv()/accept() blocked on another thread.
+                sock.shutdown(socket.SHUT_RDWR)
+            except (BluetoothError, OSError):
+                pass  # not connected (or already shut down)
             try:
                 sock.close()
             except BluetoothError as exc:
@@ -2,12 +2,23 @@
 
 from __future__ import annotations
 
+import collections
 import json
+import logging
+import mmap
+import os
 from pathlib import Path
 from typing import Any, Mapping
 
+from .exceptions import BluetoothServerError
 from .interfaces import DataSink, DataSource
 
+logger = logging.getLogger(__name__)
+
+RAW_VALIDATION_MODES = ("none", "light", "strict")
+_JSON_WHITESPACE = b" \t\n\r"
+_JSON_DELIMITERS = {(ord("{"), ord("}")), (ord("["), ord("]"))}
+
 
 class JsonFileSink(DataSink):
     """
@@ -25,6 +36,75 @@ class JsonFileSink(DataSink):
             json.dump(serializable, json_file, indent=4)
 
 
+class NullSink(DataSink):
+    """Discard objects; useful for benchmarks and load tests."""
+
+    def persist(self, obj: Any) -> None:
+        return None
+
+
+class EnvelopeUnwrappingSink(DataSink):
+    """
+    Persist the body of outbox envelopes without deduplicating them.
+
+    Objects shaped like `{"message_id": ..., "body": ...}` have their body
+    forwarded to `inner`; anything else is forwarded unchanged.
+    """
+
+    def __init__(self, inner: DataSink) -> None:
+        self._inner = inner
+
+    def persist(self, obj: Any) -> None:
+        self._inner.persist(obj["body"] if _is_envelope(obj) else obj)
+
+    def flush(self) -> None:
+        flush = getattr(self._inner, "flush", None)
+        if callable(flush):
+            flush()
+
+
+class DeduplicatingSink(DataSink):
+    """
+    Unwrap outbox envelopes and drop messages whose ID was already persisted.
+
+    Objects shaped like `{"message_id": ..., "body": ...}` have their body
+    forwarded to `inner` once per ID; IDs are remembered in a bounded LRU of
+    `capacity` entries. Anything else is forwarded unchanged.
+
+    The LRU is per process: with supervisor workers, a redelivery that lands
+    on a different worker than the original is not recognised.
+    """
+
+    def __init__(self, inner: DataSink, capacity: int = 10_000) -> None:
+        self._inner = inner
+        self._capacity = capacity
+        self._seen: collections.OrderedDict[str, None] = collections.OrderedDict()
+        self.duplicates = 0
+
+    def persist(self, obj: Any) -> None:
+        if not _is_envelope(obj):
+            self._inner.persist(obj)
+            return
+        message_id = obj["message_id"]
+        if message_id in self._seen:
+            self._seen.move_to_end(message_id)
+            self.duplicates += 1
+            logger.info("Dropping duplicate message %s", message_id)
+            return
+        self._inner.persist(obj["body"])
+        # Only remember the ID once persisted, so a failed write does not make
+        # a later redelivery look like a duplicate. The server ACKs before
+        # persisting, though, so nothing redelivers a failed write by itself.
+        self._seen[message_id] = None
+        if len(self._seen) > self._capacity:
+            self._seen.popitem(last=False)
+
+    def flush(self) -> None:
+        flush = getattr(self._inner, "flush", None)
+        if callable(flush):
+            flush()
+
+
 class JsonFileSource(DataSource):
     """Load JSON content from disk for transmission."""
 
@@ -35,3 +115,66 @@ class JsonFileSource(DataSource):
         with self._path.open("r", encoding="utf-8") as json_file:
             return json.load(json_file)
 
+
+class RawFileSink(DataSink):
+    """
+    Write received payload bytes straight to disk (zero-parse passthrough).
+
+    `validation` trades safety for CPU: "none" trusts the sender, "light"
+    checks the payload looks like a JSON object/array without parsing it, and
+    "strict" fully parses it once.
+    """
+
+    def __init__(self, target_path: str, validation: str = "light") -> None:
+        if validation not in RAW_VALIDATION_MODES:
+            raise BluetoothServerError(f"Unknown raw validation mode {validation!r}")
+        self._path = Path(target_path)
+        self._validation = validation
+
+    def persist(self, obj: Any) -> None:
+        if not isinstance(obj, (bytes, bytearray, memoryview)):
+            raise BluetoothServerError(f"Raw sink expects bytes, got {type(obj)!r}")
+        self._validate(obj)
+        with self._path.open("wb") as raw_file:
+            raw_file.write(obj)
+
+    def _validate(self, payload: bytes) -> None:
+        if self._validation == "none":
+            return
+        if self._validation == "strict":
+            try:
+                json.loads(payload)
+            except ValueError as exc:
+                raise BluetoothServerError("Payload is not valid JSON", cause=exc)
+            return
+        # Look at the outermost non-whitespace bytes in place; stripping would
+        # copy the whole payload.
+        view = memoryview(payload).cast("B")
+        start, end = 0, len(view)
+        while start < end and view[start] in _JSON_WHITESPACE:
+            start += 1
+        while end > start and view[end - 1] in _JSON_WHITESPACE:
+            end -= 1
+        if start == end or (view[start], view[end - 1]) not in _JSON_DELIMITERS:
+            raise BluetoothServerError("Payload does not look like a JSON document")
+
+
+class RawFileSource(DataSource):
+    """Load file bytes for transmission without decoding them."""
+
+    def __init__(self, source_path: str, use_mmap: bool = False) -> None:
+        self._path = Path(source_path)
+        self._use_mmap = use_mmap
+
+    def load(self) -> Any:
+        if not self._use_mmap:
+            return self._path.read_bytes()
+        with self._path.open("rb") as raw_file:
+            if not os.fstat(raw_file.fileno()).st_size:
+                return b""  # mmap cannot map empty files
+            # The mapping stays valid after the file object is closed.
+            return memoryview(mmap.mmap(raw_file.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def _is_envelope(obj: Any) -> bool:
+    return isinstance(obj, Mapping) and obj.keys() == {"message_id", "body"}
@@ -0,0 +1,280 @@
+"""Pre-fork supervisor that shards the server across RFCOMM channels."""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from .config import ServerSettings
+from .exceptions import BluetoothServerError
+from .metrics import ServerMetrics, merge_snapshots
+from .server import BluetoothServer
+
+logger = logging.getLogger(__name__)
+
+ServerFactory = Callable[[ServerSettings, ServerMetrics], BluetoothServer]
+
+
+def default_server_factory(settings: ServerSettings, metrics: ServerMetrics) -> BluetoothServer:
+    """Build the same stack as `BluetoothServerSDK.default` for a worker."""
+    from .sdk import default_codec_and_sink
+
+    deserializer, sink = default_codec_and_sink(settings)
+    return BluetoothServer(settings, deserializer=deserializer, sink=sink, metrics=metrics)
+
+
+@dataclass
+class _WorkerSlot:
+    index: int
+    settings: ServerSettings
+    process: Optional[multiprocessing.process.BaseProcess] = None
+    started_at: float = 0.0
+    restarts: int = 0
+    last_snapshot: dict[str, float] = field(default_factory=dict)
+    last_gauges: dict[str, float] = field(default_factory=dict)
+
+
+class ServerSupervisor:
+    """
+    Forks one `BluetoothServer` worker per RFCOMM channel and keeps them alive.
+
+    Every worker binds its own channel and advertises it under the shared
+    service UUID, so clients (see `ClientSettings.spread_across_channels`) can
+    spread across processes. Workers publish metric snapshots over a queue; the
+    supervisor aggregates them and restarts workers that exit.
+    """
+
+    def __init__(
+        self,
+        settings: Optional[ServerSettings] = None,
+        *,
+        server_factory: ServerFactory = default_server_factory,
+        mp_context: Optional[Any] = None,
+        status_path: Optional[str] = None,
+    ) -> None:
+        self.settings = settings or ServerSettings()
+        self._status_path = Path(status_path) if status_path else None
+        self._server_factory = server_factory
+        self._context = mp_context or multiprocessing.get_context("fork")
+        self._metrics_queue = self._context.Queue()
+        self._stop_event = self._context.Event()
+        self._slots = [
+            _WorkerSlot(index, self._worker_settings(index))
+            for index in range(self._worker_count())
+        ]
+        # Counters carried over from workers that have since been replaced.
+        self._retired: dict[str, float] = {}
+        self._stopping = False
+
+    def start(self) -> None:
+        """Fork every worker process."""
+        logger.info("Starting %s server workers", len(self._slots))
+        for slot in self._slots:
+            self._spawn(slot)
+
+    def monitor(self) -> None:
+        """Collect metric snapshots and restart workers that have exited."""
+        self._drain_metrics()
+        if self._stopping:
+            return
+        now = time.monotonic()
+        for slot in self._slots:
+            process = slot.process
+            if process is None or process.is_alive():
+                continue
+            if now - slot.started_at < self.settings.worker_restart_backoff_seconds:
+                continue
+            logger.warning(
+                "Worker %s (channel %s) exited with code %s; restarting",
+                slot.index,
+                slot.settings.port,
+                process.exitcode,
+            )
+            self._retire(slot)
+            slot.restarts += 1
+            self._spawn(slot)
+
+    def run(self, poll_interval: float = 0.5) -> None:
+        """Start workers and supervise them until SIGINT/SIGTERM or `stop()`."""
+        previous = {
+            signum: signal.signal(signum, self._handle_signal)
+            for signum in (signal.SIGINT, signal.SIGTERM)
+        }
+        try:
+            self.start()
+            while not self._stopping:
+                self.monitor()
+                self.write_status()
+                time.sleep(poll_interval)
+        finally:
+            self.stop()
+            self.write_status()
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Terminate all workers and collect their final metrics."""
+        self._stopping = True
+        self._stop_event.set()
+        for slot in self._slots:
+            if slot.process is not None and slot.process.is_alive():
+                # Workers are usually blocked in accept()/recv(); terminate them.
+                slot.process.terminate()
+        deadline = time.monotonic() + timeout
+        for slot in self._slots:
+            if slot.process is not None:
+                slot.process.join(max(0.0, deadline - time.monotonic()))
+        self._drain_metrics()
+        logger.info("Server supervisor stopped")
+
+    def metrics(self) -> dict[str, float]:
+        """Sum the latest counters of all workers, past and present (gauges are per worker)."""
+        self._drain_metrics()
+        return merge_snapshots([self._retired, *(slot.last_snapshot for slot in self._slots)])
+
+    def worker_status(self) -> list[dict[str, Any]]:
+        return [
+            {
+                "index": slot.index,
+                "channel": slot.settings.port,
+                "pid": slot.process.pid if slot.process else None,
+                "alive": bool(slot.process and slot.process.is_alive()),
+                "restarts": slot.restarts,
+                "gauges": dict(slot.last_gauges),
+            }
+            for slot in self._slots
+        ]
+
+    def write_status(self) -> None:
+        """Publish workers and aggregated metrics to `status_path` (if set)."""
+        if self._status_path is None:
+            return
+        status = {
+            "pid": os.getpid(),
+            "running": not self._stopping,
+            "updated_at": time.time(),
+            "workers": self.worker_status(),
+            "metrics": self.metrics(),
+        }
+        tmp_path = self._status_path.with_name(self._status_path.name + ".tmp")
+        with tmp_path.open("w", encoding="utf-8") as status_file:
+            json.dump(status, status_file, indent=4)
+        os.replace(tmp_path, self._status_path)
+
+    # Internals -----------------------------------------------------------------
+
+    def _worker_count(self) -> int:
+        if self.settings.worker_channels:
+            return len(self.settings.worker_channels)
+        if self.settings.workers < 1:
+            raise BluetoothServerError("At least one worker is required")
+        return self.settings.workers
+
+    def _worker_settings(self, index: int) -> ServerSettings:
+        channels = self.settings.worker_channels
+        port = channels[index] if channels else self.settings.port
+        return dataclasses.replace(self.settings, port=port)
+
+    def _spawn(self, slot: _WorkerSlot) -> None:
+        slot.process = self._context.Process(
+            target=_worker_main,
+            args=(
+                slot.index,
+                slot.settings,
+                self._server_factory,
+                self._metrics_queue,
+                self._stop_event,
+            ),
+            name=f"bluetooth-worker-{slot.index}",
+            daemon=True,
+        )
+        slot.process.start()
+        slot.started_at = time.monotonic()
+        logger.info("Worker %s started (pid %s)", slot.index, slot.process.pid)
+
+    def _retire(self, slot: _WorkerSlot) -> None:
+        self._retired = merge_snapshots([self._retired, slot.last_snapshot])
+        slot.last_snapshot = {}
+        # A gauge describes the live worker; it dies with it.
+        slot.last_gauges = {}
+
+    def _drain_metrics(self) -> None:
+        while True:
+            try:
+                index, pid, snapshot, gauges = self._metrics_queue.get_nowait()
+            except queue.Empty:
+                return
+            slot = self._slots[index]
+            # Ignore late snapshots from a worker that was already replaced.
+            if slot.process is not None and slot.process.pid == pid:
+                slot.last_snapshot = snapshot
+                slot.last_gauges = gauges
+
+    def _handle_signal(self, signum: int, frame: Any) -> None:
+        logger.info("Received signal %s, stopping workers", signum)
+        self._stopping = True
+
+
+def _worker_main(
+    index: int,
+    settings: ServerSettings,
+    server_factory: ServerFactory,
+    metrics_queue: Any,
+    stop_event: Any,
+) -> None:
+    """Entry point of a forked worker: serve connections until told to stop."""
+    # Shutdown is coordinated by the supervisor: its SIGTERM unwinds the serve
+    # loop below, so the final metrics are published before the worker exits.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, _exit_on_sigterm)
+
+    pid = os.getpid()
+    metrics = ServerMetrics()
+    server = server_factory(settings, metrics)
+
+    def publish() -> None:
+        metrics_queue.put((index, pid, metrics.counters(), metrics.gauges()))
+
+    def publish_periodically() -> None:
+        # Poll rather than stop_event.wait(): a worker killed while blocked in
+        # wait() leaves the shared condition waiting for a wake-up that never
+        # comes, which would hang the supervisor's stop_event.set().
+        while not stop_event.is_set():
+            time.sleep(settings.metrics_interval_seconds)
+            publish()
+
+    threading.Thread(target=publish_periodically, daemon=True).start()
+
+    while not stop_event.is_set():
+        connected = False
+        try:
+            server.start()
+            connected = True
+            while not stop_event.is_set():
+                server.receive_once()
+        except BluetoothServerError as exc:
+            if not connected:
+                # Bind/advertise failures will not fix themselves in-process;
+                # let the supervisor restart us after its backoff.
+                logger.error("Worker %s failed to start: %s", index, exc)
+                raise SystemExit(1)
+            metrics.increment("errors")
+            logger.warning("Worker %s connection ended: %s", index, exc)
+        finally:
+            # Also reached when SIGTERM interrupts accept() or recv().
+            server.stop()
+            publish()
+
+
+def _exit_on_sigterm(signum: int, frame: Any) -> None:
+    raise SystemExit(0)
@@ -0,0 +1,353 @@
+"""Columnar time-series storage for sensor readings."""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import struct
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Any, Iterator, Mapping, Optional, Sequence
+
+from .exceptions import BluetoothServerError
+from .interfaces import DataSink
+
+SEGMENT_MAGIC = b"TSC1"
+SEGMENT_VERSION = 1
+# magic, version, field count, row count, min timestamp, max timestamp
+_HEADER = struct.Struct("<4sHHIdd")
+INDEX_FILE = "index.json"
+ROLLUP_COUNT_FIELD = "count"
+# Rollups also count the non-missing samples of each field as `<field>_count`.
+ROLLUP_FIELD_COUNT_SUFFIX = "_count"
+
+
+def _to_little_endian(column: array) -> bytes:
+    if sys.byteorder == "big":
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def _from_little_endian(typecode: str, buffer: bytes) -> array:
+    column = array(typecode)
+    column.frombytes(buffer)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column
+
+
+def _sensor_typecode() -> str:
+    # Sensor ids are stored as uint32; pick whichever typecode has that width.
+    for typecode in ("I", "L"):
+        if array(typecode).itemsize == 4:
+            return typecode
+    raise BluetoothServerError("Platform has no 4-byte unsigned array type")
+
+
+SENSOR_TYPECODE = _sensor_typecode()
+
+
+class ColumnarTimeSeriesSink(DataSink):
+    """
+    Buffer sensor readings column-wise and flush compact binary segments.
+
+    Each reading is a mapping with a timestamp, a sensor id and numeric value
+    fields. Readings are kept in typed arrays and written as little-endian
+    segments sorted by timestamp; `index.json` records each segment's time
+    range so `TimeSeriesReader` only opens the segments a query touches.
+    When `rollup_seconds` is set, per-sensor bucket means are written to
+    separate rollup segments at every flush. Missing values are left out of
+    the means and counted per field, so `TimeSeriesReader` can merge the
+    partial rows of a bucket that spans several flushes.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        *,
+        value_fields: Sequence[str],
+        timestamp_field: str = "timestamp",
+        sensor_field: str = "sensor_id",
+        flush_rows: int = 4096,
+        flush_interval_seconds: Optional[float] = 60.0,
+        rollup_seconds: Optional[float] = None,
+    ) -> None:
+        if not value_fields:
+            raise BluetoothServerError("At least one value field is required")
+        self._dir = Path(directory)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._value_fields = list(value_fields)
+        self._timestamp_field = timestamp_field
+        self._sensor_field = sensor_field
+        self._flush_rows = flush_rows
+        self._flush_interval = flush_interval_seconds
+        self._rollup_seconds = rollup_seconds
+        self._index = _load_index(self._dir) or {
+            "version": SEGMENT_VERSION,
+            "value_fields": self._value_fields,
+            "sensors": {},
+            "segments": [],
+        }
+        if self._index["value_fields"] != self._value_fields:
+            raise BluetoothServerError(
+                f"Store at {self._dir} uses fields {self._index['value_fields']}"
+            )
+        self._reset_buffers()
+
+    def persist(self, obj: Any) -> None:
+        """Buffer one reading (mapping) or a batch of readings (sequence)."""
+        readings = obj if isinstance(obj, Sequence) and not isinstance(obj, (str, bytes)) else [obj]
+        for reading in readings:
+            self._append(reading)
+        if len(self._timestamps) >= self._flush_rows or self._interval_elapsed():
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered readings (and rollups) to disk."""
+        if not self._timestamps:
+            return
+        order = sorted(range(len(self._timestamps)), key=self._timestamps.__getitem__)
+        timestamps = array("d", (self._timestamps[i] for i in order))
+        sensors = array(SENSOR_TYPECODE, (self._sensors[i] for i in order))
+        values = [array("d", (column[i] for i in order)) for column in self._values]
+        self._write_segment("raw", self._value_fields, timestamps, sensors, values)
+        if self._rollup_seconds:
+            self._write_segment("rollup", *self._rollup(timestamps, sensors, values))
+        _store_index(self._dir, self._index)
+        self._reset_buffers()
+
+    def close(self) -> None:
+        self.flush()
+
+    # Internals -----------------------------------------------------------------
+
+    def _reset_buffers(self) -> None:
+        self._timestamps = array("d")
+        self._sensors = array(SENSOR_TYPECODE)
+        self._values = [array("d") for _ in self._value_fields]
+        self._first_buffered_at: Optional[float] = None
+
+    def _interval_elapsed(self) -> bool:
+        if self._flush_interval is None or self._first_buffered_at is None:
+            return False
+        return time.monotonic() - self._first_buffered_at >= self._flush_interval
+
+    def _append(self, reading: Mapping[str, Any]) -> None:
+        if not isinstance(reading, Mapping):
+            raise BluetoothServerError(f"Sensor reading must be a mapping, got {type(reading)!r}")
+        if self._first_buffered_at is None:
+            self._first_buffered_at = time.monotonic()
+        self._timestamps.append(float(reading.get(self._timestamp_field, time.time())))
+        self._sensors.append(self._sensor_id(str(reading.get(self._sensor_field, ""))))
+        for name, column in zip(self._value_fields, self._values):
+            value = reading.get(name)
+            column.append(math.nan if value is None else float(value))
+
+    def _sensor_id(self, name: str) -> int:
+        sensors = self._index["sensors"]
+        if name not in sensors:
+            sensors[name] = len(sensors)
+        return sensors[name]
+
+    def _rollup(
+        self,
+        timestamps: array,
+        sensors: array,
+        values: list[array],
+    ) -> tuple[list[str], array, array, list[array]]:
+        width = self._rollup_seconds
+        fields = len(values)
+        # Per bucket: value sums, then per-field sample counts, then the row count.
+        buckets: dict[tuple[float, int], list[float]] = {}
+        for row, timestamp in enumerate(timestamps):
+            key = (math.floor(timestamp / width) * width, sensors[row])
+            totals = buckets.setdefault(key, [0.0] * (2 * fields + 1))
+            for position, column in enumerate(values):
+                value = column[row]
+                if not math.isnan(value):
+                    totals[position] += value
+                    totals[fields + position] += 1
+            totals[-1] += 1
+        keys = sorted(buckets)
+        rollup_values = [
+            array("d", (_mean(buckets[key][position], buckets[key][fields + position]) for key in keys))
+            for position in range(fields)
+        ]
+        rollup_values.extend(
+            array("d", (buckets[key][fields + position] for key in keys)) for position in range(fields)
+        )
+        rollup_values.append(array("d", (buckets[key][-1] for key in keys)))
+        return (
+            [
+                *self._value_fields,
+                *(name + ROLLUP_FIELD_COUNT_SUFFIX for name in self._value_fields),
+                ROLLUP_COUNT_FIELD,
+            ],
+            array("d", (key[0] for key in keys)),
+            array(SENSOR_TYPECODE, (key[1] for key in keys)),
+            rollup_values,
+        )
+
+    def _write_segment(
+        self,
+        kind: str,
+        fields: list[str],
+        timestamps: array,
+        sensors: array,
+        values: list[array],
+    ) -> None:
+        name = f"{kind}-{len(self._index['segments']):08d}.tsc"
+        header = _HEADER.pack(
+            SEGMENT_MAGIC,
+            SEGMENT_VERSION,
+            len(fields),
+            len(timestamps),
+            timestamps[0],
+            timestamps[-1],
+        )
+        with (self._dir / name).open("wb") as segment:
+            segment.write(header)
+            segment.write(_to_little_endian(timestamps))
+            segment.write(_to_little_endian(sensors))
+            for column in values:
+                segment.write(_to_little_endian(column))
+        self._index["segments"].append(
+            {
+                "file": name,
+                "kind": kind,
+                "fields": fields,
+                "rows": len(timestamps),
+                "min_ts": timestamps[0],
+                "max_ts": timestamps[-1],
+            }
+        )
+
+
+class TimeSeriesReader:
+    """Time-range queries over segments written by `ColumnarTimeSeriesSink`."""
+
+    def __init__(self, directory: str) -> None:
+        self._dir = Path(directory)
+        index = _load_index(self._dir)
+        if index is None:
+            raise BluetoothServerError(f"No time-series index found in {self._dir}")
+        self._index = index
+        self._sensor_names = {sensor_id: name for name, sensor_id in index["sensors"].items()}
+
+    def query(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        *,
+        sensor_id: Optional[str] = None,
+        rollup: bool = False,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Yield readings with `start <= timestamp <= end` as dictionaries.
+
+        Rows are ordered by timestamp within a segment; segments are visited in
+        the order they were written. Rollup rows are instead merged across
+        segments (one row per bucket and sensor) and ordered by timestamp.
+        """
+        kind = "rollup" if rollup else "raw"
+        wanted = None if sensor_id is None else self._index["sensors"].get(sensor_id)
+        if sensor_id is not None and wanted is None:
+            return
+        rows = (
+            row
+            for meta in self._index["segments"]
+            if meta["kind"] == kind
+            and (start is None or meta["max_ts"] >= start)
+            and (end is None or meta["min_ts"] <= end)
+            for row in self._scan(meta, start, end, wanted)
+        )
+        if rollup:
+            yield from _merge_rollups(rows, self._index["value_fields"])
+        else:
+            yield from rows
+
+    def _scan(
+        self,
+        meta: Mapping[str, Any],
+        start: Optional[float],
+        end: Optional[float],
+        wanted: Optional[int],
+    ) -> Iterator[dict[str, Any]]:
+        timestamps, sensors, values = read_segment(self._dir / meta["file"])
+        low = 0 if start is None else bisect_left(timestamps, start)
+        high = len(timestamps) if end is None else bisect_right(timestamps, end)
+        fields = meta["fields"]
+        for row in range(low, high):
+            if wanted is not None and sensors[row] != wanted:
+                continue
+            reading = {
+                "timestamp": timestamps[row],
+                "sensor_id": self._sensor_names.get(sensors[row]),
+            }
+            for name, column in zip(fields, values):
+                reading[name] = column[row]
+            yield reading
+
+
+def _mean(total: float, count: float) -> float:
+    return total / count if count else math.nan
+
+
+def _merge_rollups(rows: Iterator[dict[str, Any]], value_fields: Sequence[str]) -> list[dict[str, Any]]:
+    """Combine the partial rows that per-flush rollups write for the same bucket."""
+    merged: dict[tuple[float, Optional[str]], dict[str, Any]] = {}
+    for row in rows:
+        key = (row["timestamp"], row["sensor_id"])
+        current = merged.get(key)
+        if current is None:
+            merged[key] = row
+            continue
+        for name in value_fields:
+            count_name = name + ROLLUP_FIELD_COUNT_SUFFIX
+            # Segments written before per-field counts only have the row count.
+            ours = current.get(count_name, current[ROLLUP_COUNT_FIELD])
+            theirs = row.get(count_name, row[ROLLUP_COUNT_FIELD])
+            if theirs:
+                current[name] = row[name] if not ours else (current[name] * ours + row[name] * theirs) / (ours + theirs)
+            current[count_name] = ours + theirs
+        current[ROLLUP_COUNT_FIELD] += row[ROLLUP_COUNT_FIELD]
+    return sorted(merged.values(), key=lambda row: row["timestamp"])
+
+
+def read_segment(path: Path) -> tuple[array, array, list[array]]:
+    """Decode one segment file into its timestamp, sensor and value columns."""
+    data = path.read_bytes()
+    magic, version, field_count, rows, _, _ = _HEADER.unpack_from(data)
+    if magic != SEGMENT_MAGIC or version != SEGMENT_VERSION:
+        raise BluetoothServerError(f"Unsupported segment format in {path}")
+    offset = _HEADER.size
+    timestamps = _from_little_endian("d", data[offset : offset + rows * 8])
+    offset += rows * 8
+    sensors = _from_little_endian(SENSOR_TYPECODE, data[offset : offset + rows * 4])
+    offset += rows * 4
+    values = []
+    for _ in range(field_count):
+        values.append(_from_little_endian("d", data[offset : offset + rows * 8]))
+        offset += rows * 8
+    return timestamps, sensors, values
+
+
+def _load_index(directory: Path) -> Optional[dict[str, Any]]:
+    path = directory / INDEX_FILE
+    if not path.exists():
+        return None
+    with path.open("r", encoding="utf-8") as index_file:
+        return json.load(index_file)
+
+
+def _store_index(directory: Path, index: Mapping[str, Any]) -> None:
+    # Write-then-rename so readers never observe a half-written index.
+    tmp_path = directory / f"{INDEX_FILE}.tmp"
+    with tmp_path.open("w", encoding="utf-8") as index_file:
+        json.dump(index, index_file)
+    os.replace(tmp_path, directory / INDEX_FILE)
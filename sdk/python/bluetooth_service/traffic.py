@@ -0,0 +1,364 @@
+"""Record framed RFCOMM traffic and replay it against loopback servers."""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import os
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, Iterator, Optional
+
+from .config import ServerSettings
+from .exceptions import BluetoothServerError
+from .framing import FrameDecoder
+from .heartbeat import split_ping
+from .loopback import LoopbackListener, LoopbackServerSocketManager
+from .metrics import ServerMetrics, percentile
+from .server import BluetoothServer
+from .storage import NullSink
+
+logger = logging.getLogger(__name__)
+
+CLIENT_TO_SERVER = 0
+SERVER_TO_CLIENT = 1
+LOG_MAGIC = b"UBTR\x01"
+# Microseconds since recording started, connection ID, direction, data length.
+RECORD_HEADER = struct.Struct("<QIBI")
+RECORDER_ROLES = ("server", "client")
+
+
+@dataclass(frozen=True)
+class TrafficRecord:
+    timestamp: float
+    connection: int
+    direction: int
+    data: bytes
+
+
+class TrafficRecorder:
+    """
+    Thread-safe writer of the binary traffic log.
+
+    One recorder can be shared by many socket managers; each accepted or
+    connected socket gets its own connection ID. Records are flushed as they
+    are written so a killed process loses at most the record in flight.
+    """
+
+    def __init__(self, path: str) -> None:
+        self._file = open(path, "wb")
+        self._file.write(LOG_MAGIC)
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._connections = itertools.count(1)
+
+    def new_connection(self) -> int:
+        return next(self._connections)
+
+    def record(self, connection: int, direction: int, data: bytes) -> None:
+        offset = int((time.monotonic() - self._started) * 1e6)
+        with self._lock:
+            self._file.write(RECORD_HEADER.pack(offset, connection, direction, len(data)))
+            self._file.write(data)
+            self._file.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class RecordingSocketManager:
+    """
+    Proxy around a server or client socket manager that logs what it moves.
+
+    `role` says which end `inner` is, so records carry the wire direction
+    (client to server or back) whichever side the capture ran on.
+    """
+
+    def __init__(self, inner: Any, recorder: TrafficRecorder, *, role: str = "server") -> None:
+        if role not in RECORDER_ROLES:
+            raise BluetoothServerError(f"Unknown recorder role {role!r}")
+        self._inner = inner
+        self._recorder = recorder
+        self._outbound = SERVER_TO_CLIENT if role == "server" else CLIENT_TO_SERVER
+        self._inbound = CLIENT_TO_SERVER if role == "server" else SERVER_TO_CLIENT
+        self._connection = 0
+
+    def accept(self, timeout: Optional[float] = None) -> Any:
+        accepted = self._inner.accept(timeout=timeout)
+        self._connection = self._recorder.new_connection()
+        return accepted
+
+    def connect(self) -> None:
+        self._inner.connect()
+        self._connection = self._recorder.new_connection()
+
+    def send(self, payload: str | bytes) -> None:
+        self._inner.send(payload)
+        data = payload.encode("utf-8") if isinstance(payload, str) else bytes(payload)
+        self._recorder.record(self._connection, self._outbound, data)
+
+    def receive(self, buffer_size: int, timeout: Optional[float] = None) -> bytes:
+        data = self._inner.receive(buffer_size, timeout=timeout)
+        if data:
+            self._recorder.record(self._connection, self._inbound, data)
+        return data
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._inner, name)
+
+
+def read_traffic(path: str) -> Iterator[TrafficRecord]:
+    """Yield the records of a traffic log; a truncated final record is ignored."""
+    with open(path, "rb") as log_file:
+        if log_file.read(len(LOG_MAGIC)) != LOG_MAGIC:
+            raise BluetoothServerError(f"{path} is not a traffic log")
+        while True:
+            header = log_file.read(RECORD_HEADER.size)
+            if not header:
+                return
+            if len(header) < RECORD_HEADER.size:
+                break
+            offset, connection, direction, length = RECORD_HEADER.unpack(header)
+            data = log_file.read(length)
+            if len(data) < length:
+                break
+            yield TrafficRecord(offset / 1e6, connection, direction, data)
+    logger.warning("Traffic log %s ends with a truncated record", path)
+
+
+def recording_server_factory(directory: str, settings: ServerSettings, metrics: ServerMetrics) -> BluetoothServer:
+    """Supervisor server factory recording each worker to `traffic-<pid>.ubtr`."""
+    from .sdk import default_codec_and_sink
+    from .socket_manager import SocketManager
+
+    recorder = TrafficRecorder(str(Path(directory) / f"traffic-{os.getpid()}.ubtr"))
+    deserializer, sink = default_codec_and_sink(settings)
+    return BluetoothServer(
+        settings,
+        deserializer=deserializer,
+        sink=sink,
+        socket_manager=RecordingSocketManager(SocketManager(), recorder, role="server"),
+        metrics=metrics,
+    )
+
+
+def replay_traffic(
+    records: Iterable[TrafficRecord],
+    *,
+    speed: Optional[float] = 1.0,
+    multiplier: int = 1,
+    codec: str = "pickle",
+    settings: Optional[ServerSettings] = None,
+) -> dict[str, Any]:
+    """
+    Replay the client-to-server side of recorded traffic against loopback servers.
+
+    Every recorded connection (times `multiplier`) becomes a concurrent
+    simulated client talking to its own `BluetoothServer`. Chunks are sent
+    with their original spacing divided by `speed`; `speed=None` (or 0)
+    sends as fast as the servers acknowledge. Latency is measured per frame
+    from its first byte sent until the server's reply. Heartbeat pings are
+    replayed too, and a partial frame the recorded server asked to resend is
+    only followed up once the replay server asks as well.
+    """
+    from .bench import bench_codec
+
+    settings = settings or ServerSettings(reassemble_frames=True, receive_timeout=5.0)
+    ping_prefix = f"{settings.ping_message}:".encode("utf-8")
+    pong_prefix = f"{settings.pong_message}:".encode("utf-8")
+    acknowledgement = settings.acknowledge_message.encode("utf-8")
+    resend_requests = (
+        settings.resend_empty_message.encode("utf-8"),
+        settings.resend_corrupt_message.encode("utf-8"),
+    )
+
+    streams: dict[int, list[TrafficRecord]] = {}
+    for record in records:
+        if record.direction == CLIENT_TO_SERVER or record.data in resend_requests:
+            streams.setdefault(record.connection, []).append(record)
+    plans = [
+        _plan_replay(stream, ping_prefix)
+        for stream in streams.values()
+        if any(record.direction == CLIENT_TO_SERVER for record in stream)
+    ]
+    if not plans:
+        raise BluetoothServerError("Traffic log contains no client-to-server data")
+
+    origin = min(plan[0].timestamp for plan in plans)
+    metrics = ServerMetrics()
+    latencies: list[float] = []
+    lock = threading.Lock()
+    jobs = [plan for plan in plans for _ in range(multiplier)]
+    started = time.perf_counter()
+
+    def schedule(timestamp: float) -> None:
+        if speed:
+            delay = started + (timestamp - origin) / speed - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+
+    def replay_connection(index: int, plan: list[_ReplayStep]) -> None:
+        listener = LoopbackListener(channel=index)
+        server = BluetoothServer(
+            settings,
+            deserializer=bench_codec(codec)[1],
+            sink=NullSink(),
+            socket_manager=LoopbackServerSocketManager(listener),
+            metrics=metrics,
+        )
+        server_thread = threading.Thread(
+            target=_serve_frames,
+            args=(server, sum(step.frames for step in plan)),
+            name=f"replay-server-{index}",
+            daemon=True,
+        )
+        server_thread.start()
+        sock = listener.connect()
+        # Leave the server room to time out on a partial frame and ask for a resend.
+        sock.settimeout((settings.receive_timeout or 5.0) + 1)
+        replies = bytearray()
+        samples: list[float] = []
+        frame_started: Optional[float] = None
+
+        def await_reply(*expected: bytes) -> None:
+            # Replies may be coalesced into one read; consume them one by one.
+            while True:
+                for reply in expected:
+                    position = replies.find(reply)
+                    if position >= 0:
+                        del replies[: position + len(reply)]
+                        return
+                data = sock.recv(settings.buffer_size)
+                if not data:
+                    raise ConnectionError("replay server closed the connection")
+                replies.extend(data)
+
+        try:
+            for step in plan:
+                schedule(step.timestamp)
+                if step.await_resend:
+                    await_reply(*resend_requests)
+                if frame_started is None and (step.frames or step.partial):
+                    frame_started = time.perf_counter()
+                sock.sendall(step.data)
+                for _ in range(step.pings):
+                    await_reply(pong_prefix)
+                for _ in range(step.frames):
+                    await_reply(acknowledgement)
+                    samples.append(time.perf_counter() - (frame_started or 0.0))
+                    frame_started = time.perf_counter() if step.partial else None
+        except (OSError, BluetoothServerError) as exc:
+            metrics.increment("errors")
+            logger.warning("Replay connection %s aborted: %s", index, exc)
+        finally:
+            sock.close()
+            server_thread.join(timeout=(settings.receive_timeout or 5.0) + 1)
+        with lock:
+            latencies.extend(samples)
+
+    threads = [
+        threading.Thread(target=replay_connection, args=(index, plan), name=f"replay-client-{index}", daemon=True)
+        for index, plan in enumerate(jobs, start=1)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    snapshot = metrics.snapshot()
+    return {
+        "connections": len(jobs),
+        "messages": int(snapshot["payloads_received"]),
+        "seconds": elapsed,
+        "messages/s": snapshot["payloads_received"] / elapsed,
+        "payload MB/s": snapshot["bytes_received"] / elapsed / 1e6,
+        "resends": int(snapshot["resends_requested"]),
+        "errors": int(snapshot["errors"]),
+        "p50 ms": percentile(latencies, 0.50) * 1e3,
+        "p95 ms": percentile(latencies, 0.95) * 1e3,
+        "p99 ms": percentile(latencies, 0.99) * 1e3,
+        "max ms": max(latencies, default=0.0) * 1e3,
+    }
+
+
+@dataclass(frozen=True)
+class _ReplayStep:
+    timestamp: float
+    data: bytes
+    pings: int
+    frames: int
+    # Bytes of an unfinished frame remain after `data`.
+    partial: bool
+    # The recorded server asked to resend a partial frame before `data`.
+    await_resend: bool
+
+
+class _FrameCounter:
+    """
+    Count ping and data frames in recorded client-to-server chunks.
+
+    Recorded traffic is not a clean frame stream: pings sit between frames,
+    and a frame cut short on a bad link is followed by its resend. A chunk
+    that breaks framing therefore starts over as a fresh frame.
+    """
+
+    def __init__(self, ping_prefix: bytes) -> None:
+        self._ping_prefix = ping_prefix
+        self._decoder = FrameDecoder()
+
+    @property
+    def pending(self) -> int:
+        return self._decoder.pending
+
+    def reset(self) -> None:
+        self._decoder = FrameDecoder()
+
+    def feed(self, chunk: bytes) -> tuple[int, int]:
+        """Return the pings in `chunk` and the number of frames it completes."""
+        for _ in range(2):
+            try:
+                return self._feed(chunk)
+            except BluetoothServerError:
+                # A stale partial frame (cut short, then resent) or garbage: start over.
+                self.reset()
+        return 0, 0
+
+    def _feed(self, chunk: bytes) -> tuple[int, int]:
+        pings = 0
+        while not self._decoder.pending and chunk.startswith(self._ping_prefix):
+            pings += 1
+            _, chunk = split_ping(chunk, self._ping_prefix)
+        return pings, len(self._decoder.feed(chunk))
+
+
+def _plan_replay(stream: list[TrafficRecord], ping_prefix: bytes) -> list[_ReplayStep]:
+    counter = _FrameCounter(ping_prefix)
+    steps = []
+    await_resend = False
+    for record in stream:
+        if record.direction == SERVER_TO_CLIENT:
+            # Only a partial frame makes the replay server ask for a resend too.
+            await_resend = await_resend or bool(counter.pending)
+            counter.reset()
+            continue
+        pings, frames = counter.feed(record.data)
+        steps.append(_ReplayStep(record.timestamp, record.data, pings, frames, bool(counter.pending), await_resend))
+        await_resend = False
+    return steps
+
+
+def _serve_frames(server: BluetoothServer, frames: int) -> None:
+    try:
+        server.start()
+        for _ in range(frames):
+            server.receive_once()
+    except Exception as exc:  # recorded traffic may hold payloads the codec rejects
+        server.metrics.increment("errors")
+        logger.warning("Replay server failed: %s", exc)
+    finally:
+        server.stop()
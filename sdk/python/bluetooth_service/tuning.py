@@ -0,0 +1,78 @@
+"""AIMD auto-tuning of chunk/buffer sizes per connection."""
+
+from __future__ import annotations
+
+from typing import Optional
+
+from .metrics import ServerMetrics
+
+# Weight of a new sample in the RTT / goodput moving averages (as in TCP's SRTT).
+EWMA_ALPHA = 0.125
+# A sample slower than this multiple of the best RTT seen counts as congestion
+# and suppresses growth even without an explicit resend.
+RTT_INFLATION_LIMIT = 2.0
+
+
+class AdaptiveLinkTuner:
+    """
+    Additive-increase / multiplicative-decrease controller for one link.
+
+    Every acknowledged frame (`on_ack`) feeds RTT and goodput estimates and,
+    unless the RTT is inflated, grows the size by `increase_step`. Every
+    resend request (`on_resend`) multiplies the size by `decrease_factor`.
+    The size always stays within the configured bounds.
+    """
+
+    def __init__(
+        self,
+        *,
+        initial_size: int,
+        min_size: int,
+        max_size: int,
+        increase_step: Optional[int] = None,
+        decrease_factor: float = 0.5,
+    ) -> None:
+        self.min_size = min_size
+        self.max_size = max(min_size, max_size)
+        self.size = min(self.max_size, max(self.min_size, initial_size))
+        self._step = increase_step or max(1, min_size // 2)
+        self._decrease_factor = decrease_factor
+        self.rtt: Optional[float] = None
+        self.min_rtt: Optional[float] = None
+        self.goodput: Optional[float] = None
+        self.resends = 0
+
+    def on_ack(self, nbytes: int, elapsed: float) -> None:
+        """Record a frame of `nbytes` acknowledged `elapsed` seconds after sending."""
+        elapsed = max(elapsed, 1e-6)
+        sample_goodput = nbytes / elapsed
+        if self.rtt is None:
+            self.rtt, self.goodput = elapsed, sample_goodput
+        else:
+            self.rtt += EWMA_ALPHA * (elapsed - self.rtt)
+            self.goodput += EWMA_ALPHA * (sample_goodput - self.goodput)
+        self.min_rtt = elapsed if self.min_rtt is None else min(self.min_rtt, elapsed)
+        if elapsed > RTT_INFLATION_LIMIT * self.min_rtt:
+            return
+        self.size = min(self.max_size, self.size + self._step)
+
+    def on_resend(self) -> None:
+        """Back off after the peer asked for a retransmission."""
+        self.resends += 1
+        self.size = max(self.min_size, int(self.size * self._decrease_factor))
+
+    def snapshot(self) -> dict[str, float]:
+        return {
+            "size": self.size,
+            "rtt_ms": (self.rtt or 0.0) * 1e3,
+            "min_rtt_ms": (self.min_rtt or 0.0) * 1e3,
+            "goodput_bps": self.goodput or 0.0,
+            "resends": self.resends,
+        }
+
+    def publish(self, metrics: ServerMetrics, size_name: str) -> None:
+        """Expose the tuned values as gauges (`size` under `size_name`)."""
+        snapshot = self.snapshot()
+        metrics.set(size_name, snapshot.pop("size"))
+        for name, value in snapshot.items():
+            metrics.set(f"tuned_{name}", value)
@@ -0,0 +1,137 @@
+"""Unit tests for the broadcast hub and slow-consumer handling."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, List
+
+from bluetooth_service.broadcast import BroadcastHub, Subscriber
+from bluetooth_service.config import ServerSettings
+from bluetooth_service.framing import FrameDecoder, encode_frame
+from bluetooth_service.loopback import LoopbackListener, LoopbackServerSocketManager
+from bluetooth_service.serializers import PassthroughDeserializer, PassthroughSerializer
+
+
+class StalledSocket:
+    """Socket whose writes block until released, like a sluggish phone."""
+
+    def __init__(self) -> None:
+        self.release = threading.Event()
+        self.written: List[bytes] = []
+        self.closed = False
+
+    def sendall(self, frame: bytes) -> None:
+        self.release.wait(5)
+        self.written.append(frame)
+
+    def shutdown(self, how: int) -> None:
+        self.release.set()
+
+    def close(self) -> None:
+        self.closed = True
+        self.release.set()
+
+
+def _wait_for(predicate: Any, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.01)
+
+
+def _subscriber(policy: str) -> tuple[Subscriber, StalledSocket, List[Subscriber]]:
+    sock = StalledSocket()
+    closed: List[Subscriber] = []
+    settings = ServerSettings(
+        subscriber_queue_size=2,
+        slow_consumer_policy=policy,
+        slow_consumer_block_seconds=0.05,
+    )
+    subscriber = Subscriber("peer", sock, settings, closed.append)
+    subscriber.start()
+    return subscriber, sock, closed
+
+
+def test_drop_oldest_keeps_newest_frames() -> None:
+    subscriber, sock, _ = _subscriber("drop_oldest")
+    subscriber.offer(b"0", time.monotonic())
+    _wait_for(lambda: subscriber.stats()["queued"] == 0)  # "0" is stuck in sendall
+
+    for frame in (b"1", b"2", b"3"):
+        assert subscriber.offer(frame, time.monotonic())
+    sock.release.set()
+    _wait_for(lambda: len(sock.written) == 3)
+
+    assert sock.written == [b"0", b"2", b"3"]
+    assert subscriber.stats()["dropped"] == 1
+    subscriber.close()
+
+
+def test_disconnect_and_block_policies_drop_the_slow_peer() -> None:
+    for policy in ("disconnect", "block"):
+        subscriber, sock, closed = _subscriber(policy)
+        subscriber.offer(b"0", time.monotonic())
+        _wait_for(lambda: subscriber.stats()["queued"] == 0)
+        subscriber.offer(b"1", time.monotonic())
+        subscriber.offer(b"2", time.monotonic())
+
+        assert not subscriber.offer(b"3", time.monotonic())
+        assert subscriber.closed and sock.closed
+        _wait_for(lambda: closed == [subscriber])
+
+
+def test_hub_fans_out_one_serialized_frame_to_other_peers() -> None:
+    listener = LoopbackListener()
+    received: List[Any] = []
+    hub = BroadcastHub(
+        ServerSettings(accept_timeout=0.05),
+        serializer=PassthroughSerializer(),
+        deserializer=PassthroughDeserializer(),
+        socket_manager=LoopbackServerSocketManager(listener),
+        on_message=lambda obj, subscriber: received.append((obj, subscriber.peer_id)),
+    )
+    hub.start()
+    try:
+        peers = [listener.connect() for _ in range(3)]
+        _wait_for(lambda: hub.subscriber_count == 3)
+
+        peers[0].sendall(encode_frame(b"hello"))
+        for peer in peers[1:]:
+            peer.settimeout(5)
+            assert FrameDecoder().feed(peer.recv(1024)) == [b"hello"]
+        _wait_for(lambda: len(received) == 1)
+        assert received[0][0] == b"hello"
+
+        stats = hub.subscriber_stats()
+        assert sum(peer_stats["sent"] for peer_stats in stats.values()) == 2
+    finally:
+        hub.stop()
+        for peer in peers:
+            peer.close()
+
+
+def test_disconnected_slow_peer_sees_eof() -> None:
+    listener = LoopbackListener()
+    hub = BroadcastHub(
+        ServerSettings(accept_timeout=0.05, subscriber_queue_size=1, slow_consumer_policy="disconnect"),
+        serializer=PassthroughSerializer(),
+        deserializer=PassthroughDeserializer(),
+        socket_manager=LoopbackServerSocketManager(listener),
+    )
+    hub.start()
+    peer = listener.connect()
+    try:
+        _wait_for(lambda: hub.subscriber_count == 1)
+        # The peer never reads, so the writer blocks in sendall and the queue fills.
+        frame = b"x" * (1 << 20)
+        _wait_for(lambda: hub.publish(frame) == 0)
+
+        peer.settimeout(5)
+        while peer.recv(1 << 16):
+            pass  # drain what was delivered before the disconnect
+        _wait_for(lambda: hub.subscriber_count == 0)
+        _wait_for(lambda: not any(thread.name.startswith("hub-reader-") for thread in threading.enumerate()))
+    finally:
+        hub.stop()
+        peer.close()
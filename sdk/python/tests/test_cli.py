@@ -0,0 +1,56 @@
+"""Unit tests for the ubtctl command-line interface."""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from bluetooth_service.cli import main
+
+SDK_ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_package_import_is_lazy() -> None:
+    probe = "import sys, bluetooth_service.cli; print(sorted(m for m in sys.modules if m.startswith('bluetooth')))"
+    output = subprocess.run(
+        [sys.executable, "-c", probe],
+        cwd=SDK_ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+    assert output.strip() == "['bluetooth_service', 'bluetooth_service.cli']"
+
+
+def test_bench_runs_over_loopback(capsys: pytest.CaptureFixture[str]) -> None:
+    assert main(["bench", "--messages", "50", "--codec", "delta"]) == 0
+
+    output = capsys.readouterr().out
+    assert "messages/s" in output and "p99 ms" in output
+
+
+def test_server_status_reads_status_file(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    status_file = tmp_path / "status.json"
+    status_file.write_text(
+        json.dumps(
+            {
+                "pid": os.getpid(),
+                "running": True,
+                "updated_at": 0,
+                "workers": [{"index": 0, "channel": 3, "pid": os.getpid(), "alive": True, "restarts": 1}],
+                "metrics": {"payloads_received": 12},
+            }
+        )
+    )
+
+    assert main(["server", "status", "--status-file", str(status_file)]) == 0
+
+    output = capsys.readouterr().out
+    assert "worker 0 channel 3" in output and "restarts=1" in output
+    assert "payloads_received: 12" in output
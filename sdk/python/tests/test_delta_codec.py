@@ -0,0 +1,91 @@
+"""Unit tests for the delta/varint stream codec."""
+
+from __future__ import annotations
+
+import math
+import pickle
+
+import pytest
+
+from bluetooth_service.delta_codec import (
+    DeltaStreamDeserializer,
+    DeltaStreamSerializer,
+    zigzag_decode,
+    zigzag_encode,
+)
+from bluetooth_service.exceptions import BluetoothServerError
+
+
+def test_zigzag_round_trip() -> None:
+    for value in (0, 1, -1, 63, -64, 2**40, -(2**40)):
+        assert zigzag_decode(zigzag_encode(value)) == value
+
+
+def test_stream_round_trip_and_compactness() -> None:
+    serializer = DeltaStreamSerializer(float_precision={"timestamp": 3, "temperature": 2})
+    deserializer = DeltaStreamDeserializer()
+    readings = [
+        {"timestamp": 1700000000.0 + i / 10, "sensor": "t1", "temperature": 21.5 + i / 100, "seq": i}
+        for i in range(50)
+    ]
+
+    payloads = [serializer.serialize(reading) for reading in readings]
+    decoded = [deserializer.deserialize(payload) for payload in payloads]
+
+    assert decoded == readings
+    steady_state = payloads[-1]
+    assert len(steady_state) * 10 <= len(pickle.dumps(readings[-1]))
+
+
+def test_schema_change_resends_field_names() -> None:
+    serializer = DeltaStreamSerializer()
+    deserializer = DeltaStreamDeserializer()
+
+    first = serializer.serialize({"a": 1})
+    changed = serializer.serialize({"a": 2, "b": True, "c": None, "d": 0.5})
+
+    assert first[0] == changed[0] == 0x01
+    assert deserializer.deserialize(first) == {"a": 1}
+    assert deserializer.deserialize(changed) == {"a": 2, "b": True, "c": None, "d": 0.5}
+
+
+def test_non_finite_scaled_floats_are_sent_raw() -> None:
+    serializer = DeltaStreamSerializer(float_precision={"temperature": 2})
+    deserializer = DeltaStreamDeserializer()
+    readings = [{"temperature": 21.5}, {"temperature": math.nan}, {"temperature": math.inf}, {"temperature": 22.0}]
+
+    decoded = [deserializer.deserialize(serializer.serialize(reading)) for reading in readings]
+
+    assert decoded[0] == {"temperature": 21.5}
+    assert math.isnan(decoded[1]["temperature"])
+    assert decoded[2:] == [{"temperature": math.inf}, {"temperature": 22.0}]
+
+
+def test_delta_without_schema_is_rejected() -> None:
+    serializer = DeltaStreamSerializer()
+    serializer.serialize({"a": 1})
+    delta = serializer.serialize({"a": 2})
+
+    with pytest.raises(BluetoothServerError):
+        DeltaStreamDeserializer().deserialize(delta)
+
+
+def test_truncated_frames_are_rejected_without_advancing_the_stream() -> None:
+    serializer = DeltaStreamSerializer(float_precision={"temperature": 2})
+    reading = {"sensor": "t1", "temperature": 21.5, "raw": 0.25, "ok": True}
+    schema_frame = serializer.serialize(reading)
+    delta_frame = serializer.serialize({**reading, "temperature": 21.75})
+
+    for cut in range(1, len(schema_frame)):
+        with pytest.raises(BluetoothServerError):
+            DeltaStreamDeserializer().deserialize(schema_frame[:cut])
+
+    deserializer = DeltaStreamDeserializer()
+    deserializer.deserialize(schema_frame)
+    for cut in range(1, len(delta_frame)):
+        with pytest.raises(BluetoothServerError):
+            deserializer.deserialize(delta_frame[:cut])
+    with pytest.raises(BluetoothServerError):
+        deserializer.deserialize(b"\x01\x01\x02\xff\xfe\x00")  # invalid UTF-8 field name
+
+    assert deserializer.deserialize(delta_frame) == {**reading, "temperature": 21.75}
@@ -0,0 +1,137 @@
+"""Unit tests for the fault-injecting transport."""
+
+from __future__ import annotations
+
+from typing import List, Optional
+
+import pytest
+
+from bluetooth_service.config import ServerSettings
+from bluetooth_service.exceptions import BluetoothServerError
+from bluetooth_service.faults import FaultInjectingSocketManager, LinkProfile
+from bluetooth_service.server import BluetoothServer
+
+
+class ScriptedSocketManager:
+    """Server-side stand-in returning queued reads and recording replies."""
+
+    def __init__(self, reads: List[bytes]) -> None:
+        self.reads = reads
+        self.sent: List[str] = []
+        self.closed = False
+
+    def open_server(self) -> None:
+        return None
+
+    def bind_and_listen(self, host: str, backlog: int, port: Optional[int] = None) -> int:
+        return 1
+
+    def advertise(self, service_name: str, service_id: str, advertise_profile: bool = True) -> None:
+        return None
+
+    def accept(self, timeout: Optional[float] = None) -> None:
+        return None
+
+    def receive(self, buffer_size: int, timeout: Optional[float] = None) -> bytes:
+        return self.reads.pop(0)
+
+    def send(self, payload: str) -> None:
+        self.sent.append(payload)
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class EchoDeserializer:
+    def deserialize(self, payload: bytes) -> bytes:
+        return payload
+
+
+class ListSink:
+    def __init__(self) -> None:
+        self.items: List[bytes] = []
+
+    def persist(self, obj: bytes) -> None:
+        self.items.append(obj)
+
+
+def make_server(transport: FaultInjectingSocketManager, **settings: object) -> tuple[BluetoothServer, ListSink]:
+    sink = ListSink()
+    server = BluetoothServer(
+        ServerSettings(**settings),  # type: ignore[arg-type]
+        deserializer=EchoDeserializer(),
+        sink=sink,
+        socket_manager=transport,  # type: ignore[arg-type]
+    )
+    server.start()
+    return server, sink
+
+
+def heal_after_first_read(transport: FaultInjectingSocketManager) -> None:
+    """Apply the configured faults to the first read only."""
+    original_receive = transport.receive
+
+    def receive(buffer_size: int, timeout: Optional[float] = None) -> bytes:
+        data = original_receive(buffer_size, timeout)
+        transport.profile = LinkProfile()
+        return data
+
+    transport.receive = receive  # type: ignore[method-assign]
+
+
+def test_lost_read_triggers_empty_buffer_resend() -> None:
+    inner = ScriptedSocketManager([b"5:hello", b"5:hello"])
+    transport = FaultInjectingSocketManager(inner, LinkProfile(loss_rate=1.0))
+    heal_after_first_read(transport)
+    server, sink = make_server(transport)
+
+    server.receive_once()
+
+    assert inner.sent == ["EmptyBufferResend", "DataReceived"]
+    assert sink.items == [b"hello"]
+    assert transport.injected["losses"] == 1
+
+
+@pytest.mark.parametrize("seed", range(20))  # some seeds cut inside the length prefix
+def test_fragmented_reads_are_reassembled(seed: int) -> None:
+    inner = ScriptedSocketManager([b"11:hello world"])
+    transport = FaultInjectingSocketManager(inner, LinkProfile(fragment_rate=1.0, seed=seed))
+    server, sink = make_server(transport, reassemble_frames=True)
+
+    server.receive_once()
+
+    assert sink.items == [b"hello world"]
+    assert inner.sent == ["DataReceived"]
+    assert transport.injected["fragmentations"] == 1
+
+
+def test_truncated_read_triggers_corrupt_resend() -> None:
+    inner = ScriptedSocketManager([b"11:hello world", b"11:hello world"])
+    transport = FaultInjectingSocketManager(inner, LinkProfile(truncate_rate=1.0, seed=3))
+    heal_after_first_read(transport)
+    server, sink = make_server(transport)
+
+    server.receive_once()
+
+    assert inner.sent == ["CorruptedBufferResend", "DataReceived"]
+    assert sink.items == [b"hello world"]
+
+
+def test_disconnect_closes_link_and_raises() -> None:
+    inner = ScriptedSocketManager([b"5:hello"])
+    transport = FaultInjectingSocketManager(inner, LinkProfile(disconnect_rate=1.0))
+    server, _ = make_server(transport)
+
+    with pytest.raises(BluetoothServerError):
+        server.receive_once()
+    assert inner.closed
+
+
+def test_same_seed_injects_same_faults() -> None:
+    profile = LinkProfile(loss_rate=0.3, truncate_rate=0.3, fragment_rate=0.3, seed=42)
+
+    def run() -> List[bytes]:
+        transport = FaultInjectingSocketManager(ScriptedSocketManager([b"10:0123456789"] * 20), profile)
+        return [transport.receive(64) for _ in range(20)]
+
+    assert run() == run()
@@ -0,0 +1,242 @@
+"""Unit tests for the heartbeat, dead-peer detection and idle connection handling."""
+
+from __future__ import annotations
+
+import pickle
+import threading
+import time
+from typing import Any, List
+
+import pytest
+
+from bluetooth_service.client import BluetoothClient
+from bluetooth_service.client_config import ClientSettings
+from bluetooth_service.config import ServerSettings
+from bluetooth_service.exceptions import BluetoothServerError
+from bluetooth_service.framing import encode_frame
+from bluetooth_service.heartbeat import LinkHealth, ping_frame
+from bluetooth_service.loopback import (
+    LoopbackClientSocketManager,
+    LoopbackListener,
+    LoopbackServerSocketManager,
+)
+from bluetooth_service.serializers import PickleDeserializer, PickleSerializer
+from bluetooth_service.server import BluetoothServer
+from bluetooth_service.storage import NullSink
+
+
+def make_pair(
+    server_settings: ServerSettings,
+    client_settings: ClientSettings,
+) -> tuple[BluetoothServer, BluetoothClient]:
+    listener = LoopbackListener()
+    server = BluetoothServer(
+        server_settings,
+        deserializer=PickleDeserializer(),
+        sink=NullSink(),
+        socket_manager=LoopbackServerSocketManager(listener),
+    )
+    client = BluetoothClient(
+        client_settings,
+        serializer=PickleSerializer(),
+        socket_manager=LoopbackClientSocketManager(listener),
+    )
+    return server, client
+
+
+def test_link_health_tracks_rtt_and_loss() -> None:
+    health = LinkHealth()
+    health.on_pong(0.010)
+    health.on_loss()
+    health.on_pong(0.030)
+
+    snapshot = health.snapshot()
+
+    assert snapshot["min_rtt_ms"] == pytest.approx(10.0)
+    assert snapshot["max_rtt_ms"] == pytest.approx(30.0)
+    assert snapshot["loss_ratio"] == pytest.approx(1 / 3)
+    assert health.missed == 0
+
+
+def test_idle_client_pings_are_answered_in_band() -> None:
+    server, client = make_pair(ServerSettings(), ClientSettings(heartbeat_interval_seconds=0.02))
+    received: List[Any] = []
+
+    def serve() -> None:
+        server.start()
+        received.append(server.receive_once())
+        server.stop()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    client.start()
+    time.sleep(0.2)
+    client.send_object({"after": "heartbeats"})
+    client.stop()
+    thread.join(timeout=5)
+
+    assert received == [{"after": "heartbeats"}]
+    assert server.metrics.snapshot()["pings_received"] >= 2
+    client_metrics = client.metrics.snapshot()
+    assert client_metrics["heartbeat_pings"] >= 2
+    assert client_metrics["heartbeat_loss_ratio"] == 0
+    assert client_metrics["heartbeat_srtt_ms"] > 0
+
+
+def test_unresponsive_peer_is_declared_dead() -> None:
+    server, client = make_pair(
+        ServerSettings(),
+        ClientSettings(heartbeat_interval_seconds=0.01, heartbeat_timeout_seconds=0.02, heartbeat_max_missed=2),
+    )
+    # Nothing ever accepts the connection, so pings go unanswered.
+    client.start()
+    deadline = time.monotonic() + 2
+    while client.peer_alive and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert not client.peer_alive
+    assert client.metrics.snapshot()["dead_peers"] == 1
+    assert client.metrics.snapshot()["heartbeat_pings_lost"] == 2
+    with pytest.raises(BluetoothServerError):
+        client.send_object({"too": "late"})
+    client.stop()
+
+
+def test_ack_wait_is_bounded_by_heartbeat_timeout() -> None:
+    server, client = make_pair(
+        ServerSettings(),
+        ClientSettings(heartbeat_interval_seconds=10.0, heartbeat_timeout_seconds=0.02, heartbeat_max_missed=2),
+    )
+    # The payload is never read, let alone acknowledged.
+    client.start()
+    started = time.monotonic()
+
+    with pytest.raises(BluetoothServerError):
+        client.send_object({"never": "acknowledged"})
+
+    assert time.monotonic() - started < 1.0
+    assert not client.peer_alive
+    assert client.metrics.snapshot()["dead_peers"] == 1
+    client.stop()
+
+
+def test_data_sharing_a_read_with_a_late_ping_is_kept() -> None:
+    settings = ServerSettings()
+    listener = LoopbackListener()
+    server = BluetoothServer(
+        settings,
+        deserializer=PickleDeserializer(),
+        sink=NullSink(),
+        socket_manager=LoopbackServerSocketManager(listener),
+    )
+    received: List[Any] = []
+
+    def serve() -> None:
+        server.start()
+        received.append(server.receive_once())
+        server.stop()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    sock = listener.connect()
+    sock.settimeout(5)
+    sock.sendall(ping_frame(settings.ping_message, 12) + encode_frame(pickle.dumps({"after": "ping"})))
+    expected = f"{settings.pong_message}:12;{settings.acknowledge_message}".encode()
+    replies = b""
+    while len(replies) < len(expected):
+        replies += sock.recv(64)
+    thread.join(timeout=5)
+    sock.close()
+
+    assert replies == expected
+    assert received == [{"after": "ping"}]
+
+
+class ScriptedSocketManager:
+    """Client transport replaying canned server reads."""
+
+    def __init__(self, reads: List[bytes]) -> None:
+        self.reads = reads
+        self.sent: List[bytes] = []
+
+    def discover(self) -> None:
+        pass
+
+    def connect(self) -> None:
+        pass
+
+    def send(self, payload: Any) -> None:
+        self.sent.append(bytes(payload))
+
+    def receive(self, buffer_size: int, timeout: Any = None) -> bytes:
+        if not self.reads:
+            raise BluetoothServerError("Unable to receive data")
+        return self.reads.pop(0)
+
+    def close(self) -> None:
+        pass
+
+
+def test_late_pong_sharing_a_read_with_the_ack_is_split_off() -> None:
+    transport = ScriptedSocketManager([b"Pong:1;DataReceived"])
+    client = BluetoothClient(ClientSettings(), serializer=PickleSerializer(), socket_manager=transport)
+    client.start()
+
+    client.send_object({"after": "late pong"})
+
+    assert client.peer_alive
+    assert client.metrics.snapshot()["payloads_sent"] == 1
+
+
+def test_coalesced_pongs_are_matched_one_by_one() -> None:
+    transport = ScriptedSocketManager([b"Pong:1;Pong:", b"2;"])
+    client = BluetoothClient(
+        ClientSettings(heartbeat_timeout_seconds=1.0),
+        serializer=PickleSerializer(),
+        socket_manager=transport,
+    )
+    client.start()
+    client._ping_sequence = 1  # ping 1 timed out; its pong arrives with pong 2
+
+    client._ping()
+
+    assert client.link_health.snapshot()["pings"] == 1
+    assert client.link_health.snapshot()["pings_lost"] == 0
+
+
+def test_server_closes_connection_idle_despite_heartbeats() -> None:
+    server, client = make_pair(
+        ServerSettings(idle_timeout_seconds=0.15, peer_timeout_seconds=1.0),
+        ClientSettings(heartbeat_interval_seconds=0.02),
+    )
+    errors: List[BaseException] = []
+
+    def serve() -> None:
+        server.start()
+        try:
+            server.receive_once()
+        except BluetoothServerError as exc:
+            errors.append(exc)
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    client.start()
+    thread.join(timeout=5)
+    client.stop()
+
+    assert len(errors) == 1
+    snapshot = server.metrics.snapshot()
+    assert snapshot["idle_disconnects"] == 1 and snapshot["dead_peers"] == 0
+    assert snapshot["pings_received"] >= 2
+
+
+def test_server_detects_silent_peer() -> None:
+    server, client = make_pair(ServerSettings(peer_timeout_seconds=0.05), ClientSettings())
+    client.start()
+    server.start()
+
+    with pytest.raises(BluetoothServerError):
+        server.receive_once()
+    client.stop()
+
+    assert server.metrics.snapshot()["dead_peers"] == 1
@@ -0,0 +1,119 @@
+"""Unit tests for the logging helpers."""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Iterator, List
+
+import pytest
+
+from bluetooth_service.logging_utils import (
+    JsonFormatter,
+    RateLimitFilter,
+    configure_logging,
+    enable_queue_logging,
+)
+
+
+class ListHandler(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: List[logging.LogRecord] = []
+        self.threads: List[str] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.records.append(record)
+        self.threads.append(threading.current_thread().name)
+
+
+@pytest.fixture
+def root_handler() -> Iterator[ListHandler]:
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    handler = ListHandler()
+    root.handlers[:] = [handler]
+    root.setLevel(logging.DEBUG)
+    yield handler
+    root.handlers[:] = saved_handlers
+    root.setLevel(saved_level)
+
+
+def test_json_formatter_includes_structured_fields() -> None:
+    record = logging.LogRecord("bluetooth_service.server", logging.WARNING, __file__, 1, "Lost %s", ("frame",), None)
+    record.connection_id = "42-1"
+    record.sequence = 7
+
+    document = json.loads(JsonFormatter().format(record))
+
+    assert document["msg"] == "Lost frame"
+    assert document["level"] == "WARNING"
+    assert (document["connection_id"], document["sequence"]) == ("42-1", 7)
+    assert "peer" not in document
+
+
+def test_rate_limit_filter_collapses_storms() -> None:
+    rate_limit = RateLimitFilter(burst=2, interval_seconds=60.0)
+
+    def warn(reply: str) -> bool:
+        record = logging.LogRecord("client", logging.WARNING, __file__, 1, "Retransmit: %s", (reply,), None)
+        return rate_limit.filter(record)
+
+    assert [warn(f"reply-{index}") for index in range(5)] == [True, True, False, False, False]
+    info = logging.LogRecord("client", logging.INFO, __file__, 1, "Retransmit: %s", ("x",), None)
+    assert rate_limit.filter(info)
+
+    rate_limit._interval = 0.0  # next record opens a new window
+    record = logging.LogRecord("client", logging.WARNING, __file__, 1, "Retransmit: %s", ("y",), None)
+    assert rate_limit.filter(record)
+    assert record.suppressed == 3
+
+
+def test_queue_logging_emits_on_listener_thread(root_handler: ListHandler) -> None:
+    listener = enable_queue_logging()
+    try:
+        logging.getLogger("bluetooth_service.test").info("Payload %s", 1, extra={"connection_id": "c"})
+    finally:
+        listener.stop()
+
+    assert [record.getMessage() for record in root_handler.records] == ["Payload 1"]
+    assert root_handler.records[0].connection_id == "c"
+    assert root_handler.threads != [threading.current_thread().name]
+
+
+def test_queue_logging_reconfiguration_replaces_listener(root_handler: ListHandler) -> None:
+    first = enable_queue_logging()
+    second = enable_queue_logging()
+    try:
+        logging.getLogger("bluetooth_service.test").info("Once")
+    finally:
+        second.stop()
+
+    assert first is not second
+    assert len(logging.getLogger().handlers) == 1
+    assert [record.getMessage() for record in root_handler.records] == ["Once"]
+
+
+def test_structured_config_rate_limits_each_handler_alike(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    config_path = Path(__file__).resolve().parents[1] / "configLogger.structured.json"
+    monkeypatch.chdir(tmp_path)  # the file handler writes info.log relative to the cwd
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    configure_logging(str(config_path), env_key=None)
+    try:
+        for index in range(8):
+            logging.getLogger("bluetooth_service.client").warning("Retransmit: %s", index)
+    finally:
+        for handler in root.handlers:
+            handler.close()
+        root.handlers[:] = saved_handlers
+        root.setLevel(saved_level)
+
+    console_lines = capsys.readouterr().out.splitlines()
+    file_lines = (tmp_path / "info.log").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["msg"] for line in console_lines] == [f"Retransmit: {index}" for index in range(5)]
+    assert file_lines == console_lines
@@ -0,0 +1,154 @@
+"""Unit tests for the durable client outbox and server-side deduplication."""
+
+from __future__ import annotations
+
+import json
+import threading
+from pathlib import Path
+from typing import Any, List
+
+from bluetooth_service.client import BluetoothClient
+from bluetooth_service.config import ServerSettings
+from bluetooth_service.exceptions import BluetoothServerError
+from bluetooth_service.interfaces import DataSink
+from bluetooth_service.loopback import (
+    LoopbackClientSocketManager,
+    LoopbackListener,
+    LoopbackServerSocketManager,
+)
+from bluetooth_service.outbox import Outbox, WriteAheadLog
+from bluetooth_service.serializers import PickleDeserializer, PickleSerializer
+from bluetooth_service.sdk import default_codec_and_sink
+from bluetooth_service.server import BluetoothServer
+from bluetooth_service.storage import DeduplicatingSink
+
+
+class ListSink(DataSink):
+    def __init__(self) -> None:
+        self.items: List[Any] = []
+
+    def persist(self, obj: Any) -> None:
+        self.items.append(obj)
+
+
+class FlakyClient:
+    """Stands in for a started client whose link drops after `limit` sends."""
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.sent: List[bytes] = []
+
+    def send_payload(self, payload: bytes) -> None:
+        if len(self.sent) >= self.limit:
+            raise BluetoothServerError("Failed to send data")
+        self.sent.append(bytes(payload))
+
+
+def test_wal_rolls_segments_and_truncates_after_ack(tmp_path: Path) -> None:
+    wal = WriteAheadLog(str(tmp_path), segment_bytes=64, fsync=False)
+    for index in range(10):
+        assert wal.append(b"payload-%d" % index) == index + 1
+    assert len(list(tmp_path.glob("*.wal"))) > 1
+
+    assert [bytes(payload) for _, payload in wal.read(after=3, limit=2)] == [b"payload-3", b"payload-4"]
+
+    wal.acknowledge(6)
+    assert wal.pending == 4
+    assert [sequence for sequence, _ in wal.read(after=wal.acked, limit=100)] == [7, 8, 9, 10]
+    wal.acknowledge(10)
+    assert not list(tmp_path.glob("*.wal"))
+
+    wal.close()
+    reopened = WriteAheadLog(str(tmp_path), fsync=False)
+    assert reopened.pending == 0
+    assert reopened.append(b"next") == 11
+
+
+def test_wal_recovery_cuts_torn_tail(tmp_path: Path) -> None:
+    wal = WriteAheadLog(str(tmp_path), fsync=False)
+    wal.append(b"first")
+    wal.append(b"second")
+    wal.close()
+    segment = next(tmp_path.glob("*.wal"))
+    segment.write_bytes(segment.read_bytes()[:-3])  # crash mid-write
+
+    reopened = WriteAheadLog(str(tmp_path), fsync=False)
+
+    assert [bytes(payload) for _, payload in reopened.read(after=0, limit=10)] == [b"first"]
+    assert reopened.append(b"again") == 2
+
+
+def test_drain_resumes_after_link_failure(tmp_path: Path) -> None:
+    outbox = Outbox(str(tmp_path), serializer=PickleSerializer(), batch_size=4, fsync=False)
+    for index in range(6):
+        outbox.put({"index": index})
+
+    assert outbox.drain(FlakyClient(limit=3)) == 3  # type: ignore[arg-type]
+    assert outbox.pending == 3
+
+    retry = FlakyClient(limit=100)
+    assert outbox.drain(retry) == 3  # type: ignore[arg-type]
+    assert [PickleDeserializer().deserialize(payload)["body"] for payload in retry.sent] == [
+        {"index": 3},
+        {"index": 4},
+        {"index": 5},
+    ]
+    assert outbox.pending == 0
+
+
+def test_deduplicating_sink_drops_redelivered_ids() -> None:
+    inner = ListSink()
+    sink = DeduplicatingSink(inner, capacity=2)
+
+    for message_id in ["a", "b", "b", "c", "a"]:
+        sink.persist({"message_id": message_id, "body": message_id.upper()})
+    sink.persist("not an envelope")
+
+    assert inner.items == ["A", "B", "C", "A", "not an envelope"]  # "a" aged out of the LRU
+    assert sink.duplicates == 1
+
+
+def test_default_sink_unwraps_envelopes_without_deduplication(tmp_path: Path) -> None:
+    target = tmp_path / "received.json"
+    deserializer, sink = default_codec_and_sink(ServerSettings(json_file=str(target)))
+    outbox = Outbox(str(tmp_path / "outbox"), serializer=PickleSerializer(), fsync=False)
+    outbox.put({"index": 1})
+    (_, payload), = outbox._wal.read(after=0, limit=1)
+
+    sink.persist(deserializer.deserialize(bytes(payload)))
+
+    assert json.loads(target.read_text(encoding="utf-8")) == {"index": 1}
+
+
+def test_outbox_delivers_over_loopback_exactly_once(tmp_path: Path) -> None:
+    listener = LoopbackListener()
+    persisted = ListSink()
+    server = BluetoothServer(
+        ServerSettings(),
+        deserializer=PickleDeserializer(),
+        sink=DeduplicatingSink(persisted),
+        socket_manager=LoopbackServerSocketManager(listener),
+    )
+    client = BluetoothClient(serializer=PickleSerializer(), socket_manager=LoopbackClientSocketManager(listener))
+    outbox = Outbox(str(tmp_path), serializer=PickleSerializer(), fsync=False)
+    for index in range(3):
+        outbox.put({"index": index})
+    # Simulate a crash after delivery but before the acknowledgement was recorded.
+    pending = [bytes(payload) for _, payload in outbox._wal.read(after=0, limit=10)]
+
+    def serve() -> None:
+        server.start()
+        for _ in range(len(pending) + 3):
+            server.receive_once()
+        server.stop()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    client.start()
+    for payload in pending:
+        client.send_payload(payload)
+    assert outbox.drain(client) == 3
+    client.stop()
+    thread.join(timeout=5)
+
+    assert persisted.items == [{"index": 0}, {"index": 1}, {"index": 2}]
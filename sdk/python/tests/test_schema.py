@@ -0,0 +1,60 @@
+"""Unit tests for the JSON Schema to struct codec compiler."""
+
+from __future__ import annotations
+
+import pytest
+
+from bluetooth_service.exceptions import BluetoothServerError
+from bluetooth_service.schema import (
+    StructDeserializer,
+    StructSerializer,
+    compile_schema,
+    load_schema_directory,
+)
+
+
+def test_bundled_schemas_round_trip() -> None:
+    registry = load_schema_directory()
+    assert {"SensorReading", "DeviceStatus"} <= set(registry.names())
+
+    deserializer = StructDeserializer(registry)
+    reading = {"timestamp": 1700000000.5, "sensor_id": 7, "temperature": 21.5, "humidity": 40.25, "battery_ok": True}
+    status = {"device_name": "RaspberryPi", "uptime_seconds": 3600, "battery_percent": 88, "rssi": -60}
+
+    encoded_reading = StructSerializer(registry.get("SensorReading")).serialize(reading)
+    encoded_status = StructSerializer(registry.get("DeviceStatus")).serialize(status)
+
+    assert len(encoded_reading) == registry.get("SensorReading").layout.size == 21
+    assert deserializer.deserialize(encoded_reading) == reading
+    assert deserializer.deserialize(encoded_status) == status
+
+
+def test_object_not_matching_schema_is_rejected() -> None:
+    codec = compile_schema(
+        {"title": "Tiny", "x-type-id": 9, "properties": {"value": {"type": "integer", "format": "uint8"}}}
+    )
+
+    with pytest.raises(BluetoothServerError):
+        StructSerializer(codec).serialize({"value": 300})
+    with pytest.raises(BluetoothServerError):
+        StructSerializer(codec).serialize({})
+
+
+def test_strings_longer_than_their_field_are_rejected() -> None:
+    registry = load_schema_directory()
+    serializer = StructSerializer(registry.get("DeviceStatus"))
+    status = {"device_name": "a" + "\u00e9" * 8, "uptime_seconds": 1, "battery_percent": 1, "rssi": 0}
+
+    with pytest.raises(BluetoothServerError):
+        serializer.serialize(status)
+
+    # A payload cut inside a multi-byte character (e.g. by an older encoder).
+    corrupted = bytearray(StructSerializer(registry.get("DeviceStatus")).serialize({**status, "device_name": "ok"}))
+    corrupted[2:4] = b"\xc3\x00"
+    with pytest.raises(BluetoothServerError):
+        StructDeserializer(registry).deserialize(bytes(corrupted))
+
+
+def test_variable_length_fields_are_not_compiled() -> None:
+    with pytest.raises(BluetoothServerError):
+        compile_schema({"title": "Bad", "x-type-id": 3, "properties": {"note": {"type": "string"}}})
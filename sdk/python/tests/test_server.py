@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass
 from typing import Any, List, Optional, Tuple
 
 import pytest
 
 from bluetooth_service.config import ServerSettings
+from bluetooth_service.exceptions import BluetoothServerError
 from bluetooth_service.server import BluetoothServer
 
 
@@ -114,3 +116,58 @@ def test_server_requests_retry_on_corrupt_payload() -> None:
     assert socket_manager.sent_messages[-1] == b"DataReceived"
     assert sink.persisted == [{"message": "data"}]
 
+
+class EchoDeserializer:
+    def deserialize(self, payload: bytes) -> bytes:
+        return payload
+
+
+@pytest.mark.parametrize(
+    "reads",
+    [
+        [b"1", b"3:payload-bytes"],  # split inside the length prefix
+        [b"13", b":payload", b"-bytes"],  # split at the separator
+        [b"13:pay", b"load-bytes"],
+    ],
+)
+def test_reassembling_server_handles_frames_split_anywhere(reads: List[bytes]) -> None:
+    socket_manager = StubSocketManager(payloads=list(reads))
+    sink = StubSink()
+    server = BluetoothServer(
+        ServerSettings(reassemble_frames=True),
+        deserializer=EchoDeserializer(),
+        sink=sink,
+        socket_manager=socket_manager,
+    )
+
+    server.start()
+    server.receive_once()
+
+    assert sink.persisted == [b"payload-bytes"]
+    assert socket_manager.sent_messages == [b"DataReceived"]
+
+
+class TimingOutSocketManager(StubSocketManager):
+    """An empty script entry fails the read after the timeout, as PyBluez does: no ``TimeoutError`` cause."""
+
+    def receive(self, buffer_size: int, timeout: Optional[float] = None) -> bytes:
+        payload = self.payloads.pop(0)
+        if payload:
+            return payload
+        time.sleep(timeout or 0)
+        raise BluetoothServerError("Unable to receive data", cause=OSError("timed out"))
+
+
+def test_reassembly_timeout_requests_resend_whatever_the_transport_raises() -> None:
+    socket_manager = TimingOutSocketManager(payloads=[b"13:pay", b"", b"4:data"])
+    server = BluetoothServer(
+        ServerSettings(reassemble_frames=True, receive_timeout=0.05),
+        deserializer=EchoDeserializer(),
+        sink=StubSink(),
+        socket_manager=socket_manager,
+    )
+
+    server.start()
+    assert server.receive_once() == b"data"
+
+    assert socket_manager.sent_messages == [b"CorruptedBufferResend", b"DataReceived"]
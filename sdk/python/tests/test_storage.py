@@ -0,0 +1,41 @@
+"""Unit tests for the storage adapters."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from bluetooth_service.exceptions import BluetoothServerError
+from bluetooth_service.serializers import PassthroughDeserializer, PassthroughSerializer
+from bluetooth_service.storage import RawFileSink, RawFileSource
+
+
+@pytest.mark.parametrize("use_mmap", [False, True])
+def test_raw_passthrough_copies_file_bytes_unchanged(tmp_path: Path, use_mmap: bool) -> None:
+    source_path = tmp_path / "source.json"
+    target_path = tmp_path / "target.json"
+    source_path.write_bytes(b'{\n  "DeviceName": "RasperberryPi"\n}\n')
+
+    payload = PassthroughSerializer().serialize(RawFileSource(str(source_path), use_mmap=use_mmap).load())
+    framed = f"{len(payload)}:".encode("utf-8") + payload
+    received = PassthroughDeserializer().deserialize(framed.partition(b":")[2])
+    RawFileSink(str(target_path)).persist(received)
+
+    assert target_path.read_bytes() == source_path.read_bytes()
+
+
+def test_raw_sink_validation_modes(tmp_path: Path) -> None:
+    target = str(tmp_path / "out.json")
+
+    with pytest.raises(BluetoothServerError):
+        RawFileSink(target).persist(b"not json")
+    with pytest.raises(BluetoothServerError):
+        RawFileSink(target, validation="strict").persist(b'{"broken": }')
+
+    with pytest.raises(BluetoothServerError):
+        RawFileSink(target).persist(b" \n\t ")
+
+    RawFileSink(target).persist(memoryview(b'\n  {"ok": true} \r\n'))
+    RawFileSink(target, validation="none").persist(b"not json")
+    assert Path(target).read_bytes() == b"not json"
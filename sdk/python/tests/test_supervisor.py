@@ -0,0 +1,154 @@
+"""Unit tests for the pre-fork server supervisor."""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Any, List, Optional
+
+from bluetooth_service.config import ServerSettings
+from bluetooth_service.exceptions import BluetoothServerError
+from bluetooth_service.metrics import ServerMetrics, merge_snapshots
+from bluetooth_service.server import BluetoothServer
+from bluetooth_service.supervisor import ServerSupervisor
+
+
+class OneShotSocketManager:
+    """Accepts a single connection carrying one payload, then fails to accept."""
+
+    def __init__(self) -> None:
+        self.payloads: List[bytes] = [b"4:data"]
+        self.accepted = False
+
+    def open_server(self) -> None:
+        pass
+
+    def bind_and_listen(self, host: str, backlog: int, port: Optional[int] = None) -> int:
+        return port or 1
+
+    def advertise(self, service_name: str, service_id: str, advertise_profile: bool = True) -> None:
+        pass
+
+    def accept(self, timeout: Optional[float] = None) -> None:
+        if self.accepted:
+            raise BluetoothServerError("Unable to accept connection")
+        self.accepted = True
+
+    def receive(self, buffer_size: int, timeout: Optional[float] = None) -> bytes:
+        if not self.payloads:
+            raise BluetoothServerError("Unable to receive data")
+        return self.payloads.pop(0)
+
+    def send(self, payload: Any) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class NullDeserializer:
+    def deserialize(self, payload: bytes) -> Any:
+        return payload
+
+
+class NullSink:
+    def persist(self, obj: Any) -> None:
+        pass
+
+
+def stub_factory(settings: ServerSettings, metrics: ServerMetrics) -> BluetoothServer:
+    return BluetoothServer(
+        settings,
+        deserializer=NullDeserializer(),
+        sink=NullSink(),
+        socket_manager=OneShotSocketManager(),
+        metrics=metrics,
+    )
+
+
+class StallingSocketManager(OneShotSocketManager):
+    """Delivers one payload, then blocks in recv() (after touching `marker`) until killed."""
+
+    def __init__(self, marker: Path) -> None:
+        super().__init__()
+        self.marker = marker
+
+    def receive(self, buffer_size: int, timeout: Optional[float] = None) -> bytes:
+        if self.payloads:
+            return self.payloads.pop(0)
+        self.marker.touch()
+        time.sleep(3600)
+        raise AssertionError("worker was not terminated")
+
+
+def test_worker_publishes_final_metrics_when_terminated(tmp_path: Path) -> None:
+    marker = tmp_path / "stalled"
+
+    def factory(settings: ServerSettings, metrics: ServerMetrics) -> BluetoothServer:
+        return BluetoothServer(
+            settings,
+            deserializer=NullDeserializer(),
+            sink=NullSink(),
+            socket_manager=StallingSocketManager(marker),
+            metrics=metrics,
+        )
+
+    # Periodic snapshots are too rare to arrive; only the final one can.
+    supervisor = ServerSupervisor(ServerSettings(metrics_interval_seconds=60.0), server_factory=factory)
+    supervisor.start()
+    try:
+        deadline = time.monotonic() + 10
+        while not marker.exists() and time.monotonic() < deadline:
+            time.sleep(0.02)
+    finally:
+        supervisor.stop()
+
+    assert supervisor.metrics()["payloads_received"] == 1
+
+
+def test_worker_settings_shard_channels() -> None:
+    supervisor = ServerSupervisor(
+        ServerSettings(worker_channels=(3, 4, 5)),
+        server_factory=stub_factory,
+    )
+
+    assert [status["channel"] for status in supervisor.worker_status()] == [3, 4, 5]
+
+
+def test_supervisor_restarts_workers_and_aggregates_metrics() -> None:
+    supervisor = ServerSupervisor(
+        ServerSettings(
+            worker_channels=(3, 4),
+            worker_restart_backoff_seconds=0.0,
+            metrics_interval_seconds=0.05,
+        ),
+        server_factory=stub_factory,
+    )
+
+    supervisor.start()
+    try:
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline:
+            supervisor.monitor()
+            restarted = all(status["restarts"] >= 1 for status in supervisor.worker_status())
+            if restarted and supervisor.metrics().get("payloads_received", 0) >= 4:
+                break
+            time.sleep(0.05)
+    finally:
+        supervisor.stop()
+
+    assert all(status["restarts"] >= 1 for status in supervisor.worker_status())
+    assert supervisor.metrics()["payloads_received"] >= 4
+
+
+def test_gauges_are_not_summed_across_workers() -> None:
+    workers = [ServerMetrics(), ServerMetrics()]
+    for metrics in workers:
+        metrics.increment("payloads_received")
+        metrics.set("buffer_size", 1024)
+
+    merged = merge_snapshots(metrics.counters() for metrics in workers)
+
+    assert merged["payloads_received"] == 2
+    assert "buffer_size" not in merged
+    assert workers[0].snapshot()["buffer_size"] == 1024
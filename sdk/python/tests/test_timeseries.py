@@ -0,0 +1,83 @@
+"""Unit tests for the columnar time-series sink and reader."""
+
+from __future__ import annotations
+
+import json
+import math
+from pathlib import Path
+
+from bluetooth_service.timeseries import ColumnarTimeSeriesSink, TimeSeriesReader
+
+
+def _reading(timestamp: float, sensor: str, temperature: float) -> dict:
+    return {"timestamp": timestamp, "sensor_id": sensor, "temperature": temperature, "humidity": 40.0}
+
+
+def test_sink_flushes_segments_and_reader_filters_by_time(tmp_path: Path) -> None:
+    sink = ColumnarTimeSeriesSink(
+        str(tmp_path),
+        value_fields=("temperature", "humidity"),
+        flush_rows=3,
+        flush_interval_seconds=None,
+    )
+    # Out-of-order arrivals are sorted within a segment.
+    sink.persist(_reading(3.0, "a", 23.0))
+    sink.persist(_reading(1.0, "a", 21.0))
+    sink.persist(_reading(2.0, "b", 22.0))
+    sink.persist([_reading(10.0, "a", 30.0), {"timestamp": 11.0, "sensor_id": "b"}])
+    sink.close()
+
+    index = json.loads((tmp_path / "index.json").read_text())
+    assert [segment["rows"] for segment in index["segments"]] == [3, 2]
+
+    reader = TimeSeriesReader(str(tmp_path))
+    rows = list(reader.query(1.5, 10.0))
+    assert [row["timestamp"] for row in rows] == [2.0, 3.0, 10.0]
+    assert rows[0] == {"timestamp": 2.0, "sensor_id": "b", "temperature": 22.0, "humidity": 40.0}
+
+    only_b = list(reader.query(sensor_id="b"))
+    assert [row["timestamp"] for row in only_b] == [2.0, 11.0]
+    assert math.isnan(only_b[1]["temperature"])
+
+
+def test_rollups_average_readings_per_bucket(tmp_path: Path) -> None:
+    sink = ColumnarTimeSeriesSink(
+        str(tmp_path),
+        value_fields=("temperature",),
+        flush_interval_seconds=None,
+        rollup_seconds=10.0,
+    )
+    sink.persist([_reading(1.0, "a", 20.0), _reading(5.0, "a", 24.0), _reading(12.0, "a", 30.0)])
+    sink.flush()
+
+    rollups = list(TimeSeriesReader(str(tmp_path)).query(rollup=True))
+    assert rollups == [
+        {"timestamp": 0.0, "sensor_id": "a", "temperature": 22.0, "temperature_count": 2.0, "count": 2.0},
+        {"timestamp": 10.0, "sensor_id": "a", "temperature": 30.0, "temperature_count": 1.0, "count": 1.0},
+    ]
+
+
+def test_rollups_skip_missing_values_and_merge_across_flushes(tmp_path: Path) -> None:
+    sink = ColumnarTimeSeriesSink(
+        str(tmp_path),
+        value_fields=("temperature", "humidity"),
+        flush_interval_seconds=None,
+        rollup_seconds=10.0,
+    )
+    sink.persist([_reading(1.0, "a", 20.0), {"timestamp": 2.0, "sensor_id": "a", "humidity": 50.0}])
+    sink.flush()
+    sink.persist(_reading(3.0, "a", 26.0))
+    sink.flush()
+
+    rollups = list(TimeSeriesReader(str(tmp_path)).query(rollup=True))
+    assert rollups == [
+        {
+            "timestamp": 0.0,
+            "sensor_id": "a",
+            "temperature": 23.0,
+            "humidity": 130.0 / 3,
+            "temperature_count": 2.0,
+            "humidity_count": 3.0,
+            "count": 3.0,
+        }
+    ]
@@ -0,0 +1,135 @@
+"""Unit tests for traffic recording and replay."""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+
+import pytest
+
+from bluetooth_service.cli import main
+from bluetooth_service.client import BluetoothClient
+from bluetooth_service.config import ServerSettings
+from bluetooth_service.loopback import (
+    LoopbackClientSocketManager,
+    LoopbackListener,
+    LoopbackServerSocketManager,
+)
+from bluetooth_service.serializers import PickleDeserializer, PickleSerializer
+from bluetooth_service.server import BluetoothServer
+from bluetooth_service.storage import NullSink
+from bluetooth_service.traffic import (
+    CLIENT_TO_SERVER,
+    SERVER_TO_CLIENT,
+    RecordingSocketManager,
+    TrafficRecord,
+    TrafficRecorder,
+    read_traffic,
+    replay_traffic,
+)
+
+
+def record_session(path: Path, messages: int) -> None:
+    listener = LoopbackListener()
+    recorder = TrafficRecorder(str(path))
+    server = BluetoothServer(
+        ServerSettings(),
+        deserializer=PickleDeserializer(),
+        sink=NullSink(),
+        socket_manager=RecordingSocketManager(LoopbackServerSocketManager(listener), recorder, role="server"),
+    )
+    client = BluetoothClient(serializer=PickleSerializer(), socket_manager=LoopbackClientSocketManager(listener))
+
+    def serve() -> None:
+        server.start()
+        for _ in range(messages):
+            server.receive_once()
+        server.stop()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    client.start()
+    for index in range(messages):
+        client.send_object({"index": index})
+    client.stop()
+    thread.join(timeout=5)
+    recorder.close()
+
+
+def test_recorder_captures_both_directions(tmp_path: Path) -> None:
+    log = tmp_path / "session.ubtr"
+    record_session(log, messages=3)
+
+    records = list(read_traffic(str(log)))
+
+    assert [record.direction for record in records] == [CLIENT_TO_SERVER, SERVER_TO_CLIENT] * 3
+    assert {record.connection for record in records} == {1}
+    assert records[1].data == b"DataReceived"
+    assert records[0].timestamp <= records[-1].timestamp
+
+
+def test_truncated_log_keeps_complete_records(tmp_path: Path) -> None:
+    log = tmp_path / "session.ubtr"
+    record_session(log, messages=2)
+    log.write_bytes(log.read_bytes()[:-4])
+
+    assert len(list(read_traffic(str(log)))) == 3
+
+
+def test_replay_simulates_concurrent_clients(tmp_path: Path) -> None:
+    log = tmp_path / "session.ubtr"
+    record_session(log, messages=20)
+
+    report = replay_traffic(read_traffic(str(log)), speed=None, multiplier=4)
+
+    assert report["connections"] == 4
+    assert report["messages"] == 80
+    assert report["errors"] == 0
+    assert 0 < report["p50 ms"] <= report["p99 ms"] <= report["max ms"]
+
+
+def test_replay_answers_pings_between_frames() -> None:
+    records = [
+        TrafficRecord(0.0, 1, CLIENT_TO_SERVER, b"Ping:1"),
+        TrafficRecord(0.01, 1, CLIENT_TO_SERVER, b"5:hello"),
+    ]
+
+    report = replay_traffic(records, speed=None, codec="raw")
+
+    assert report["messages"] == 1
+    assert report["errors"] == 0
+
+
+def test_replay_follows_resent_frames() -> None:
+    records = [
+        TrafficRecord(0.0, 1, CLIENT_TO_SERVER, b"13:payl"),
+        TrafficRecord(0.1, 1, SERVER_TO_CLIENT, b"CorruptedBufferResend"),
+        TrafficRecord(0.1, 1, CLIENT_TO_SERVER, b"13:payload-bytes"),
+        TrafficRecord(0.1, 1, SERVER_TO_CLIENT, b"DataReceived"),
+    ]
+    settings = ServerSettings(reassemble_frames=True, receive_timeout=0.1)
+
+    report = replay_traffic(records, speed=None, codec="raw", settings=settings)
+
+    assert report["messages"] == 1
+    assert report["resends"] == 1
+    assert report["errors"] == 0
+
+
+def test_replay_counts_rejected_frames_as_errors() -> None:
+    records = [TrafficRecord(0.0, 1, CLIENT_TO_SERVER, b"5:hello")]
+
+    report = replay_traffic(records, speed=None, codec="pickle", settings=ServerSettings(receive_timeout=0.5))
+
+    assert report["messages"] == 0
+    assert report["errors"] >= 1
+
+
+def test_replay_cli_prints_report(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    log = tmp_path / "session.ubtr"
+    record_session(log, messages=5)
+
+    assert main(["replay", str(log), "--speed", "10", "--multiplier", "2"]) == 0
+
+    output = capsys.readouterr().out
+    assert "messages/s" in output and "p95 ms" in output
@@ -0,0 +1,77 @@
+"""Unit tests for AIMD link tuning and chunked sends with reassembly."""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, List
+
+from bluetooth_service.client import BluetoothClient
+from bluetooth_service.client_config import ClientSettings
+from bluetooth_service.config import ServerSettings
+from bluetooth_service.loopback import (
+    LoopbackClientSocketManager,
+    LoopbackListener,
+    LoopbackServerSocketManager,
+)
+from bluetooth_service.serializers import PassthroughDeserializer, PassthroughSerializer
+from bluetooth_service.server import BluetoothServer
+from bluetooth_service.tuning import AdaptiveLinkTuner
+
+
+def test_tuner_grows_additively_and_backs_off_multiplicatively() -> None:
+    tuner = AdaptiveLinkTuner(initial_size=256, min_size=256, max_size=1024, increase_step=128)
+
+    for _ in range(10):
+        tuner.on_ack(1000, 0.01)
+    assert tuner.size == 1024  # clamped at the upper bound
+
+    tuner.on_resend()
+    assert tuner.size == 512
+    assert tuner.snapshot()["resends"] == 1
+
+
+def test_tuner_holds_when_rtt_inflates() -> None:
+    tuner = AdaptiveLinkTuner(initial_size=256, min_size=256, max_size=4096, increase_step=256)
+    tuner.on_ack(1000, 0.01)
+    grown = tuner.size
+
+    tuner.on_ack(1000, 0.05)
+
+    assert tuner.size == grown
+
+
+def test_chunked_client_sends_are_reassembled_by_tuned_server() -> None:
+    listener = LoopbackListener()
+    persisted: List[Any] = []
+    server = BluetoothServer(
+        ServerSettings(auto_tune=True, receive_timeout=2.0, buffer_size=1024, min_buffer_size=512),
+        deserializer=PassthroughDeserializer(),
+        sink=type("ListSink", (), {"persist": lambda self, obj: persisted.append(obj)})(),
+        socket_manager=LoopbackServerSocketManager(listener),
+    )
+    client = BluetoothClient(
+        ClientSettings(auto_tune=True, min_chunk_size=256, max_chunk_size=1024),
+        serializer=PassthroughSerializer(),
+        socket_manager=LoopbackClientSocketManager(listener),
+    )
+    payloads = [bytes([index]) * 3000 for index in range(5)]
+
+    def serve() -> None:
+        server.start()
+        for _ in payloads:
+            server.receive_once()
+        server.stop()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    client.start()
+    for payload in payloads:
+        client.send_object(payload)
+    client.stop()
+    thread.join(timeout=5)
+
+    assert persisted == payloads
+    client_metrics = client.metrics.snapshot()
+    assert 256 < client_metrics["chunk_size"] <= 1024
+    assert client_metrics["payloads_sent"] == 5
+    assert "buffer_size" in server.metrics.snapshot()